@@ -0,0 +1,31 @@
+import hashlib
+
+from django.core.cache import caches
+from foodgram.settings import AUTH_CACHE
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+def get_token_cache_key(key):
+    return f"auth-token:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def invalidate_tokens(*keys):
+    caches[AUTH_CACHE].delete_many(get_token_cache_key(key) for key in keys)
+
+
+def invalidate_user_tokens(user):
+    invalidate_tokens(
+        *Token.objects.filter(user=user).values_list("key", flat=True)
+    )
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        cache = caches[AUTH_CACHE]
+        cache_key = get_token_cache_key(key)
+        credentials = cache.get(cache_key)
+        if credentials is None:
+            credentials = super().authenticate_credentials(key)
+            cache.set(cache_key, credentials)
+        return credentials
@@ -0,0 +1,101 @@
+from api.uploads import decode_base64_image
+from django import forms
+from django.core.exceptions import ValidationError as DjangoValidationError
+from PIL import Image
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import ImageField
+from rest_framework.relations import (MANY_RELATION_KWARGS, ManyRelatedField,
+                                      PrimaryKeyRelatedField)
+
+
+class BulkPrimaryKeyRelatedField(PrimaryKeyRelatedField):
+    resolved = None
+    missing = frozenset()
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+    def to_pk(self, data):
+        if isinstance(data, bool):
+            raise TypeError
+        if self.pk_field is not None:
+            return self.pk_field.to_internal_value(data)
+        return self.get_queryset().model._meta.pk.to_python(data)
+
+    def prefetch(self, values):
+        pks = set()
+        for value in values:
+            try:
+                pks.add(self.to_pk(value))
+            except (TypeError, ValueError, DjangoValidationError,
+                    ValidationError):
+                continue
+        self.resolved = self.get_queryset().in_bulk(pks)
+        self.missing = pks - self.resolved.keys()
+
+    def to_internal_value(self, data):
+        if self.resolved is None:
+            return super().to_internal_value(data)
+        try:
+            pk = self.to_pk(data)
+        except (TypeError, ValueError, DjangoValidationError,
+                ValidationError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        if pk in self.resolved:
+            return self.resolved[pk]
+        if pk in self.missing:
+            self.fail("does_not_exist", pk_value=data)
+        return super().to_internal_value(data)
+
+
+class BulkManyRelatedField(ManyRelatedField):
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+        self.child_relation.prefetch(data)
+        values = []
+        errors = []
+        for item in data:
+            try:
+                values.append(self.child_relation.to_internal_value(item))
+            except ValidationError as error:
+                errors.extend(error.detail)
+        if errors:
+            raise ValidationError(errors)
+        return values
+
+
+class UploadedImageField(forms.ImageField):
+    def to_python(self, data):
+        file = forms.FileField.to_python(self, data)
+        if file is None:
+            return None
+        try:
+            image = Image.open(file)
+            image.verify()
+        except Exception as error:
+            raise DjangoValidationError(
+                self.error_messages["invalid_image"], code="invalid_image"
+            ) from error
+        file.image = image
+        file.content_type = Image.MIME.get(image.format)
+        file.seek(0)
+        return file
+
+
+class StreamingBase64ImageField(ImageField):
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("_DjangoImageField", UploadedImageField)
+        super().__init__(*args, **kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = decode_base64_image(data)
+        return super().to_internal_value(data)
@@ -0,0 +1,77 @@
+import json
+import re
+import uuid
+from io import BytesIO
+
+from api.uploads import CHUNK_SIZE, Base64ImageDecoder
+from rest_framework.exceptions import ParseError, ValidationError
+from rest_framework.parsers import JSONParser
+
+IMAGE_VALUE = re.compile(
+    rb'[{,]\s{0,32}"image"\s{0,32}:\s{0,32}'
+    rb'("data:image(?:/|\\/)[\w.+-]{0,32};base64,)'
+)
+LOOKAHEAD = 256
+
+
+def restore_uploads(data, uploads):
+    if isinstance(data, dict):
+        return {
+            key: restore_uploads(value, uploads) for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [restore_uploads(value, uploads) for value in data]
+    if isinstance(data, str):
+        return uploads.get(data, data)
+    return data
+
+
+class Base64StreamingJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        uploads = {}
+        try:
+            document = b"".join(self.extract_images(stream, uploads))
+        except ValidationError as error:
+            raise ParseError(error.detail[0])
+        data = super().parse(BytesIO(document), media_type, parser_context)
+        return restore_uploads(data, uploads) if uploads else data
+
+    def extract_images(self, stream, uploads):
+        buffer = b""
+        decoder = None
+        finished = False
+        while not finished:
+            chunk = stream.read(CHUNK_SIZE)
+            finished = not chunk
+            buffer += chunk
+            while buffer:
+                if decoder is not None:
+                    end = buffer.find(b'"')
+                    data = buffer if end == -1 else buffer[:end]
+                    if end == -1 and data.endswith(b"\\"):
+                        data = data[:-1]
+                    decoder.feed(data.replace(b"\\/", b"/"))
+                    buffer = buffer[len(data):]
+                    if end == -1:
+                        break
+                    buffer = buffer[1:]
+                    key = f"upload:{uuid.uuid4().hex}"
+                    uploads[key] = decoder.close()
+                    decoder = None
+                    yield json.dumps(key).encode()
+                    continue
+                match = IMAGE_VALUE.search(buffer)
+                if match is not None:
+                    yield buffer[:match.start(1)]
+                    buffer = buffer[match.end():]
+                    decoder = Base64ImageDecoder()
+                    continue
+                end = len(buffer)
+                if not finished:
+                    end = max(end - LOOKAHEAD, 0)
+                if not end:
+                    break
+                yield buffer[:end]
+                buffer = buffer[end:]
+        if decoder is not None:
+            raise ParseError("JSON parse error - unterminated string")
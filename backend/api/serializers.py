@@ -1,15 +1,29 @@
+from api.fields import BulkPrimaryKeyRelatedField, StreamingBase64ImageField
 from django.core.validators import MinValueValidator
+from django.db import transaction
+from django.db.models import prefetch_related_objects
 from djoser.serializers import UserCreateSerializer, UserSerializer
-from drf_extra_fields.fields import Base64ImageField
-from foodgram.settings import MIN_INGREDIENTS_AMOUNT, MIN_RECIPE_COOKING_TIME
+from foodgram.settings import (BULK_RECIPES_LIMIT, MIN_INGREDIENTS_AMOUNT,
+                               MIN_RECIPE_COOKING_TIME)
 from foodgram.validators import validate_username
-from recipes.models import (Ingredient, IngredientAmountInRecipe, IsFavorited,
-                            IsInShoppingCart, Recipe, Tag)
+from recipes.images import enqueue_image, get_rendition_urls
+from recipes.models import (Ingredient, IngredientAmountInRecipe, Recipe,
+                            RecipeQuerySet, Tag)
+from recipes.shopping_list import change_recipe
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework.fields import SerializerMethodField
-from rest_framework.validators import UniqueTogetherValidator
-from users.models import Subscription, User
+from users.models import User
+
+
+class RecipesLimitSerializer(serializers.Serializer):
+    recipes_limit = serializers.IntegerField(min_value=1, required=False)
+
+
+def get_recipes_limit(request):
+    serializer = RecipesLimitSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data.get("recipes_limit")
 
 
 class CustomUserSerializer(UserSerializer):
@@ -26,6 +40,8 @@ class CustomUserSerializer(UserSerializer):
         request = self.context.get("request")
         if request is None or request.user.is_anonymous:
             return False
+        if hasattr(object, "is_subscribed"):
+            return object.is_subscribed
         return object.author.filter(subscriber=request.user).exists()
 
 
@@ -37,19 +53,13 @@ class CustomUserCreateSerializer(UserCreateSerializer):
         extra_kwargs = {"password": {"write_only": True}}
 
 
-class SubscriptionSerializer(serializers.ModelSerializer):
-    is_subscribed = serializers.SerializerMethodField()
+class ImageRenditionsMixin(serializers.Serializer):
+    image_renditions = SerializerMethodField(
+        method_name="get_image_renditions"
+    )
 
-    class Meta:
-        model = Subscription
-        fields = "__all__"
-        validators = (
-            UniqueTogetherValidator(
-                queryset=Subscription.objects.all(),
-                fields=("author", "subscriber"),
-                message="Вы уже подписаны на данного автора",
-            ),
-        )
+    def get_image_renditions(self, object):
+        return get_rendition_urls(object, self.context.get("request"))
 
 
 class InRecipeSubscriptionSerializer(serializers.ModelSerializer):
@@ -77,14 +87,18 @@ class SubscriptionDisplaySerializer(CustomUserSerializer):
         )
 
     def get_recipes_count(self, object):
+        if hasattr(object, "recipes_count"):
+            return object.recipes_count
         return object.recipes.count()
 
     def get_recipes(self, obj):
-        request = self.context.get("request")
-        limit = request.GET.get("recipes_limit")
-        recipes = obj.recipes.all()
-        if limit:
-            recipes = recipes[: int(limit)]
+        if hasattr(obj, "preview_recipes"):
+            recipes = obj.preview_recipes
+        else:
+            limit = get_recipes_limit(self.context.get("request"))
+            recipes = obj.recipes.all()
+            if limit:
+                recipes = recipes[:limit]
         serializer = RecipePreviewSerializer(
             recipes, many=True, read_only=True)
         return serializer.data
@@ -116,12 +130,22 @@ class IngredientSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class IngredientAmountListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.child.fields["id"].prefetch(
+                item.get("id") for item in data if isinstance(item, dict)
+            )
+        return super().to_internal_value(data)
+
+
 class IngredientAmountSerializer(serializers.ModelSerializer):
-    id = serializers.PrimaryKeyRelatedField(queryset=Ingredient.objects.all())
+    id = BulkPrimaryKeyRelatedField(queryset=Ingredient.objects.all())
 
     class Meta:
         model = IngredientAmountInRecipe
         fields = ("id", "amount")
+        list_serializer_class = IngredientAmountListSerializer
 
 
 class IngredientInRecipeSerializer(serializers.ModelSerializer):
@@ -135,9 +159,10 @@ class IngredientInRecipeSerializer(serializers.ModelSerializer):
         fields = ("id", "name", "measurement_unit", "amount")
 
 
-class RecipeReadSerializer(serializers.ModelSerializer):
+class RecipeReadSerializer(ImageRenditionsMixin,
+                           serializers.ModelSerializer):
     tags = TagSerializer(many=True, read_only=True)
-    author = CustomUserSerializer(read_only=True)
+    author = SerializerMethodField(method_name="get_author")
     ingredients = SerializerMethodField(method_name="get_ingredients")
     is_favorited = SerializerMethodField(
         read_only=True, method_name="get_is_favorited")
@@ -156,10 +181,17 @@ class RecipeReadSerializer(serializers.ModelSerializer):
             "is_in_shopping_cart",
             "name",
             "image",
+            "image_renditions",
             "text",
             "cooking_time",
         )
 
+    def get_author(self, object):
+        author = object.author
+        if hasattr(object, "author_is_subscribed"):
+            author.is_subscribed = object.author_is_subscribed
+        return CustomUserSerializer(author, context=self.context).data
+
     def get_ingredients(self, object):
         ingredients = object.ingredient_amount_in_recipe.all()
         return IngredientInRecipeSerializer(ingredients, many=True).data
@@ -168,23 +200,27 @@ class RecipeReadSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         if not request or request.user.is_anonymous:
             return False
+        if hasattr(object, "is_favorited"):
+            return object.is_favorited
         return request.user.favorites.filter(recipe=object).exists()
 
     def get_is_in_shopping_cart(self, object):
         request = self.context.get("request")
         if not request or request.user.is_anonymous:
             return False
+        if hasattr(object, "is_in_shopping_cart"):
+            return object.is_in_shopping_cart
         return request.user.shopping_cart.filter(recipe=object).exists()
 
 
 class RecipeWriteSerializer(serializers.ModelSerializer):
-    tags = serializers.PrimaryKeyRelatedField(
+    tags = BulkPrimaryKeyRelatedField(
         queryset=Tag.objects.all(),
         many=True,
     )
     author = CustomUserSerializer(read_only=True)
     ingredients = IngredientAmountSerializer(many=True)
-    image = Base64ImageField(use_url=True, max_length=None)
+    image = StreamingBase64ImageField(use_url=True, max_length=None)
     cooking_time = serializers.IntegerField(
         validators=(
             MinValueValidator(
@@ -248,58 +284,106 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
         recipe = Recipe.objects.create(author=author, **validated_data)
         recipe.tags.set(tags_data)
         self.add_ingredients(ingredients_data, recipe)
+        enqueue_image(recipe)
         return recipe
 
-    def update(self, instance, validated_data):
-        recipe = instance
-        instance.image = validated_data.get("image", instance.image)
-        instance.name = validated_data.get("name", instance.name)
-        instance.text = validated_data.get("text", instance.name)
-        instance.cooking_time = validated_data.get(
-            "cooking_time", instance.cooking_time
+    @staticmethod
+    def update_tags(recipe, tags_data):
+        current = {tag.id for tag in recipe.tags.all()}
+        new = {tag.id for tag in tags_data}
+        if current - new:
+            recipe.tags.remove(*(current - new))
+        if new - current:
+            recipe.tags.add(*(new - current))
+
+    @staticmethod
+    def update_ingredients(recipe, ingredients_data):
+        current = {
+            amount.ingredient_id: amount
+            for amount in recipe.ingredient_amount_in_recipe.all()
+        }
+        old_amounts = {
+            ingredient_id: amount.amount
+            for ingredient_id, amount in current.items()
+        }
+        new_amounts = {
+            ingredient.get("id").id: ingredient.get("amount")
+            for ingredient in ingredients_data
+        }
+        removed = old_amounts.keys() - new_amounts.keys()
+        if removed:
+            IngredientAmountInRecipe.objects.filter(
+                recipe=recipe, ingredient_id__in=removed
+            ).delete()
+        added = new_amounts.keys() - old_amounts.keys()
+        IngredientAmountInRecipe.objects.bulk_create(
+            IngredientAmountInRecipe(
+                recipe=recipe,
+                ingredient_id=ingredient_id,
+                amount=new_amounts[ingredient_id],
+            )
+            for ingredient_id in added
         )
-        instance.tags.clear()
-        instance.ingredients.clear()
-        tags_data = validated_data.get("tags")
-        instance.tags.set(tags_data)
-        ingredients_data = validated_data.get("ingredients")
-        IngredientAmountInRecipe.objects.filter(recipe=recipe).delete()
-        self.add_ingredients(ingredients_data, recipe)
-        instance.save()
+        changed = []
+        for ingredient_id, amount in new_amounts.items():
+            ingredient_amount = current.get(ingredient_id)
+            if ingredient_amount and ingredient_amount.amount != amount:
+                ingredient_amount.amount = amount
+                changed.append(ingredient_amount)
+        if changed:
+            IngredientAmountInRecipe.objects.bulk_update(changed, ("amount",))
+        if removed or added or changed:
+            getattr(recipe, "_prefetched_objects_cache", {}).pop(
+                "ingredient_amount_in_recipe", None
+            )
+        change_recipe(recipe, old_amounts, new_amounts)
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            instance.image = validated_data.get("image", instance.image)
+            instance.name = validated_data.get("name", instance.name)
+            instance.text = validated_data.get("text", instance.text)
+            instance.cooking_time = validated_data.get(
+                "cooking_time", instance.cooking_time
+            )
+            instance.save()
+            if "image" in validated_data:
+                enqueue_image(instance)
+            if "tags" in validated_data:
+                self.update_tags(instance, validated_data["tags"])
+            if "ingredients" in validated_data:
+                self.update_ingredients(
+                    instance, validated_data["ingredients"]
+                )
         return instance
 
     def to_representation(self, recipe):
-        serializer = RecipeReadSerializer(recipe)
+        if hasattr(recipe, "is_favorited"):
+            prefetch_related_objects(
+                (recipe,), *RecipeQuerySet.get_prefetches()
+            )
+        else:
+            request = self.context.get("request")
+            recipe = Recipe.objects.with_user_annotations(
+                request and request.user
+            ).get(pk=recipe.pk)
+        serializer = RecipeReadSerializer(recipe, context=self.context)
         return serializer.data
 
 
-class FavoriteSerializer(serializers.ModelSerializer):
+class RecipePreviewSerializer(ImageRenditionsMixin,
+                              serializers.ModelSerializer):
     class Meta:
-        model = IsFavorited
-        fields = "__all__"
-        validators = (
-            UniqueTogetherValidator(
-                queryset=IsFavorited.objects.all(),
-                fields=("user", "recipe"),
-                message="Этот рецепт уже в избранном",
-            ),
-        )
-
+        model = Recipe
+        fields = ("id", "name", "image", "image_renditions", "cooking_time")
 
-class ShoppingCartSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = IsInShoppingCart
-        fields = "__all__"
-        validators = (
-            UniqueTogetherValidator(
-                queryset=IsInShoppingCart.objects.all(),
-                fields=("user", "recipe"),
-                message="Этот рецепт уже в списоке покупок",
-            ),
-        )
 
+class RecipeIdsSerializer(serializers.Serializer):
+    recipes = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_RECIPES_LIMIT,
+    )
 
-class RecipePreviewSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Recipe
-        fields = ("id", "name", "image", "cooking_time")
+    def validate_recipes(self, recipes):
+        return list(dict.fromkeys(recipes))
@@ -0,0 +1,16 @@
+from api.authentication import invalidate_tokens, invalidate_user_tokens
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from users.models import User
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    invalidate_tokens(instance.key)
+
+
+@receiver(post_save, sender=User)
+def invalidate_saved_user_tokens(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_user_tokens(instance)
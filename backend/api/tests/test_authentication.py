@@ -0,0 +1,61 @@
+from api.authentication import get_token_cache_key
+from api.tests.utils import FoodgramTestCase
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from foodgram.settings import AUTH_CACHE
+from rest_framework.authtoken.models import Token
+
+
+class CachedTokenAuthenticationTest(FoodgramTestCase):
+    url = "/api/users/me/"
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user(1)
+        self.client = self.get_client(self.user)
+        self.key = Token.objects.get(user=self.user).key
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def is_cached(self):
+        cache_key = get_token_cache_key(self.key)
+        return caches[AUTH_CACHE].get(cache_key) is not None
+
+    def test_warm_cache_skips_token_query(self):
+        self.assertTrue(self.is_cached())
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertFalse(
+            any(Token._meta.db_table in query["sql"] for query in queries)
+        )
+
+    def test_logout(self):
+        response = self.client.post("/api/auth/token/logout/")
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(self.is_cached())
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_password_change(self):
+        response = self.client.post(
+            "/api/users/set_password/",
+            {
+                "current_password": "Password-12345",
+                "new_password": "Another-Password-678",
+            },
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(self.is_cached())
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        user, _ = caches[AUTH_CACHE].get(get_token_cache_key(self.key))
+        self.assertTrue(user.check_password("Another-Password-678"))
+
+    def test_deactivation(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertFalse(self.is_cached())
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_token_deleted_elsewhere(self):
+        Token.objects.filter(user=self.user).delete()
+        self.assertFalse(self.is_cached())
+        self.assertEqual(self.client.get(self.url).status_code, 401)
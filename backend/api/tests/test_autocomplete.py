@@ -0,0 +1,59 @@
+from django.test import SimpleTestCase
+from recipes.autocomplete import IngredientIndex
+
+INGREDIENTS = (
+    "Фасоль",
+    "Соль каменная",
+    "Сахар",
+    "Морская соль",
+    "Соль",
+    "Соус соевый",
+)
+
+
+class IngredientIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.index = IngredientIndex(
+            (id, name, "г") for id, name in enumerate(INGREDIENTS, 1)
+        )
+
+    def search(self, query, limit=10):
+        return [item["name"] for item in self.index.search(query, limit)]
+
+    def test_prefix_matches_come_before_substring_matches(self):
+        self.assertEqual(
+            self.search("СОЛЬ"),
+            ["Соль", "Соль каменная", "Морская соль", "Фасоль"],
+        )
+
+    def test_limit(self):
+        for limit, expected in (
+            (1, ["Соль"]),
+            (3, ["Соль", "Соль каменная", "Морская соль"]),
+        ):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.search("соль", limit), expected)
+
+    def test_items_are_served(self):
+        self.assertEqual(
+            self.index.search("сах", 10),
+            [{"id": 3, "name": "Сахар", "measurement_unit": "г"}],
+        )
+        self.assertEqual(self.search("перец"), [])
+
+    def fuzzy_search(self, query, limit=10):
+        return [
+            item["name"] for item in self.index.fuzzy_search(query, limit)
+        ]
+
+    def test_fuzzy_matches_are_ranked_by_similarity(self):
+        self.assertEqual(
+            self.fuzzy_search("соль"),
+            ["Соль", "Морская соль", "Соль каменная", "Фасоль"],
+        )
+        self.assertEqual(
+            self.fuzzy_search("соль", 2), ["Соль", "Морская соль"]
+        )
+
+    def test_fuzzy_search_without_words(self):
+        self.assertEqual(self.fuzzy_search("!!!"), [])
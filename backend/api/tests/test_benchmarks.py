@@ -0,0 +1,29 @@
+from api.tests.utils import FoodgramTestCase
+from recipes.benchmarks import get_benchmark_author, temporary_recipes
+from recipes.models import IngredientAmountInRecipe, IsFavorited, Recipe
+
+
+class TemporaryRecipesTest(FoodgramTestCase):
+    def test_created_recipes_are_deleted(self):
+        user = self.create_user(1)
+        kept = self.create_recipe(user, (self.create_tag(1),))
+        with temporary_recipes(5):
+            self.assertEqual(Recipe.objects.count(), 5)
+            created = Recipe.objects.exclude(pk=kept.pk)
+            recipe = created.first()
+            recipe.tags.add(self.create_tag(2))
+            IngredientAmountInRecipe.objects.create(
+                recipe=recipe, ingredient=self.create_ingredient(1), amount=1
+            )
+            IsFavorited.objects.create(user=user, recipe=recipe)
+        self.assertEqual(list(Recipe.objects.all()), [kept])
+        self.assertEqual(kept.tags.count(), 1)
+        self.assertFalse(IngredientAmountInRecipe.objects.exists())
+        self.assertFalse(IsFavorited.objects.exists())
+
+    def test_keep_leaves_recipes(self):
+        with temporary_recipes(3, keep=True):
+            pass
+        self.assertEqual(
+            Recipe.objects.filter(author=get_benchmark_author()).count(), 3
+        )
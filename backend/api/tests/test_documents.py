@@ -0,0 +1,43 @@
+from unittest import mock
+
+from api.tests.utils import FoodgramTestCase
+
+URL = "/api/recipes/download_shopping_cart/?format=pdf"
+
+
+class ShoppingListPdfTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user(1)
+        ingredients = [self.create_ingredient(n) for n in range(1, 4)]
+        recipe = self.create_recipe(self.user, (), ingredients)
+        self.client = self.get_client(self.user)
+        self.client.post(f"/api/recipes/{recipe.pk}/shopping_cart/")
+
+    def test_document_is_cached(self):
+        first = self.client.get(URL)
+        self.assertEqual(first["X-Document-Cache"], "miss")
+        self.assertTrue(first.content.startswith(b"%PDF"))
+        second = self.client.get(URL)
+        self.assertEqual(second["X-Document-Cache"], "hit")
+        self.assertEqual(second.content, first.content)
+        response = self.client.get(URL, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    @mock.patch("recipes.document_cache.SPOOL_MAX_SIZE", 1024)
+    def test_large_document_is_streamed_from_file(self):
+        for _ in range(2):
+            response = self.client.get(URL)
+            self.assertEqual(response["X-Document-Cache"], "miss")
+            self.assertTrue(response.streaming)
+            content = b"".join(response.streaming_content)
+            self.assertTrue(content.startswith(b"%PDF"))
+            self.assertEqual(int(response["Content-Length"]), len(content))
+
+    @mock.patch("recipes.document_cache.DOCUMENTS_CACHE_ENTRY_MAX_SIZE", 1024)
+    def test_document_over_entry_limit_is_not_cached(self):
+        for _ in range(2):
+            response = self.client.get(URL)
+            self.assertEqual(response["X-Document-Cache"], "miss")
+            self.assertFalse(response.streaming)
+            self.assertTrue(response.content.startswith(b"%PDF"))
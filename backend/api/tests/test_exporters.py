@@ -0,0 +1,72 @@
+import csv
+import json
+from io import StringIO
+
+from api.tests.utils import FoodgramTestCase
+
+URL = "/api/recipes/download_shopping_cart/"
+
+
+class ShoppingListExportTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user(1)
+        ingredients = [self.create_ingredient(n) for n in range(1, 3)]
+        recipe = self.create_recipe(self.user, (), ingredients)
+        self.client = self.get_client(self.user)
+        self.client.post(f"/api/recipes/{recipe.pk}/shopping_cart/")
+
+    def download(self, format, client=None):
+        response = (client or self.client).get(URL, {"format": format})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            f'filename*=utf-8\'\'shop_%D1%81art.{format}',
+            response["Content-Disposition"],
+        )
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_txt(self):
+        response, content = self.download("txt")
+        self.assertEqual(response["Content-Type"], "text/plain; charset=utf-8")
+        self.assertEqual(
+            content,
+            "Список покупок:\n"
+            "Ингредиент 1: 1 г.\n"
+            "Ингредиент 2: 2 г.\n",
+        )
+
+    def test_csv(self):
+        response, content = self.download("csv")
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertEqual(
+            list(csv.reader(StringIO(content))),
+            [
+                ["name", "measurement_unit", "amount"],
+                ["Ингредиент 1", "г", "1"],
+                ["Ингредиент 2", "г", "2"],
+            ],
+        )
+
+    def test_json(self):
+        response, content = self.download("json")
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            json.loads(content),
+            [
+                {"name": "Ингредиент 1", "measurement_unit": "г", "amount": 1},
+                {"name": "Ингредиент 2", "measurement_unit": "г", "amount": 2},
+            ],
+        )
+
+    def test_empty_json(self):
+        client = self.get_client(self.create_user(2))
+        _, content = self.download("json", client)
+        self.assertEqual(json.loads(content), [])
+
+    def test_errors_are_rendered_as_json(self):
+        for format in ("pdf", "txt", "csv", "json"):
+            with self.subTest(format=format):
+                response = self.get_client().get(URL, {"format": format})
+                self.assertEqual(response.status_code, 401)
+                self.assertEqual(response["Content-Type"], "application/json")
+                self.assertIn("detail", json.loads(response.content))
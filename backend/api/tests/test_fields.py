@@ -0,0 +1,41 @@
+from api.tests.utils import FoodgramTestCase, get_image
+
+
+class RecipeTagsFieldTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user(1)
+        self.tag = self.create_tag(1)
+        self.ingredient = self.create_ingredient(1)
+        self.client = self.get_client(self.user)
+
+    def post(self, tags):
+        return self.client.post(
+            "/api/recipes/",
+            {
+                "tags": tags,
+                "ingredients": [{"id": self.ingredient.pk, "amount": 1}],
+                "image": get_image(),
+                "name": "Рецепт",
+                "text": "Описание",
+                "cooking_time": 5,
+            },
+            format="json",
+        )
+
+    def test_bool_is_not_a_primary_key(self):
+        for value in (True, False):
+            with self.subTest(value=value):
+                response = self.post([value])
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("tags", response.json())
+
+    def test_missing_tag_is_rejected(self):
+        response = self.post([self.tag.pk + 100])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("tags", response.json())
+
+    def test_existing_tag_is_accepted(self):
+        response = self.post([self.tag.pk])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["tags"][0]["id"], self.tag.pk)
@@ -0,0 +1,46 @@
+from api.tests.utils import FoodgramTestCase
+from recipes.models import Tag
+
+
+class TagFilterTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = self.create_user(1)
+        self.tags = [self.create_tag(number) for number in range(1, 4)]
+        self.recipe = self.create_recipe(self.author, self.tags[:2])
+        self.create_recipe(self.author, self.tags[2:], name="Другой")
+        self.client = self.get_client()
+
+    def test_recipe_with_several_matching_tags_is_listed_once(self):
+        response = self.client.get(
+            "/api/recipes/", {"tags": ["tag-1", "tag-2"]}
+        )
+        data = response.json()
+        self.assertEqual(data["count"], 1)
+        self.assertEqual(
+            [recipe["id"] for recipe in data["results"]], [self.recipe.id]
+        )
+
+    def test_all_tags_do_not_duplicate_recipes(self):
+        response = self.client.get(
+            "/api/recipes/", {"tags": [tag.slug for tag in self.tags]}
+        )
+        data = response.json()
+        ids = [recipe["id"] for recipe in data["results"]]
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_tag_created_elsewhere_is_filterable_at_once(self):
+        self.client.get("/api/recipes/", {"tags": ["tag-1"]})
+        (tag,) = Tag.objects.bulk_create(
+            (Tag(name="Новый", slug="new", color="#ABCDEF"),)
+        )
+        self.recipe.tags.through.objects.create(recipe=self.recipe, tag=tag)
+        response = self.client.get("/api/recipes/", {"tags": ["new"]})
+        self.assertEqual(response.json()["count"], 1)
+        tags = self.client.get("/api/tags/").json()
+        self.assertIn("new", [tag["slug"] for tag in tags])
+
+    def test_unknown_tag_matches_nothing(self):
+        response = self.client.get("/api/recipes/", {"tags": ["missing"]})
+        self.assertEqual(response.json()["count"], 0)
@@ -0,0 +1,105 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from api.tests.utils import FoodgramTestCase, get_image_bytes
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.test import TransactionTestCase, override_settings
+from recipes import images
+from recipes.models import ImageProcessingTask, Recipe
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+@mock.patch("recipes.images.IMAGE_PROCESSING_IN_PROCESS", False)
+class ImageProcessingTest(TransactionTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = FoodgramTestCase.create_user(1)
+
+    def create_recipe(self, name="Рецепт", color=(200, 120, 40)):
+        recipe = FoodgramTestCase.create_recipe(self.user, name=name)
+        image = get_image_bytes(color)
+        recipe.image.save("recipe.png", ContentFile(image), save=True)
+        images.enqueue_image(recipe)
+        return recipe
+
+    def test_render_runs_outside_transaction(self):
+        recipe = self.create_recipe()
+        render = images.render_renditions
+
+        def check_render(image):
+            self.assertFalse(connection.in_atomic_block)
+            return render(image)
+
+        with mock.patch.object(
+            images, "render_renditions", side_effect=check_render
+        ):
+            self.assertTrue(images.process_task(recipe.image_task.pk))
+        recipe.refresh_from_db()
+        self.assertTrue(recipe.image_renditions)
+        self.assertFalse(ImageProcessingTask.objects.exists())
+
+    def test_failed_task_is_retried_by_next_run(self):
+        failing = self.create_recipe("Первый", (10, 20, 30))
+        task_id = failing.image_task.pk
+        with mock.patch.object(
+            images, "render_renditions", side_effect=OSError("broken")
+        ):
+            images.run_task(task_id)
+        self.assertEqual(ImageProcessingTask.objects.get().attempts, 1)
+        other = self.create_recipe("Второй")
+        images.run_task(other.image_task.pk)
+        self.assertFalse(ImageProcessingTask.objects.exists())
+        self.assertTrue(Recipe.objects.get(pk=failing.pk).image_renditions)
+
+    def test_renditions_of_replaced_image_are_discarded(self):
+        recipe = self.create_recipe()
+        render = images.render_renditions
+        rendered = {}
+
+        def replace_during_render(image):
+            rendered.update(render(image))
+            Recipe.objects.filter(pk=recipe.pk).update(
+                image="recipes/new.png"
+            )
+            return rendered
+
+        with mock.patch.object(
+            images, "render_renditions", side_effect=replace_during_render
+        ):
+            self.assertFalse(images.process_task(recipe.image_task.pk))
+        self.assertTrue(ImageProcessingTask.objects.exists())
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.image_renditions, {})
+        for formats in rendered.values():
+            for name in formats.values():
+                self.assertFalse(default_storage.exists(name))
+
+    def test_renditions_survive_rolled_back_enqueue(self):
+        recipe = self.create_recipe()
+        self.assertTrue(images.process_task(recipe.image_task.pk))
+        recipe.refresh_from_db()
+        renditions = recipe.image_renditions
+        names = [
+            name for formats in renditions.values()
+            for name in formats.values()
+        ]
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                images.enqueue_image(recipe)
+                raise RuntimeError
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.image_renditions, renditions)
+        for name in names:
+            self.assertTrue(default_storage.exists(name))
+        images.enqueue_image(recipe)
+        for name in names:
+            self.assertFalse(default_storage.exists(name))
@@ -0,0 +1,87 @@
+import os
+import time
+from io import StringIO
+from unittest import mock
+
+from api.tests.utils import FoodgramTestCase, get_image
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from foodgram.settings import IMAGE_RELEASE_GRACE_PERIOD
+from recipes.images import RENDITIONS_DIRECTORY, sweep_orphan_images
+from recipes.models import Recipe
+from recipes.storage import content_addressed_storage
+
+
+class ImageReleaseTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user(1)
+        self.tag = self.create_tag(1)
+        self.ingredient = self.create_ingredient(1)
+        self.client = self.get_client(self.user)
+
+    def create(self, name):
+        response = self.client.post(
+            "/api/recipes/",
+            {
+                "tags": [self.tag.pk],
+                "ingredients": [{"id": self.ingredient.pk, "amount": 1}],
+                "image": get_image(),
+                "name": name,
+                "text": "Описание",
+                "cooking_time": 5,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return Recipe.objects.get(pk=response.json()["id"])
+
+    def delete(self, recipe):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f"/api/recipes/{recipe.pk}/")
+        self.assertEqual(response.status_code, 204)
+
+    @mock.patch("recipes.images.IMAGE_RELEASE_GRACE_PERIOD", 0)
+    def test_shared_image_is_kept_until_last_recipe_is_deleted(self):
+        first, second = self.create("Первый"), self.create("Второй")
+        name = first.image.name
+        self.assertEqual(second.image.name, name)
+        self.delete(first)
+        self.assertTrue(content_addressed_storage.exists(name))
+        self.delete(second)
+        self.assertFalse(content_addressed_storage.exists(name))
+
+    def expire(self, name):
+        past = time.time() - IMAGE_RELEASE_GRACE_PERIOD - 1
+        os.utime(content_addressed_storage.path(name), (past, past))
+
+    def test_recently_saved_image_is_swept_later(self):
+        recipe = self.create("Рецепт")
+        self.delete(recipe)
+        name = recipe.image.name
+        self.assertTrue(content_addressed_storage.exists(name))
+        self.assertEqual(sweep_orphan_images(), 0)
+        self.expire(name)
+        out = StringIO()
+        call_command("sweep_images", stdout=out)
+        self.assertIn("Удалено картинок: 1", out.getvalue())
+        self.assertFalse(content_addressed_storage.exists(name))
+
+    def test_sweep_keeps_referenced_images_and_renditions(self):
+        recipe = self.create("Рецепт")
+        rendition = default_storage.save(
+            f"{RENDITIONS_DIRECTORY}/ab.webp", ContentFile(b"webp")
+        )
+        self.expire(recipe.image.name)
+        self.expire(rendition)
+        self.assertEqual(sweep_orphan_images(), 0)
+        self.assertTrue(content_addressed_storage.exists(recipe.image.name))
+        self.assertTrue(default_storage.exists(rendition))
+
+    def test_process_images_sweeps_orphans(self):
+        recipe = self.create("Рецепт")
+        self.delete(recipe)
+        self.expire(recipe.image.name)
+        call_command("process_images", stdout=StringIO())
+        self.assertFalse(content_addressed_storage.exists(recipe.image.name))
@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from api.tests.utils import FoodgramTestCase
+from django.test import SimpleTestCase
+from recipes.ingredient_loader import CsvRowStream, load_ingredients, read_json
+from recipes.models import Ingredient
+
+ROWS = [
+    ("Соль", "г"),
+    ('Перец "чёрный", молотый', "щепотка"),
+    ("Многострочное\nназвание", "шт."),
+    ("Ёмкость 😀", "мл"),
+]
+
+
+class IngredientReaderTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "ingredients.json"
+
+    def write(self, text):
+        self.path.write_text(text, encoding="utf-8")
+
+    def test_objects_split_across_reads(self):
+        items = [
+            {"name": name, "measurement_unit": unit, "extra": {"a": [1]}}
+            for name, unit in ROWS
+        ]
+        for text in (
+            json.dumps(items, ensure_ascii=False),
+            json.dumps(items, ensure_ascii=False, indent=4),
+            "\n".join(json.dumps(item) for item in items),
+        ):
+            for size in (1, 2, 7, 64):
+                with self.subTest(text=text[:10], size=size):
+                    self.write(text)
+                    with mock.patch(
+                        "recipes.ingredient_loader.READ_SIZE", size
+                    ):
+                        self.assertEqual(list(read_json(self.path)), ROWS)
+
+    def test_truncated_object_is_rejected(self):
+        self.write('[{"name": "Соль", "measurement_unit": "г"}, {"name": ')
+        with mock.patch("recipes.ingredient_loader.READ_SIZE", 4):
+            with self.assertRaises(json.JSONDecodeError):
+                list(read_json(self.path))
+
+    def test_csv_stream_splits_rows_at_any_size(self):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(ROWS)
+        expected = buffer.getvalue().encode("utf-8")
+        for size in (1, 3, 10, 1000, -1):
+            with self.subTest(size=size):
+                stream = CsvRowStream(ROWS)
+                chunks = []
+                while True:
+                    chunk = stream.read(size)
+                    if not chunk:
+                        break
+                    chunk.decode("utf-8")
+                    chunks.append(chunk)
+                self.assertEqual(b"".join(chunks), expected)
+
+
+class LoadIngredientsTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "ingredients.csv"
+        with open(self.path, "w", encoding="utf-8", newline="") as file:
+            csv.writer(file).writerows(
+                ROWS + [ROWS[0], ("", "г"), ("Без единицы",)]
+            )
+
+    def test_rerun_is_idempotent(self):
+        stats = load_ingredients(self.path, "csv", batch_size=2)
+        self.assertEqual(stats["created"], len(ROWS))
+        self.assertEqual(stats["skipped"], 2)
+        for copy in (True, False):
+            with self.subTest(copy=copy):
+                stats = load_ingredients(
+                    self.path, "csv", batch_size=2, copy=copy
+                )
+                self.assertEqual(stats["created"], 0)
+        self.assertEqual(
+            sorted(Ingredient.objects.values_list("name", "measurement_unit")),
+            sorted(ROWS),
+        )
@@ -0,0 +1,72 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.loader import MigrationLoader
+from django.test import TransactionTestCase
+
+BEFORE_MERGE = ("recipes", "0016_recipe_image_storage")
+AFTER_MERGE = ("recipes", "0019_ingredient_unique_name_unit")
+
+
+@skipUnless(
+    "recipes" in MigrationLoader(None).migrated_apps,
+    "Миграции отключены в настройках",
+)
+class MergeDuplicateIngredientsTest(TransactionTestCase):
+    def setUp(self):
+        self.executor = MigrationExecutor(connection)
+        self.executor.migrate([BEFORE_MERGE])
+        self.apps = self.executor.loader.project_state(BEFORE_MERGE).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def migrate(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate([AFTER_MERGE])
+        return executor.loader.project_state(AFTER_MERGE).apps
+
+    def test_duplicates_are_merged_and_amounts_clamped(self):
+        User = self.apps.get_model("users", "User")
+        Ingredient = self.apps.get_model("recipes", "Ingredient")
+        Recipe = self.apps.get_model("recipes", "Recipe")
+        Amount = self.apps.get_model("recipes", "IngredientAmountInRecipe")
+        author = User.objects.create(username="author", email="a@a.ru")
+        kept, duplicate = (
+            Ingredient.objects.create(name="Соль", measurement_unit="г")
+            for _ in range(2)
+        )
+        recipes = [
+            Recipe.objects.create(
+                author=author,
+                name=f"Рецепт {number}",
+                text="Описание",
+                image="recipes/test.png",
+                cooking_time=1,
+            )
+            for number in range(2)
+        ]
+        Amount.objects.create(ingredient=kept, recipe=recipes[0], amount=3)
+        Amount.objects.create(
+            ingredient=duplicate, recipe=recipes[0], amount=4
+        )
+        Amount.objects.create(
+            ingredient=kept, recipe=recipes[1], amount=30000
+        )
+        Amount.objects.create(
+            ingredient=duplicate, recipe=recipes[1], amount=30000
+        )
+
+        apps = self.migrate()
+
+        Ingredient = apps.get_model("recipes", "Ingredient")
+        Amount = apps.get_model("recipes", "IngredientAmountInRecipe")
+        self.assertEqual(
+            list(Ingredient.objects.values_list("pk", flat=True)), [kept.pk]
+        )
+        self.assertEqual(
+            dict(Amount.objects.values_list("recipe_id", "amount")),
+            {recipes[0].pk: 7, recipes[1].pk: 32767},
+        )
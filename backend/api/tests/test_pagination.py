@@ -0,0 +1,214 @@
+from unittest import mock
+
+from api.tests.utils import FoodgramTestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from recipes.models import IsFavorited, Recipe
+from recipes.pagination import RecipeCursorPagination
+
+
+class RecipeCountTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user(1)
+        self.tags = [self.create_tag(1), self.create_tag(2)]
+        self.recipe = self.create_recipe(self.user, tags=self.tags[:1])
+        self.client = self.get_client(self.user)
+
+    def assert_count(self, url, expected):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], expected)
+        self.assertEqual(len(response.data["results"]), expected)
+
+    def test_favorite_is_visible_in_filter_at_once(self):
+        self.assert_count("/api/recipes/?is_favorited=1", 0)
+        self.client.post(f"/api/recipes/{self.recipe.pk}/favorite/")
+        self.assert_count("/api/recipes/?is_favorited=1", 1)
+
+    def test_cart_is_visible_in_filter_at_once(self):
+        self.assert_count("/api/recipes/?is_in_shopping_cart=1", 0)
+        self.client.post("/api/recipes/shopping_cart/",
+                         {"recipes": [self.recipe.pk]}, format="json")
+        self.assert_count("/api/recipes/?is_in_shopping_cart=1", 1)
+
+    def test_tag_change_is_visible_in_filter_at_once(self):
+        self.assert_count("/api/recipes/?tags=tag-2", 0)
+        self.recipe.tags.add(self.tags[1])
+        self.assert_count("/api/recipes/?tags=tag-2", 1)
+        self.recipe.tags.remove(self.tags[1])
+        self.assert_count("/api/recipes/?tags=tag-2", 0)
+
+
+class CachedCountTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.users = [self.create_user(1), self.create_user(2)]
+        self.recipes = [
+            self.create_recipe(self.users[0], name=f"Рецепт {number}")
+            for number in range(2)
+        ]
+        self.clients = [self.get_client(user) for user in self.users]
+
+    def get_count(self, url, client=None):
+        response = (client or self.clients[0]).get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data["count"]
+
+    def test_author_count_is_cached_and_shared_with_me(self):
+        author = self.users[0]
+        url = f"/api/recipes/?author={author.pk}"
+        self.assertEqual(self.get_count(url), 2)
+        Recipe.objects.bulk_create(
+            (
+                Recipe(
+                    author=author,
+                    name="Без сигнала",
+                    text="Описание",
+                    image="recipes/test.png",
+                    cooking_time=1,
+                ),
+            )
+        )
+        self.assertEqual(self.get_count(url), 2)
+        self.assertEqual(self.get_count("/api/recipes/?author=me"), 2)
+        self.create_recipe(author, name="Новый")
+        self.assertEqual(self.get_count("/api/recipes/?author=me"), 4)
+        self.assertEqual(
+            self.get_count("/api/recipes/?author=me", self.clients[1]), 0
+        )
+
+    def test_favorite_counts_are_cached_per_user(self):
+        url = "/api/recipes/?is_favorited=1"
+        first, second = (recipe.pk for recipe in self.recipes)
+        self.clients[0].post(f"/api/recipes/{first}/favorite/")
+        self.assertEqual(self.get_count(url), 1)
+        self.assertEqual(self.get_count(url, self.clients[1]), 0)
+        IsFavorited.objects.bulk_create(
+            (IsFavorited(user=self.users[1], recipe_id=first),)
+        )
+        self.assertEqual(self.get_count(url, self.clients[1]), 0)
+        self.clients[1].post(f"/api/recipes/{second}/favorite/")
+        self.assertEqual(self.get_count(url, self.clients[1]), 2)
+        self.clients[0].delete(
+            "/api/recipes/favorite/", {"recipes": [first]}, format="json"
+        )
+        self.assertEqual(self.get_count(url), 0)
+
+    def test_cart_counts_follow_bulk_changes(self):
+        url = "/api/recipes/?is_in_shopping_cart=1"
+        recipe_ids = [recipe.pk for recipe in self.recipes]
+        self.assertEqual(self.get_count(url), 0)
+        self.clients[0].post(
+            "/api/recipes/shopping_cart/",
+            {"recipes": recipe_ids},
+            format="json",
+        )
+        self.assertEqual(self.get_count(url), 2)
+        self.clients[0].delete(f"/api/recipes/{recipe_ids[0]}/shopping_cart/")
+        self.assertEqual(self.get_count(url), 1)
+
+    def test_anonymous_per_user_filters_are_not_cached(self):
+        client = self.get_client()
+        url = "/api/recipes/?is_favorited=1"
+        self.assertEqual(self.get_count(url, client), 0)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_count(url, client), 0)
+
+
+class EstimatedCountTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        user = self.create_user(1)
+        for number in range(15):
+            self.create_recipe(user, name=f"Рецепт {number}")
+        self.client = self.get_client()
+
+    @mock.patch("recipes.pagination.estimate_recipe_count", return_value=4)
+    def test_pages_past_low_estimate_are_served(self, estimate):
+        response = self.client.get("/api/recipes/?page=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 6)
+        self.assertFalse(response.data["count_exact"])
+        self.assertIsNotNone(response.data["next"])
+        response = self.client.get("/api/recipes/?page=3")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertEqual(response.data["count"], 15)
+        self.assertIsNone(response.data["next"])
+        response = self.client.get("/api/recipes/?page=4")
+        self.assertEqual(response.status_code, 404)
+
+
+class PopularOrderingTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user(1)
+        self.recipes = [
+            self.create_recipe(self.user, name=f"Рецепт {number}")
+            for number in range(3)
+        ]
+        self.client = self.get_client(self.user)
+
+    def test_page_number_pagination_orders_by_favorites(self):
+        self.client.post(f"/api/recipes/{self.recipes[0].pk}/favorite/")
+        response = self.client.get("/api/recipes/?ordering=popular")
+        self.assertEqual(response.data["results"][0]["id"], self.recipes[0].pk)
+
+    def test_cursor_pagination_rejects_popular_ordering(self):
+        response = self.client.get(
+            "/api/recipes/?pagination=cursor&ordering=popular"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("ordering", response.data)
+
+
+@mock.patch.object(RecipeCursorPagination, "page_size", 2)
+class CursorPaginationTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        user = self.create_user(1)
+        recipes = [
+            self.create_recipe(user, name=f"Рецепт {number}")
+            for number in range(7)
+        ]
+        Recipe.objects.filter(
+            pk__in=[recipe.pk for recipe in recipes[1:6]]
+        ).update(pub_date=timezone.now())
+        self.expected = list(
+            Recipe.objects.order_by("-pub_date", "-id").values_list(
+                "pk", flat=True
+            )
+        )
+        self.client = self.get_client()
+
+    def get_page(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        for query in context.captured_queries:
+            self.assertNotIn("OFFSET", query["sql"].upper())
+        return response.data
+
+    def test_ties_are_paginated_by_id(self):
+        url, seen, pages = "/api/recipes/?pagination=cursor", [], []
+        while url:
+            data = self.get_page(url)
+            pages.append(data)
+            seen += [recipe["id"] for recipe in data["results"]]
+            url = data["next"]
+        self.assertEqual(seen, self.expected)
+        seen = []
+        url = pages[-1]["previous"]
+        while url:
+            data = self.get_page(url)
+            seen = [recipe["id"] for recipe in data["results"]] + seen
+            url = data["previous"]
+        self.assertEqual(seen, self.expected[:-1])
+
+    def test_invalid_position_is_not_found(self):
+        response = self.client.get(
+            "/api/recipes/?pagination=cursor&cursor=cD1ub3RoaW5n"
+        )
+        self.assertEqual(response.status_code, 404)
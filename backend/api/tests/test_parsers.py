@@ -0,0 +1,135 @@
+import base64
+import json
+from io import BytesIO
+from unittest import mock
+
+from api.parsers import Base64StreamingJSONParser
+from api.tests.utils import FoodgramTestCase, get_image, get_image_bytes
+from django.core.files.uploadedfile import UploadedFile
+from django.test import SimpleTestCase
+from foodgram.errors import ErrorMesage
+from PIL import Image
+from recipes.models import Recipe
+from rest_framework.exceptions import ParseError
+
+
+class Base64StreamingJSONParserTest(SimpleTestCase):
+    def parse(self, body):
+        if isinstance(body, dict):
+            body = json.dumps(body).encode()
+        return Base64StreamingJSONParser().parse(BytesIO(body))
+
+    def assertImage(self, upload, content=None):
+        self.assertIsInstance(upload, UploadedFile)
+        self.assertEqual(upload.read(), content or get_image_bytes())
+
+    def assertRejected(self, body, message):
+        with self.assertRaises(ParseError) as context:
+            self.parse(body)
+        self.assertEqual(context.exception.detail, message)
+
+    def test_image_is_extracted(self):
+        data = self.parse({"name": "Рецепт", "image": get_image()})
+        self.assertEqual(data["name"], "Рецепт")
+        self.assertImage(data["image"])
+
+    def test_chunk_boundaries(self):
+        body = json.dumps(
+            {"text": "Описание", "image": get_image(), "cooking_time": 5},
+            indent=2,
+        ).encode()
+        for size in (1, 3, 7, 64):
+            with self.subTest(size=size):
+                with mock.patch("api.parsers.CHUNK_SIZE", size):
+                    data = self.parse(body)
+                self.assertImage(data["image"])
+                self.assertEqual(data["text"], "Описание")
+                self.assertEqual(data["cooking_time"], 5)
+
+    def test_escaped_slashes(self):
+        content = get_image_bytes((255, 255, 255), (64, 64))
+        encoded = base64.b64encode(content).decode()
+        self.assertIn("/", encoded)
+        body = (
+            '{"image": "data:image\\/png;base64,'
+            + encoded.replace("/", "\\/")
+            + '"}'
+        ).encode()
+        with mock.patch("api.parsers.CHUNK_SIZE", 5):
+            self.assertImage(self.parse(body)["image"], content)
+
+    def test_other_keys_are_left_alone(self):
+        for text in ("data:image/png;base64,hello world", get_image()):
+            with self.subTest(text=text[:30]):
+                data = self.parse({"text": text, "tags": [text]})
+                self.assertEqual(data, {"text": text, "tags": [text]})
+
+    def test_value_named_image_is_left_alone(self):
+        data = self.parse({"name": "image", "text": get_image()})
+        self.assertEqual(data["text"], get_image())
+
+    def test_invalid_header_is_rejected(self):
+        encoded = base64.b64encode(b"not an image" * 10).decode()
+        self.assertRejected(
+            {"image": f"data:image/png;base64,{encoded}"},
+            ErrorMesage.INVALID_IMAGE,
+        )
+
+    def test_unsupported_format_is_rejected(self):
+        buffer = BytesIO()
+        Image.new("RGB", (4, 4)).save(buffer, "BMP")
+        encoded = base64.b64encode(buffer.getvalue()).decode()
+        self.assertRejected(
+            {"image": f"data:image/bmp;base64,{encoded}"},
+            ErrorMesage.INVALID_IMAGE,
+        )
+
+    @mock.patch("api.uploads.IMAGE_UPLOAD_MAX_SIDE", 8)
+    def test_large_side_is_rejected(self):
+        self.assertRejected(
+            {"image": get_image(size=(16, 4))},
+            ErrorMesage.IMAGE_SIDE_TOO_LARGE.format(8),
+        )
+
+    @mock.patch("api.uploads.IMAGE_UPLOAD_MAX_SIZE", 1024 * 1024)
+    def test_oversize_is_rejected(self):
+        content = get_image_bytes() + bytes(1024 * 1024)
+        encoded = base64.b64encode(content).decode()
+        self.assertRejected(
+            {"image": f"data:image/png;base64,{encoded}"},
+            ErrorMesage.IMAGE_TOO_LARGE.format(1),
+        )
+
+    def test_malformed_base64_is_rejected(self):
+        for data in ("iVBORw0K!!!!", "iVBORw0KGgo"):
+            with self.subTest(data=data):
+                self.assertRejected(
+                    {"image": f"data:image/png;base64,{data}"},
+                    ErrorMesage.INVALID_IMAGE,
+                )
+
+    def test_unterminated_image_is_rejected(self):
+        with self.assertRaises(ParseError):
+            self.parse(b'{"image": "data:image/png;base64,iVBORw0K')
+
+
+class RecipeTextTest(FoodgramTestCase):
+    def test_text_with_data_uri_is_kept(self):
+        user = self.create_user(1)
+        text = "data:image/png;base64,hello world"
+        response = self.get_client(user).post(
+            "/api/recipes/",
+            {
+                "tags": [self.create_tag(1).pk],
+                "ingredients": [
+                    {"id": self.create_ingredient(1).pk, "amount": 1}
+                ],
+                "image": get_image(),
+                "name": "Рецепт",
+                "text": text,
+                "cooking_time": 5,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Recipe.objects.get().text, text)
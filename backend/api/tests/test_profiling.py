@@ -0,0 +1,49 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from api.tests.utils import FoodgramTestCase
+
+
+class RequestProfilingTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        for name, value in (
+            ("REQUEST_PROFILING", True),
+            ("REQUEST_PROFILING_DIR", Path(directory.name)),
+        ):
+            patcher = mock.patch(f"foodgram.profiling.{name}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.user = self.create_user(1)
+        ingredients = [self.create_ingredient(n) for n in range(1, 4)]
+        recipe = self.create_recipe(self.user, (), ingredients)
+        self.client = self.get_client(self.user)
+        self.client.post(f"/api/recipes/{recipe.pk}/shopping_cart/")
+
+    def get_record(self, url):
+        with self.assertLogs("foodgram.profiling", "INFO") as logs:
+            response = self.client.get(url)
+            content = b"".join(response.streaming_content)
+        self.assertIn("Server-Timing", response)
+        return json.loads(logs.records[-1].getMessage()), content
+
+    def test_streamed_exports_are_measured(self):
+        for extension in ("txt", "csv", "json"):
+            with self.subTest(extension=extension):
+                record, content = self.get_record(
+                    "/api/recipes/download_shopping_cart/"
+                    f"?format={extension}"
+                )
+                self.assertGreater(record["queries"], 0)
+                self.assertEqual(record["size"], len(content))
+
+    def test_regular_response_is_measured(self):
+        with self.assertLogs("foodgram.profiling", "INFO") as logs:
+            response = self.client.get("/api/recipes/")
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record["size"], len(response.content))
+        self.assertGreater(record["queries"], 0)
@@ -0,0 +1,65 @@
+from unittest import mock
+
+from api.tests.utils import FoodgramTestCase
+from django.core.cache import caches
+from django.db import connection
+from recipes.pagination import RecipePageNumberPagination
+from users.models import Subscription
+
+ESTIMATE_QUERIES = int(connection.vendor == "postgresql")
+
+
+class RecipeQueryCountTest(FoodgramTestCase):
+    page_sizes = (2, 12)
+
+    def setUp(self):
+        super().setUp()
+        tags = [self.create_tag(number) for number in range(1, 3)]
+        ingredients = [self.create_ingredient(n) for n in range(1, 3)]
+        self.user = self.create_user(0)
+        self.recipes = [
+            self.create_recipe(
+                self.create_user(number), tags, ingredients, f"Рецепт {number}"
+            )
+            for number in range(1, 13)
+        ]
+        Subscription.objects.create(
+            subscriber=self.user, author=self.recipes[0].author
+        )
+
+    def assert_queries(self, user, url, expected):
+        client = self.get_client(user)
+        for size in self.page_sizes:
+            with self.subTest(user=user, url=url, page_size=size):
+                for cache in caches.all():
+                    cache.clear()
+                with mock.patch.object(
+                    RecipePageNumberPagination, "page_size", size
+                ):
+                    with self.assertNumQueries(expected):
+                        response = client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+    def test_list(self):
+        self.assert_queries(None, "/api/recipes/", 4 + ESTIMATE_QUERIES)
+        self.assert_queries(self.user, "/api/recipes/", 5 + ESTIMATE_QUERIES)
+
+    def test_cursor_list(self):
+        self.assert_queries(None, "/api/recipes/?pagination=cursor", 3)
+        self.assert_queries(self.user, "/api/recipes/?pagination=cursor", 4)
+
+    def test_detail(self):
+        url = f"/api/recipes/{self.recipes[0].pk}/"
+        self.assert_queries(None, url, 3)
+        self.assert_queries(self.user, url, 4)
+
+    def test_annotations_are_served(self):
+        recipe = self.recipes[0]
+        client = self.get_client(self.user)
+        client.post(f"/api/recipes/{recipe.pk}/favorite/")
+        data = client.get(f"/api/recipes/{recipe.pk}/").json()
+        self.assertTrue(data["is_favorited"])
+        self.assertFalse(data["is_in_shopping_cart"])
+        self.assertTrue(data["author"]["is_subscribed"])
+        self.assertEqual(len(data["tags"]), 2)
+        self.assertEqual(len(data["ingredients"]), 2)
@@ -0,0 +1,93 @@
+from api.tests.utils import FoodgramTestCase
+from recipes.models import IngredientAmountInRecipe, ShoppingListLine
+
+
+class RecipeUpdateTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user(1)
+        self.tags = [self.create_tag(number) for number in range(1, 4)]
+        self.ingredients = [self.create_ingredient(n) for n in range(1, 4)]
+        self.recipe = self.create_recipe(
+            self.user, self.tags[:2], self.ingredients
+        )
+        self.url = f"/api/recipes/{self.recipe.pk}/"
+        self.client = self.get_client(self.user)
+        self.client.post(f"{self.url}shopping_cart/")
+
+    def patch(self, data, expected_queries):
+        with self.assertNumQueries(expected_queries):
+            response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def get_amounts(self, ingredients):
+        return {
+            ingredient["id"]: ingredient["amount"]
+            for ingredient in ingredients
+        }
+
+    def test_title_only(self):
+        data = self.patch({"name": "Новое название"}, 8)
+        self.assertEqual(data["name"], "Новое название")
+        self.assertEqual(data["text"], "Описание")
+        self.assertEqual(len(data["tags"]), 2)
+        self.assertEqual(
+            self.get_amounts(data["ingredients"]),
+            {
+                ingredient.pk: number + 1
+                for number, ingredient in enumerate(self.ingredients)
+            },
+        )
+
+    def test_single_ingredient_change(self):
+        first, second, third = self.ingredients
+        data = self.patch(
+            {
+                "ingredients": [
+                    {"id": first.pk, "amount": 10},
+                    {"id": second.pk, "amount": 2},
+                    {"id": third.pk, "amount": 3},
+                ]
+            },
+            14,
+        )
+        expected = {first.pk: 10, second.pk: 2, third.pk: 3}
+        self.assertEqual(self.get_amounts(data["ingredients"]), expected)
+        self.assertEqual(
+            dict(
+                IngredientAmountInRecipe.objects.filter(
+                    recipe=self.recipe
+                ).values_list("ingredient_id", "amount")
+            ),
+            expected,
+        )
+        self.assertEqual(
+            dict(
+                ShoppingListLine.objects.filter(user=self.user).values_list(
+                    "ingredient_id", "total"
+                )
+            ),
+            expected,
+        )
+
+    def test_tags_and_ingredients_are_replaced(self):
+        first, second, third = self.ingredients
+        response = self.client.patch(
+            self.url,
+            {
+                "tags": [self.tags[2].pk],
+                "ingredients": [
+                    {"id": first.pk, "amount": 1},
+                    {"id": third.pk, "amount": 7},
+                ],
+            },
+            format="json",
+        )
+        data = response.json()
+        self.assertEqual(
+            [tag["id"] for tag in data["tags"]], [self.tags[2].pk]
+        )
+        self.assertEqual(
+            self.get_amounts(data["ingredients"]), {first.pk: 1, third.pk: 7}
+        )
@@ -0,0 +1,64 @@
+import time
+from unittest import mock
+
+from api.tests.utils import FoodgramTestCase
+from django.core.cache import cache
+from foodgram.settings import REFERENCE_DATA_VERSION_TTL
+from recipes.models import Ingredient, Tag
+
+
+class ReferenceDataCacheTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_tag(1)
+        self.create_ingredient(1)
+        self.client = self.get_client()
+
+    def test_warm_cache_needs_no_queries(self):
+        for url in ("/api/tags/", "/api/ingredients/"):
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                with self.assertNumQueries(0):
+                    second = self.client.get(url)
+                self.assertEqual(second.content, first.content)
+                with self.assertNumQueries(0):
+                    response = self.client.get(
+                        url, HTTP_IF_NONE_MATCH=first["ETag"]
+                    )
+                self.assertEqual(response.status_code, 304)
+
+    def test_change_in_process_is_visible_at_once(self):
+        self.client.get("/api/tags/")
+        self.create_tag(2)
+        self.assertEqual(len(self.client.get("/api/tags/").json()), 2)
+
+    def test_change_from_other_process_is_visible_after_ttl(self):
+        first = self.client.get("/api/ingredients/")
+        self.client.get("/api/tags/")
+        Ingredient.objects.bulk_create(
+            (Ingredient(name="Соль", measurement_unit="г"),)
+        )
+        Tag.objects.bulk_create(
+            (Tag(name="Новый", slug="new", color="#ABCDEF"),)
+        )
+        later = time.time() + REFERENCE_DATA_VERSION_TTL + 1
+        with mock.patch("time.time", return_value=later):
+            response = self.client.get("/api/ingredients/")
+            tags = self.client.get("/api/tags/").json()
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        self.assertEqual(len(response.json()), 2)
+        self.assertEqual(len(tags), 2)
+
+    def test_etag_depends_only_on_content(self):
+        for url in ("/api/tags/", "/api/ingredients/"):
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                later = time.time() + REFERENCE_DATA_VERSION_TTL + 1
+                with mock.patch("time.time", return_value=later):
+                    response = self.client.get(
+                        url, HTTP_IF_NONE_MATCH=first["ETag"]
+                    )
+                self.assertEqual(response.status_code, 304)
+                cache.clear()
+                response = self.client.get(url)
+                self.assertEqual(response["ETag"], first["ETag"])
@@ -0,0 +1,246 @@
+import threading
+from contextlib import nullcontext
+from unittest import mock, skipIf
+
+from api.tests.utils import FoodgramTestCase
+from django.core.cache import caches
+from django.db import IntegrityError, connection
+from django.test import TransactionTestCase
+from recipes.models import (IsFavorited, IsInShoppingCart, Recipe,
+                            ShoppingListLine)
+
+
+class AddRelationTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user(1)
+        self.recipe = self.create_recipe(self.user)
+        self.client = self.get_client(self.user)
+
+    def test_duplicate_is_rejected(self):
+        url = f"/api/recipes/{self.recipe.pk}/favorite/"
+        self.assertEqual(self.client.post(url).status_code, 201)
+        self.assertEqual(self.client.post(url).status_code, 400)
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.favorites_count, 1)
+
+    def test_side_effect_error_is_not_reported_as_duplicate(self):
+        with mock.patch(
+            "recipes.shopping_list.add_recipe",
+            side_effect=IntegrityError("unique_shopping_list_line"),
+        ):
+            with self.assertRaises(IntegrityError):
+                self.client.post(
+                    f"/api/recipes/{self.recipe.pk}/shopping_cart/"
+                )
+        self.assertFalse(IsInShoppingCart.objects.exists())
+
+
+class BulkAddTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user(1)
+        self.recipes = [
+            self.create_recipe(self.user, name=f"Рецепт {number}")
+            for number in range(3)
+        ]
+        self.client = self.get_client(self.user)
+
+    def check_bulk_add(self):
+        first, second, third = (recipe.pk for recipe in self.recipes)
+        self.client.post(f"/api/recipes/{first}/favorite/")
+        response = self.client.post(
+            "/api/recipes/favorite/",
+            {"recipes": [third, first, 999, second]},
+            format="json",
+        )
+        self.assertEqual(
+            response.json(),
+            {"added": [third, second], "skipped": [first, 999]},
+        )
+        self.assertEqual(
+            dict(Recipe.objects.values_list("pk", "favorites_count")),
+            {first: 1, second: 1, third: 1},
+        )
+
+    def test_bulk_add(self):
+        self.check_bulk_add()
+
+    @mock.patch("recipes.relations.can_return_rows", return_value=False)
+    def test_bulk_add_without_returning(self, can_return_rows):
+        self.check_bulk_add()
+
+
+class BulkRemoveTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user(1)
+        self.ingredient = self.create_ingredient(1)
+        self.recipes = [
+            self.create_recipe(
+                self.user, ingredients=(self.ingredient,), name=f"Рецепт {n}"
+            )
+            for n in range(20)
+        ]
+        self.client = self.get_client(self.user)
+
+    def remove(self, url, recipe_ids):
+        response = self.client.delete(
+            url, {"recipes": recipe_ids}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def check_bulk_remove(self, url, model, counter, queries=None):
+        recipe_ids = [recipe.pk for recipe in self.recipes]
+        self.client.post(url, {"recipes": recipe_ids}, format="json")
+        kept = recipe_ids.pop()
+        with self.assertNumQueries(queries) if queries else nullcontext():
+            data = self.remove(url, [999] + recipe_ids)
+        self.assertEqual(data, {"removed": recipe_ids, "skipped": [999]})
+        self.assertEqual(
+            list(model.objects.values_list("recipe_id", flat=True)), [kept]
+        )
+        self.assertEqual(
+            dict(Recipe.objects.values_list("pk", counter)),
+            {
+                recipe_id: int(recipe_id == kept)
+                for recipe_id in [kept] + recipe_ids
+            },
+        )
+        self.assertEqual(
+            self.remove(url, recipe_ids),
+            {"removed": [], "skipped": recipe_ids},
+        )
+
+    def test_bulk_remove_favorites(self):
+        self.check_bulk_remove(
+            "/api/recipes/favorite/", IsFavorited, "favorites_count", 4
+        )
+
+    def test_bulk_remove_from_cart(self):
+        self.check_bulk_remove(
+            "/api/recipes/shopping_cart/",
+            IsInShoppingCart,
+            "in_carts_count",
+            10,
+        )
+        self.assertEqual(
+            list(ShoppingListLine.objects.values_list("total", flat=True)),
+            [1],
+        )
+
+    @mock.patch("recipes.relations.can_return_rows", return_value=False)
+    def test_bulk_remove_without_returning(self, can_return_rows):
+        self.check_bulk_remove(
+            "/api/recipes/shopping_cart/", IsInShoppingCart, "in_carts_count"
+        )
+        self.assertEqual(
+            list(ShoppingListLine.objects.values_list("total", flat=True)),
+            [1],
+        )
+
+
+@skipIf(
+    connection.vendor == "sqlite",
+    "SQLite блокирует базу на запись и не допускает параллельных вставок",
+)
+class ConcurrentAddRelationTest(TransactionTestCase):
+    parallel = 4
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.user = FoodgramTestCase.create_user(1)
+        self.recipe = FoodgramTestCase.create_recipe(self.user)
+
+    def post_in_parallel(self, url, data=None):
+        return self.request_in_parallel("post", url, data)
+
+    def request_in_parallel(self, method, url, data=None):
+        barrier = threading.Barrier(self.parallel)
+        responses = []
+
+        def post():
+            client = FoodgramTestCase.get_client(self.user)
+            try:
+                barrier.wait()
+                responses.append(
+                    getattr(client, method)(url, data, format="json")
+                )
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=post) for _ in range(self.parallel)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return responses
+
+    def test_parallel_favorites_add_one_relation(self):
+        responses = self.post_in_parallel(
+            f"/api/recipes/{self.recipe.pk}/favorite/"
+        )
+        statuses = sorted(response.status_code for response in responses)
+        self.assertEqual(statuses, [201] + [400] * (self.parallel - 1))
+        self.assertEqual(IsFavorited.objects.count(), 1)
+        self.assertEqual(
+            Recipe.objects.get(pk=self.recipe.pk).favorites_count, 1
+        )
+
+    def test_parallel_cart_adds_one_relation(self):
+        responses = self.post_in_parallel(
+            f"/api/recipes/{self.recipe.pk}/shopping_cart/"
+        )
+        statuses = sorted(response.status_code for response in responses)
+        self.assertEqual(statuses, [201] + [400] * (self.parallel - 1))
+        self.assertEqual(IsInShoppingCart.objects.count(), 1)
+
+    def test_parallel_bulk_adds_count_each_recipe_once(self):
+        recipes = [self.recipe] + [
+            FoodgramTestCase.create_recipe(self.user, name=f"Рецепт {number}")
+            for number in range(3)
+        ]
+        responses = self.post_in_parallel(
+            "/api/recipes/favorite/",
+            {"recipes": [recipe.pk for recipe in recipes]},
+        )
+        added = [
+            recipe_id
+            for response in responses
+            for recipe_id in response.json()["added"]
+        ]
+        self.assertEqual(
+            sorted(added), sorted(recipe.pk for recipe in recipes)
+        )
+        self.assertEqual(
+            set(Recipe.objects.values_list("favorites_count", flat=True)),
+            {1},
+        )
+
+    def test_parallel_bulk_removes_count_each_recipe_once(self):
+        recipes = [self.recipe] + [
+            FoodgramTestCase.create_recipe(self.user, name=f"Рецепт {number}")
+            for number in range(3)
+        ]
+        recipe_ids = [recipe.pk for recipe in recipes]
+        client = FoodgramTestCase.get_client(self.user)
+        client.post(
+            "/api/recipes/shopping_cart/",
+            {"recipes": recipe_ids},
+            format="json",
+        )
+        responses = self.request_in_parallel(
+            "delete", "/api/recipes/shopping_cart/", {"recipes": recipe_ids}
+        )
+        removed = [
+            recipe_id
+            for response in responses
+            for recipe_id in response.json()["removed"]
+        ]
+        self.assertEqual(sorted(removed), sorted(recipe_ids))
+        self.assertEqual(
+            set(Recipe.objects.values_list("in_carts_count", flat=True)),
+            {0},
+        )
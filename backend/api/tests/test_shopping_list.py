@@ -0,0 +1,73 @@
+from io import StringIO
+from unittest import mock
+
+from api.tests.utils import FoodgramTestCase
+from django.core.management import CommandError, call_command
+from recipes import shopping_list
+from recipes.models import ShoppingListLine
+
+
+class ShoppingListTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user(1)
+        self.ingredients = [self.create_ingredient(n) for n in range(1, 3)]
+        self.first = self.create_recipe(self.user, (), self.ingredients)
+        self.second = self.create_recipe(
+            self.user, (), self.ingredients[1:], name="Второй"
+        )
+        self.client = self.get_client(self.user)
+
+    def get_totals(self):
+        return dict(
+            ShoppingListLine.objects.filter(user=self.user).values_list(
+                "ingredient_id", "total"
+            )
+        )
+
+    def check_add_and_remove(self):
+        for recipe in (self.first, self.second):
+            response = self.client.post(
+                f"/api/recipes/{recipe.pk}/shopping_cart/"
+            )
+            self.assertEqual(response.status_code, 201)
+        first, second = self.ingredients
+        self.assertEqual(self.get_totals(), {first.pk: 1, second.pk: 3})
+        self.client.delete(f"/api/recipes/{self.first.pk}/shopping_cart/")
+        self.assertEqual(self.get_totals(), {second.pk: 1})
+
+    def test_totals_follow_cart(self):
+        self.check_add_and_remove()
+
+    @mock.patch("recipes.shopping_list.UPSERT_VENDORS", ())
+    def test_totals_follow_cart_without_upsert(self):
+        self.check_add_and_remove()
+
+    def test_existing_line_is_upserted_without_reading_it(self):
+        ingredient = self.ingredients[1]
+        with mock.patch.object(
+            shopping_list,
+            "update_lines",
+            side_effect=AssertionError("existing lines must not be read"),
+        ):
+            ShoppingListLine.objects.create(
+                user=self.user, ingredient=ingredient, total=5
+            )
+            shopping_list.add_recipe(self.user.pk, self.second)
+        self.assertEqual(self.get_totals(), {ingredient.pk: 6})
+
+    def test_rebuild_replaces_drifted_lines(self):
+        for recipe in (self.first, self.second):
+            self.client.post(f"/api/recipes/{recipe.pk}/shopping_cart/")
+        first, second = self.ingredients
+        ShoppingListLine.objects.filter(ingredient=first).update(total=40)
+        ShoppingListLine.objects.filter(ingredient=second).delete()
+        with self.assertRaises(CommandError):
+            call_command(
+                "rebuild_shopping_lists", check=True, stdout=StringIO()
+            )
+        out = StringIO()
+        call_command("rebuild_shopping_lists", stdout=out)
+        self.assertIn("Создано строк списков покупок: 2", out.getvalue())
+        self.assertEqual(self.get_totals(), {first.pk: 1, second.pk: 3})
+        call_command("rebuild_shopping_lists", check=True, stdout=StringIO())
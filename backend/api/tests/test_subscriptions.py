@@ -0,0 +1,60 @@
+from api.tests.utils import FoodgramTestCase
+from django.core.cache import caches
+from users.models import Subscription
+
+
+class SubscriptionQueryCountTest(FoodgramTestCase):
+    url = "/api/users/subscriptions/?recipes_limit=2"
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user(0)
+        self.client = self.get_client(self.user)
+        self.authors = [self.create_user(number) for number in range(1, 9)]
+        for author in self.authors:
+            for number in range(3):
+                self.create_recipe(author, name=f"Рецепт {number}")
+
+    def subscribe(self, authors):
+        Subscription.objects.bulk_create(
+            Subscription(subscriber=self.user, author=author)
+            for author in authors
+        )
+
+    def get_subscriptions(self, expected_queries):
+        for cache in caches.all():
+            cache.clear()
+        with self.assertNumQueries(expected_queries):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_query_count_does_not_depend_on_authors(self):
+        self.subscribe(self.authors[:2])
+        self.assertEqual(len(self.get_subscriptions(4)["results"]), 2)
+        self.subscribe(self.authors[2:])
+        self.assertEqual(len(self.get_subscriptions(4)["results"]), 6)
+
+    def test_recipes_are_limited_per_author(self):
+        self.subscribe(self.authors)
+        for author in self.get_subscriptions(4)["results"]:
+            self.assertEqual(author["recipes_count"], 3)
+            self.assertEqual(len(author["recipes"]), 2)
+            self.assertTrue(author["is_subscribed"])
+
+    def test_invalid_recipes_limit_is_rejected(self):
+        self.subscribe(self.authors[:1])
+        for limit in ("abc", "-1", "0"):
+            with self.subTest(limit=limit):
+                response = self.client.get(
+                    f"/api/users/subscriptions/?recipes_limit={limit}"
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("recipes_limit", response.json())
+        response = self.client.post(
+            f"/api/users/{self.authors[1].pk}/subscribe/?recipes_limit=abc"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(
+            Subscription.objects.filter(author=self.authors[1]).exists()
+        )
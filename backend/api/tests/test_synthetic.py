@@ -0,0 +1,62 @@
+from api.tests.utils import FoodgramTestCase
+from django.db import connection
+from recipes.models import (Ingredient, IngredientAmountInRecipe, IsFavorited,
+                            IsInShoppingCart, Recipe, ShoppingListLine, Tag)
+from recipes.synthetic import (flush_dataset, generate_dataset,
+                               get_synthetic_users)
+from rest_framework.authtoken.models import Token
+from users.models import Subscription, User
+
+LOCK_QUERIES = int(connection.vendor == "postgresql")
+
+
+class FlushDatasetTest(FoodgramTestCase):
+    def test_flush_keeps_real_data(self):
+        user = self.create_user(1)
+        tag = self.create_tag(1)
+        ingredient = self.create_ingredient(1)
+        recipe = self.create_recipe(user, (tag,), (ingredient,))
+        generate_dataset(30, 10, seed=1)
+        synthetic = get_synthetic_users().first()
+        Subscription.objects.create(subscriber=user, author=synthetic)
+        synthetic_recipe = Recipe.objects.filter(author=synthetic).first()
+        IsFavorited.objects.create(user=user, recipe=synthetic_recipe)
+        IsInShoppingCart.objects.create(user=user, recipe=synthetic_recipe)
+
+        with self.assertNumQueries(31 + LOCK_QUERIES):
+            flush_dataset()
+
+        self.assertEqual(list(User.objects.all()), [user])
+        self.assertEqual(list(Recipe.objects.all()), [recipe])
+        self.assertEqual(list(Tag.objects.all()), [tag])
+        self.assertEqual(list(Ingredient.objects.all()), [ingredient])
+        self.assertEqual(IngredientAmountInRecipe.objects.count(), 1)
+        self.assertEqual(recipe.tags.count(), 1)
+        self.assertFalse(Subscription.objects.exists())
+        self.assertFalse(IsFavorited.objects.exists())
+        self.assertFalse(IsInShoppingCart.objects.exists())
+        self.assertFalse(ShoppingListLine.objects.exists())
+
+    def test_flush_keeps_lookalike_users_and_drops_cached_tokens(self):
+        generate_dataset(10, 10, seed=1)
+        lookalikes = [
+            User.objects.create_user(
+                username=username, email=email, password="Password-12345"
+            )
+            for username, email in (
+                ("synthetic_chef", "synthetic_chef@example.com"),
+                ("synthetic42", "chef@mail.ru"),
+                ("synthetic", "synthetic@example.com"),
+            )
+        ]
+        synthetic = get_synthetic_users().first()
+        token = Token.objects.create(user=synthetic)
+        client = self.get_client()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.assertEqual(client.get("/api/users/me/").status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            flush_dataset()
+
+        self.assertEqual(list(User.objects.order_by("pk")), lookalikes)
+        self.assertEqual(client.get("/api/users/me/").status_code, 401)
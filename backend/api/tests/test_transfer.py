@@ -0,0 +1,113 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from api.tests.utils import FoodgramTestCase, get_image_bytes
+from django.core.files.base import ContentFile
+from recipes.models import ImageProcessingTask, Ingredient, Recipe
+from recipes.storage import content_addressed_storage
+from recipes.transfer import (RecipeImporter, export_recipes,
+                              get_checkpoint_path, get_images_dir,
+                              import_recipes)
+
+
+class FailingImporter(RecipeImporter):
+    def import_batch(self, items):
+        if self.stats["imported"]:
+            raise OSError("Сбой")
+        super().import_batch(items)
+
+
+def get_snapshot():
+    return sorted(
+        (
+            recipe.author.username,
+            recipe.name,
+            recipe.text,
+            recipe.cooking_time,
+            recipe.pub_date,
+            recipe.image.name,
+            tuple(sorted(tag.slug for tag in recipe.tags.all())),
+            tuple(
+                sorted(
+                    (
+                        amount.ingredient.name,
+                        amount.ingredient.measurement_unit,
+                        amount.amount,
+                    )
+                    for amount in recipe.ingredient_amount_in_recipe.all()
+                )
+            ),
+        )
+        for recipe in Recipe.objects.all()
+    )
+
+
+class RecipeTransferTest(FoodgramTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "recipes.jsonl"
+        self.images_dir = get_images_dir(self.path)
+        users = [self.create_user(number) for number in range(1, 3)]
+        tags = [self.create_tag(number) for number in range(1, 3)]
+        ingredients = [self.create_ingredient(n) for n in range(1, 4)]
+        for number in range(3):
+            recipe = self.create_recipe(
+                users[number % 2],
+                tags[number:],
+                ingredients[number:],
+                f"Рецепт {number}",
+            )
+            recipe.image = content_addressed_storage.save(
+                "recipes/image.png",
+                ContentFile(get_image_bytes((number, 0, 0))),
+            )
+            recipe.save(update_fields=("image",))
+        self.create_recipe(users[0], name="Без картинки")
+        self.snapshot = [
+            row for row in get_snapshot() if row[1] != "Без картинки"
+        ]
+        stats = export_recipes(self.path, self.images_dir, batch_size=2)
+        self.assertEqual(stats["exported"], 4)
+        self.assertEqual(stats["missing_images"], 1)
+        Recipe.objects.all().delete()
+
+    def import_recipes(self, importer_class=RecipeImporter, **options):
+        return import_recipes(
+            self.path, importer_class(self.images_dir), batch_size=1, **options
+        )
+
+    def test_round_trip(self):
+        Ingredient.objects.filter(name="Ингредиент 3").delete()
+        stats = self.import_recipes()
+        self.assertEqual(stats["imported"], 3)
+        self.assertEqual(stats["skipped"], 1)
+        self.assertEqual(stats["ingredients_created"], 1)
+        self.assertEqual(get_snapshot(), self.snapshot)
+        self.assertEqual(ImageProcessingTask.objects.count(), 3)
+        self.assertFalse(get_checkpoint_path(self.path).exists())
+
+    def test_resume_from_checkpoint(self):
+        with self.assertRaises(OSError):
+            self.import_recipes(FailingImporter)
+        self.assertEqual(Recipe.objects.count(), 1)
+        self.assertEqual(
+            get_checkpoint_path(self.path).read_text(), '{"line": 1}'
+        )
+        stdout = StringIO()
+        stats = self.import_recipes(stdout=stdout)
+        self.assertIn("Продолжение со строки 2", stdout.getvalue())
+        self.assertEqual(stats["imported"], 2)
+        self.assertEqual(stats["duplicates"], 0)
+        self.assertEqual(get_snapshot(), self.snapshot)
+        self.assertFalse(get_checkpoint_path(self.path).exists())
+
+    def test_replay_skips_duplicates(self):
+        self.import_recipes()
+        stats = self.import_recipes(restart=True)
+        self.assertEqual(stats["imported"], 0)
+        self.assertEqual(stats["duplicates"], 3)
+        self.assertEqual(stats["skipped"], 1)
+        self.assertEqual(get_snapshot(), self.snapshot)
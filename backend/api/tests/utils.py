@@ -0,0 +1,95 @@
+import base64
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from PIL import Image
+from recipes.models import Ingredient, IngredientAmountInRecipe, Recipe, Tag
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from users.models import User
+
+
+def get_image_bytes(color=(200, 120, 40), size=(16, 16)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def get_image(color=(200, 120, 40), size=(16, 16)):
+    encoded = base64.b64encode(get_image_bytes(color, size)).decode()
+    return f"data:image/png;base64,{encoded}"
+
+
+class FoodgramTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_override = override_settings(
+            MEDIA_ROOT=cls.media_root,
+            PASSWORD_HASHERS=(
+                "django.contrib.auth.hashers.MD5PasswordHasher",
+            ),
+        )
+        cls.media_override.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.media_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+
+    @staticmethod
+    def create_user(number):
+        return User.objects.create_user(
+            username=f"user{number}",
+            email=f"user{number}@example.com",
+            password="Password-12345",
+        )
+
+    @staticmethod
+    def create_tag(number):
+        return Tag.objects.create(
+            name=f"Тэг {number}",
+            slug=f"tag-{number}",
+            color=f"#0000{number:02X}",
+        )
+
+    @staticmethod
+    def create_ingredient(number):
+        return Ingredient.objects.create(
+            name=f"Ингредиент {number}", measurement_unit="г"
+        )
+
+    @staticmethod
+    def create_recipe(author, tags=(), ingredients=(), name="Рецепт"):
+        recipe = Recipe.objects.create(
+            author=author,
+            name=name,
+            text="Описание",
+            cooking_time=10,
+            image="recipes/test.png",
+        )
+        recipe.tags.set(tags)
+        IngredientAmountInRecipe.objects.bulk_create(
+            IngredientAmountInRecipe(
+                recipe=recipe, ingredient=ingredient, amount=number + 1
+            )
+            for number, ingredient in enumerate(ingredients)
+        )
+        return recipe
+
+    @staticmethod
+    def get_client(user=None):
+        client = APIClient()
+        if user is not None:
+            token, _ = Token.objects.get_or_create(user=user)
+            client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        return client
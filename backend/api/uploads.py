@@ -0,0 +1,107 @@
+import base64
+import binascii
+import uuid
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+
+from django.core.files.uploadedfile import UploadedFile
+from foodgram.errors import ErrorMesage
+from foodgram.settings import (IMAGE_UPLOAD_MAX_SIDE, IMAGE_UPLOAD_MAX_SIZE,
+                               IMAGE_UPLOAD_SPOOL_SIZE)
+from PIL import Image
+from rest_framework.exceptions import ValidationError
+
+BASE64_MARKER = ";base64,"
+CHUNK_SIZE = 64 * 1024
+HEADER_MIN_SIZE = 1024
+HEADER_MAX_SIZE = 256 * 1024
+IMAGE_EXTENSIONS = {
+    "JPEG": "jpg",
+    "PNG": "png",
+    "GIF": "gif",
+    "WEBP": "webp",
+}
+WHITESPACE = b" \t\r\n"
+
+
+class Base64ImageDecoder:
+    def __init__(self):
+        self.file = SpooledTemporaryFile(max_size=IMAGE_UPLOAD_SPOOL_SIZE)
+        self.pending = b""
+        self.head = b""
+        self.size = 0
+        self.image_format = None
+
+    def feed(self, data):
+        data = self.pending + data.translate(None, WHITESPACE)
+        length = len(data) - len(data) % 4
+        self.pending = data[length:]
+        if length:
+            self.write(self.decode(data[:length]))
+
+    def decode(self, data):
+        try:
+            return base64.b64decode(data, validate=True)
+        except (binascii.Error, ValueError):
+            raise ValidationError(ErrorMesage.INVALID_IMAGE)
+
+    def write(self, chunk):
+        self.size += len(chunk)
+        if self.size > IMAGE_UPLOAD_MAX_SIZE:
+            raise ValidationError(
+                ErrorMesage.IMAGE_TOO_LARGE.format(
+                    IMAGE_UPLOAD_MAX_SIZE // (1024 * 1024)
+                )
+            )
+        if self.image_format is None:
+            self.head += chunk
+            self.inspect()
+        self.file.write(chunk)
+
+    def inspect(self, final=False):
+        if len(self.head) < HEADER_MIN_SIZE and not final:
+            return
+        try:
+            image = Image.open(BytesIO(self.head))
+        except Image.DecompressionBombError:
+            raise ValidationError(
+                ErrorMesage.IMAGE_SIDE_TOO_LARGE.format(IMAGE_UPLOAD_MAX_SIDE)
+            )
+        except (OSError, SyntaxError, ValueError):
+            if final or len(self.head) >= HEADER_MAX_SIZE:
+                raise ValidationError(ErrorMesage.INVALID_IMAGE)
+            return
+        if image.format not in IMAGE_EXTENSIONS:
+            raise ValidationError(ErrorMesage.INVALID_IMAGE)
+        if max(image.size) > IMAGE_UPLOAD_MAX_SIDE:
+            raise ValidationError(
+                ErrorMesage.IMAGE_SIDE_TOO_LARGE.format(IMAGE_UPLOAD_MAX_SIDE)
+            )
+        self.image_format = image.format
+        self.head = b""
+
+    def close(self):
+        if self.pending:
+            raise ValidationError(ErrorMesage.INVALID_IMAGE)
+        if self.image_format is None:
+            self.inspect(final=True)
+        self.file.seek(0)
+        return UploadedFile(
+            file=self.file,
+            name=f"{uuid.uuid4()}.{IMAGE_EXTENSIONS[self.image_format]}",
+            content_type=Image.MIME[self.image_format],
+            size=self.size,
+        )
+
+
+def decode_base64_image(data):
+    offset = data.find(BASE64_MARKER, 0, CHUNK_SIZE)
+    offset = 0 if offset == -1 else offset + len(BASE64_MARKER)
+    decoder = Base64ImageDecoder()
+    for start in range(offset, len(data), CHUNK_SIZE):
+        try:
+            chunk = data[start:start + CHUNK_SIZE].encode("ascii")
+        except UnicodeEncodeError:
+            raise ValidationError(ErrorMesage.INVALID_IMAGE)
+        decoder.feed(chunk)
+    return decoder.close()
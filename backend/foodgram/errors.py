@@ -1,3 +1,16 @@
 class ErrorMesage:
     ALLOWED_NAME = 'Можно использовать только буквы, цифры и "@.+-_".'
     ALLOWED_ME = 'Имя пользователя "me" использовать нельзя!'
+    ALREADY_SUBSCRIBED = "Вы уже подписаны на данного автора"
+    ALREADY_FAVORITED = "Этот рецепт уже в избранном"
+    ALREADY_IN_SHOPPING_CART = "Этот рецепт уже в списоке покупок"
+    INVALID_IMAGE = (
+        "Загрузите корректное изображение в формате JPEG, PNG, GIF или WEBP"
+    )
+    IMAGE_TOO_LARGE = "Размер изображения не должен превышать {} МБ"
+    IMAGE_SIDE_TOO_LARGE = (
+        "Стороны изображения не должны превышать {} пикселей"
+    )
+    CURSOR_ORDERING = (
+        "Курсорная пагинация не поддерживает сортировку по популярности"
+    )
@@ -0,0 +1,285 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import wraps
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from foodgram.settings import (REQUEST_PROFILING, REQUEST_PROFILING_DIR,
+                               REQUEST_PROFILING_DUPLICATE_THRESHOLD,
+                               REQUEST_PROFILING_FLUSH_INTERVAL)
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger(__name__)
+
+TIME_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+HISTOGRAM_BUCKETS = {
+    "duration": TIME_BUCKETS,
+    "sql": TIME_BUCKETS,
+    "serializer": TIME_BUCKETS,
+    "render": TIME_BUCKETS,
+    "queries": (1, 2, 5, 10, 20, 50, 100, 200, 500),
+    "size": (1024, 10 * 1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024),
+}
+FINGERPRINT_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),
+    (re.compile(r"\s+"), " "),
+)
+
+current_profile = ContextVar("current_profile", default=None)
+histograms = {}
+histograms_lock = threading.Lock()
+last_flush = time.monotonic()
+
+
+def get_fingerprint(sql):
+    for pattern, replacement in FINGERPRINT_PATTERNS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def observe(route, metric, value):
+    bounds = HISTOGRAM_BUCKETS[metric]
+    histogram = histograms.setdefault(route, {}).setdefault(
+        metric, {"buckets": [0] * (len(bounds) + 1), "count": 0, "sum": 0}
+    )
+    position = 0
+    while position < len(bounds) and value > bounds[position]:
+        position += 1
+    histogram["buckets"][position] += 1
+    histogram["count"] += 1
+    histogram["sum"] += value
+
+
+def flush_histograms(force=False):
+    global last_flush
+    now = time.monotonic()
+    if not force and now - last_flush < REQUEST_PROFILING_FLUSH_INTERVAL:
+        return
+    last_flush = now
+    os.makedirs(REQUEST_PROFILING_DIR, exist_ok=True)
+    path = REQUEST_PROFILING_DIR / f"{os.getpid()}.json"
+    temporary_path = path.with_suffix(".tmp")
+    with histograms_lock:
+        content = json.dumps(histograms)
+    temporary_path.write_text(content)
+    os.replace(temporary_path, path)
+
+
+def load_histograms():
+    merged = {}
+    for path in REQUEST_PROFILING_DIR.glob("*.json"):
+        for route, metrics in json.loads(path.read_text()).items():
+            for metric, histogram in metrics.items():
+                target = merged.setdefault(route, {}).setdefault(
+                    metric,
+                    {
+                        "buckets": [0] * len(histogram["buckets"]),
+                        "count": 0,
+                        "sum": 0,
+                    },
+                )
+                for position, count in enumerate(histogram["buckets"]):
+                    target["buckets"][position] += count
+                target["count"] += histogram["count"]
+                target["sum"] += histogram["sum"]
+    return merged
+
+
+def get_percentile(metric, histogram, percentile):
+    bounds = HISTOGRAM_BUCKETS[metric]
+    threshold = histogram["count"] * percentile / 100
+    seen = 0
+    for position, count in enumerate(histogram["buckets"]):
+        seen += count
+        if seen >= threshold and count:
+            if position < len(bounds):
+                return f"≤{bounds[position]}"
+            return f">{bounds[-1]}"
+    return "-"
+
+
+def profile_serializer(method):
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        profile = current_profile.get()
+        if profile is None or profile.serializer_depth:
+            return method(*args, **kwargs)
+        profile.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            profile.serializer_time += time.perf_counter() - start
+            profile.serializer_depth -= 1
+
+    return wrapper
+
+
+def instrument_serializers():
+    if getattr(BaseSerializer.is_valid, "__wrapped__", None):
+        return
+    BaseSerializer.is_valid = profile_serializer(BaseSerializer.is_valid)
+    BaseSerializer.data = property(
+        profile_serializer(BaseSerializer.data.fget)
+    )
+
+
+class RequestProfile:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0
+        self.serializer_time = 0
+        self.serializer_depth = 0
+        self.render_start = None
+        self.render_time = 0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.queries += 1
+            self.fingerprints[get_fingerprint(sql)] += 1
+
+    def finish_render(self, response):
+        self.render_time += time.perf_counter() - self.render_start
+
+    def get_duplicates(self):
+        return [
+            {"fingerprint": fingerprint, "count": count}
+            for fingerprint, count in self.fingerprints.most_common()
+            if count >= REQUEST_PROFILING_DUPLICATE_THRESHOLD
+        ]
+
+
+def get_response_size(response):
+    if response.streaming:
+        length = response.get("Content-Length")
+        return int(length) if length else None
+    return len(response.content)
+
+
+def get_route(request):
+    match = request.resolver_match
+    view_name = match.view_name if match else "unresolved"
+    return f"{request.method} {view_name}"
+
+
+def is_generated_stream(response):
+    return (
+        response.streaming
+        and not getattr(response, "is_async", False)
+        and getattr(response, "file_to_stream", None) is None
+    )
+
+
+def profile_connections(profile):
+    stack = ExitStack()
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(profile))
+    return stack
+
+
+class RequestProfilingMiddleware:
+    def __init__(self, get_response):
+        if not REQUEST_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrument_serializers()
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        try:
+            with profile_connections(profile):
+                response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        elapsed = time.perf_counter() - profile.start
+        response["Server-Timing"] = ", ".join(
+            (
+                f"db;dur={profile.sql_time * 1000:.1f};"
+                f'desc="{profile.queries} queries"',
+                f"serializer;dur={profile.serializer_time * 1000:.1f}",
+                f"render;dur={profile.render_time * 1000:.1f}",
+                f"total;dur={elapsed * 1000:.1f}",
+            )
+        )
+        if is_generated_stream(response):
+            response.streaming_content = self.stream(
+                request, response, profile, response.streaming_content
+            )
+        else:
+            self.record(
+                request, response, profile, get_response_size(response)
+            )
+        return response
+
+    def stream(self, request, response, profile, content):
+        size = 0
+        try:
+            with profile_connections(profile):
+                for chunk in content:
+                    size += len(chunk)
+                    yield chunk
+        finally:
+            self.record(request, response, profile, size)
+
+    def record(self, request, response, profile, size):
+        duration = time.perf_counter() - profile.start
+        route = get_route(request)
+        duplicates = profile.get_duplicates()
+        logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "route": route,
+                    "status": response.status_code,
+                    "duration_ms": round(duration * 1000, 1),
+                    "queries": profile.queries,
+                    "sql_ms": round(profile.sql_time * 1000, 1),
+                    "serializer_ms": round(profile.serializer_time * 1000, 1),
+                    "render_ms": round(profile.render_time * 1000, 1),
+                    "size": size,
+                    "duplicates": duplicates,
+                },
+                ensure_ascii=False,
+            )
+        )
+        for duplicate in duplicates:
+            logger.warning(
+                "Возможный N+1 в %s: %s запросов %s",
+                route,
+                duplicate["count"],
+                duplicate["fingerprint"],
+            )
+        with histograms_lock:
+            observe(route, "duration", duration * 1000)
+            observe(route, "sql", profile.sql_time * 1000)
+            observe(route, "serializer", profile.serializer_time * 1000)
+            observe(route, "render", profile.render_time * 1000)
+            observe(route, "queries", profile.queries)
+            if size is not None:
+                observe(route, "size", size)
+        flush_histograms()
+
+    def process_template_response(self, request, response):
+        profile = current_profile.get()
+        if profile is not None:
+            profile.render_start = time.perf_counter()
+            response.add_post_render_callback(profile.finish_render)
+        return response
@@ -21,6 +21,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "django_filters",
     "drf_extra_fields",
     "colorfield",
@@ -30,6 +31,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "foodgram.profiling.RequestProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -109,12 +111,53 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "api.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 6,
 }
 
+DOCUMENTS_CACHE = "documents"
+DOCUMENTS_CACHE_MAX_ENTRIES = int(os.getenv("DOCUMENTS_CACHE_MAX_ENTRIES", 300))
+DOCUMENTS_CACHE_MAX_SIZE = int(
+    os.getenv("DOCUMENTS_CACHE_MAX_SIZE", 64 * 1024 * 1024)
+)
+DOCUMENTS_CACHE_ENTRY_MAX_SIZE = (
+    DOCUMENTS_CACHE_MAX_SIZE // DOCUMENTS_CACHE_MAX_ENTRIES
+)
+AUTH_CACHE = "auth"
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    },
+    DOCUMENTS_CACHE: {
+        "BACKEND": os.getenv(
+            "DOCUMENTS_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.getenv("DOCUMENTS_CACHE_LOCATION", "documents"),
+        "TIMEOUT": int(os.getenv("DOCUMENTS_CACHE_TIMEOUT", 60 * 60 * 24)),
+        "OPTIONS": {
+            "MAX_ENTRIES": DOCUMENTS_CACHE_MAX_ENTRIES,
+        },
+    },
+    AUTH_CACHE: {
+        "BACKEND": os.getenv(
+            "AUTH_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.getenv("AUTH_CACHE_LOCATION", "auth"),
+        "TIMEOUT": int(os.getenv("AUTH_CACHE_TIMEOUT", 60)),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("AUTH_CACHE_MAX_ENTRIES", 10000)),
+        },
+    },
+}
+
 DJOSER = {
     "LOGIN_FIELD": "email",
     "SERIALIZERS": {
@@ -134,9 +177,61 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
 ADMIN_EMAIL = "evkasonka@yandex.ru"
 LETTERS_SUBJECT = "Код подтверждения"
 
-FILE_NAME_PDF = "shop_сart.pdf"
+FILE_NAME_SHOPPING_LIST = "shop_сart"
 
 MIN_COOKING_TIME = 1
 MIN_INGREDIENTS_AMOUNT = 1
 
 MIN_RECIPE_COOKING_TIME = 1
+
+BULK_RECIPES_LIMIT = 100
+
+IMAGE_RENDITIONS = {
+    "thumbnail": 160,
+    "card": 480,
+    "full": 1280,
+}
+IMAGE_RENDITION_FORMATS = {
+    "webp": "WEBP",
+    "jpeg": "JPEG",
+}
+IMAGE_RENDITION_QUALITY = 80
+IMAGE_PROCESSING_IN_PROCESS = os.getenv("IMAGE_PROCESSING_IN_PROCESS", "True") == "True"
+IMAGE_PROCESSING_WORKERS = int(os.getenv("IMAGE_PROCESSING_WORKERS", 2))
+IMAGE_PROCESSING_MAX_ATTEMPTS = 3
+IMAGE_PROCESSING_SWEEP_SIZE = 10
+IMAGE_UPLOAD_MAX_SIZE = 20 * 1024 * 1024
+IMAGE_UPLOAD_MAX_SIDE = 8192
+IMAGE_UPLOAD_SPOOL_SIZE = 1024 * 1024
+IMAGE_RELEASE_GRACE_PERIOD = 60
+IMAGE_SWEEP_INTERVAL = int(os.getenv("IMAGE_SWEEP_INTERVAL", 600))
+
+INGREDIENT_SEARCH_LIMIT = 50
+INGREDIENT_INDEX_TTL = int(os.getenv("INGREDIENT_INDEX_TTL", 300))
+TRIGRAM_THRESHOLD = 0.3
+
+REFERENCE_DATA_MAX_AGE = int(os.getenv("REFERENCE_DATA_MAX_AGE", 300))
+REFERENCE_DATA_TIMEOUT = 60 * 60 * 24
+REFERENCE_DATA_VERSION_TTL = int(os.getenv("REFERENCE_DATA_VERSION_TTL", 60))
+
+RECIPE_COUNT_TIMEOUT = int(os.getenv("RECIPE_COUNT_TIMEOUT", 30))
+RECIPE_COUNT_ESTIMATE_MIN = 10000
+PER_USER_RECIPE_FILTERS = ("is_favorited", "is_in_shopping_cart")
+
+REQUEST_PROFILING = os.getenv("REQUEST_PROFILING", "False") == "True"
+REQUEST_PROFILING_DIR = Path(
+    os.getenv("REQUEST_PROFILING_DIR", BASE_DIR / "profiling")
+)
+REQUEST_PROFILING_FLUSH_INTERVAL = 10
+REQUEST_PROFILING_DUPLICATE_THRESHOLD = 5
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "foodgram.profiling": {"handlers": ["console"], "level": "INFO"},
+    },
+}
@@ -38,9 +38,10 @@ class RecipeAdmin(admin.ModelAdmin):
     )
     search_fields = ("name",)
 
-    @display(description="Число добавлений рецепта в избранное")
+    @display(description="Число добавлений рецепта в избранное",
+             ordering="favorites_count")
     def add_in_favorites(self, object):
-        return object.favorites.count()
+        return object.favorites_count
 
 
 class IngredientAmountInRecipeAdmin(admin.ModelAdmin):
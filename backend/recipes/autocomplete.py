@@ -0,0 +1,121 @@
+import re
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from threading import Lock
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection
+from foodgram.settings import INGREDIENT_INDEX_TTL, TRIGRAM_THRESHOLD
+from recipes.models import Ingredient
+
+WORD = re.compile(r"\w+")
+
+
+def get_trigrams(text):
+    trigrams = set()
+    for word in WORD.findall(text.lower()):
+        padded = f"  {word} "
+        trigrams.update(
+            padded[position:position + 3]
+            for position in range(len(padded) - 2)
+        )
+    return trigrams
+
+
+class IngredientIndex:
+    def __init__(self, ingredients):
+        entries = sorted(
+            (name.lower(), id, name, measurement_unit)
+            for id, name, measurement_unit in ingredients
+        )
+        self.keys = [entry[0] for entry in entries]
+        self.items = [
+            {"id": id, "name": name, "measurement_unit": measurement_unit}
+            for _, id, name, measurement_unit in entries
+        ]
+        self.trigrams = [get_trigrams(key) for key in self.keys]
+        self.postings = defaultdict(list)
+        for position, trigrams in enumerate(self.trigrams):
+            for trigram in trigrams:
+                self.postings[trigram].append(position)
+        self.built_at = time.monotonic()
+
+    def search(self, query, limit):
+        query = query.lower()
+        results = []
+        position = bisect_left(self.keys, query)
+        while (
+            len(results) < limit
+            and position < len(self.keys)
+            and self.keys[position].startswith(query)
+        ):
+            results.append(self.items[position])
+            position += 1
+        if len(results) < limit:
+            for key, item in zip(self.keys, self.items):
+                if query in key and not key.startswith(query):
+                    results.append(item)
+                    if len(results) == limit:
+                        break
+        return results
+
+    def fuzzy_search(self, query, limit):
+        query_trigrams = get_trigrams(query)
+        if not query_trigrams:
+            return []
+        shared = defaultdict(int)
+        for trigram in query_trigrams:
+            for position in self.postings.get(trigram, ()):
+                shared[position] += 1
+        scored = []
+        for position, count in shared.items():
+            similarity = count / (
+                len(query_trigrams) + len(self.trigrams[position]) - count
+            )
+            if similarity >= TRIGRAM_THRESHOLD:
+                scored.append((-similarity, position))
+        scored.sort()
+        return [self.items[position] for _, position in scored[:limit]]
+
+
+_index = None
+_lock = Lock()
+
+
+def get_index():
+    global _index
+    index = _index
+    if (
+        index is None
+        or time.monotonic() - index.built_at > INGREDIENT_INDEX_TTL
+    ):
+        with _lock:
+            if _index is index:
+                _index = IngredientIndex(
+                    Ingredient.objects.values_list(
+                        "id", "name", "measurement_unit"
+                    ).iterator()
+                )
+            index = _index
+    return index
+
+
+def invalidate_index():
+    global _index
+    _index = None
+
+
+def search_ingredients(query, limit):
+    return get_index().search(query, limit)
+
+
+def fuzzy_search_ingredients(query, limit):
+    if connection.vendor == "postgresql":
+        return list(
+            Ingredient.objects.filter(name__trigram_similar=query)
+            .annotate(similarity=TrigramSimilarity("name", query))
+            .order_by("-similarity", "name")
+            .values("id", "name", "measurement_unit")[:limit]
+        )
+    return get_index().fuzzy_search(query, limit)
@@ -0,0 +1,101 @@
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db.models import Max
+from recipes.models import Recipe
+from recipes.pagination import invalidate_recipe_counts
+from users.models import User
+
+BATCH_SIZE = 5000
+BENCHMARK_USERNAME = "benchmark"
+
+
+def get_benchmark_author():
+    author, _ = User.objects.get_or_create(
+        username=BENCHMARK_USERNAME,
+        defaults={"email": "benchmark@example.com"},
+    )
+    return author
+
+
+def raw_delete(queryset):
+    model = queryset.model
+    pks = queryset.values("pk")
+    for field in model._meta.many_to_many:
+        field.remote_field.through.objects.filter(
+            **{f"{field.m2m_field_name()}__in": pks}
+        )._raw_delete(queryset.db)
+    for relation in model._meta.related_objects:
+        if relation.many_to_many:
+            relation.through.objects.filter(
+                **{f"{relation.field.m2m_reverse_field_name()}__in": pks}
+            )._raw_delete(queryset.db)
+        else:
+            raw_delete(
+                relation.related_model.objects.filter(
+                    **{f"{relation.field.name}__in": pks}
+                )
+            )
+    queryset._raw_delete(queryset.db)
+
+
+def delete_recipes(queryset):
+    raw_delete(queryset)
+    invalidate_recipe_counts()
+
+
+def ensure_recipes(total, stdout=None):
+    missing = total - Recipe.objects.count()
+    if missing <= 0:
+        return
+    author = get_benchmark_author()
+    while missing > 0:
+        size = min(missing, BATCH_SIZE)
+        Recipe.objects.bulk_create(
+            Recipe(
+                author=author,
+                name=f"Рецепт {number}",
+                text="Описание",
+                image="recipes/benchmark.png",
+                cooking_time=1 + number % 120,
+            )
+            for number in range(size)
+        )
+        missing -= size
+        if stdout is not None:
+            stdout.write(f"Осталось создать рецептов: {missing}")
+
+
+@contextmanager
+def temporary_recipes(total, stdout=None, keep=False):
+    last_pk = Recipe.objects.aggregate(last=Max("pk"))["last"] or 0
+    ensure_recipes(total, stdout)
+    try:
+        yield
+    finally:
+        if not keep:
+            delete_recipes(
+                Recipe.objects.filter(
+                    pk__gt=last_pk, author__username=BENCHMARK_USERNAME
+                )
+            )
+
+
+def best_time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def get_percentiles(values, percentiles=(50, 90, 95, 99)):
+    if len(values) < 2:
+        return {f"p{percentile}": values[0] for percentile in percentiles}
+    quantiles = statistics.quantiles(values, n=100, method="inclusive")
+    return {
+        f"p{percentile}": quantiles[percentile - 1]
+        for percentile in percentiles
+    }
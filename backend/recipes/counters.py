@@ -0,0 +1,43 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from recipes.models import IsFavorited, IsInShoppingCart, Recipe
+
+COUNTERS = {
+    "favorites_count": IsFavorited,
+    "in_carts_count": IsInShoppingCart,
+}
+
+
+def change_counter(recipe_id, field, delta):
+    Recipe.objects.filter(pk=recipe_id).update(**{field: F(field) + delta})
+
+
+def get_live_count(field):
+    return Coalesce(
+        Subquery(
+            COUNTERS[field]
+            .objects.filter(recipe=OuterRef("pk"))
+            .order_by()
+            .values("recipe")
+            .annotate(total=Count("pk"))
+            .values("total")
+        ),
+        0,
+    )
+
+
+def get_counter_drift():
+    queryset = Recipe.objects.annotate(
+        **{f"live_{field}": get_live_count(field) for field in COUNTERS}
+    )
+    for field in COUNTERS:
+        for recipe_id, stored, live in queryset.exclude(
+            **{field: F(f"live_{field}")}
+        ).values_list("pk", field, f"live_{field}"):
+            yield recipe_id, field, stored, live
+
+
+def reconcile_counters():
+    return Recipe.objects.update(
+        **{field: get_live_count(field) for field in COUNTERS}
+    )
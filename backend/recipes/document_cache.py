@@ -0,0 +1,85 @@
+import hashlib
+import json
+from collections import Counter
+from tempfile import SpooledTemporaryFile
+
+from django.core.cache import caches
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.http import (content_disposition_header, parse_etags,
+                               quote_etag)
+from foodgram.settings import DOCUMENTS_CACHE, DOCUMENTS_CACHE_ENTRY_MAX_SIZE
+from recipes.shopping_cart_to_pdf import SPOOL_MAX_SIZE
+
+KEY_PREFIX = "shopping-list"
+CACHE_STATUS_HEADER = "X-Document-Cache"
+
+stats = Counter(hits=0, misses=0)
+
+
+def get_document_key(rows, format):
+    digest = hashlib.sha256(format.encode())
+    for row in rows:
+        digest.update(
+            json.dumps(
+                (
+                    row["ingredient__name"],
+                    row["ingredient__measurement_unit"],
+                    row["ingredient_sum"],
+                ),
+                ensure_ascii=False,
+            ).encode()
+        )
+    return digest.hexdigest()
+
+
+def render_document(rows, render):
+    file = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    render(rows, file)
+    size = file.tell()
+    file.seek(0)
+    return file, size
+
+
+def get_document(key, rows, render):
+    cache = caches[DOCUMENTS_CACHE]
+    cache_key = f"{KEY_PREFIX}:{key}"
+    document = cache.get(cache_key)
+    if document is not None:
+        stats["hits"] += 1
+        return document, True
+    stats["misses"] += 1
+    file, size = render_document(rows, render)
+    if size > SPOOL_MAX_SIZE:
+        return file, False
+    with file:
+        document = file.read()
+    if size <= DOCUMENTS_CACHE_ENTRY_MAX_SIZE:
+        cache.set(cache_key, document)
+    return document, False
+
+
+def document_response(request, rows, format, render, content_type,
+                      filename):
+    rows = list(rows)
+    key = get_document_key(rows, format)
+    etag = quote_etag(key)
+    if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+        response = HttpResponseNotModified()
+    else:
+        document, hit = get_document(key, rows, render)
+        if isinstance(document, bytes):
+            response = HttpResponse(document, content_type=content_type)
+            response["Content-Disposition"] = content_disposition_header(
+                True, filename
+            )
+        else:
+            response = FileResponse(
+                document,
+                as_attachment=True,
+                filename=filename,
+                content_type=content_type,
+            )
+        response[CACHE_STATUS_HEADER] = "hit" if hit else "miss"
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
@@ -1,5 +1,7 @@
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework
 from recipes.models import Ingredient, Recipe
+from recipes.reference_cache import get_tag_ids
 
 
 class IngredientSearchFilter(rest_framework.FilterSet):
@@ -14,7 +16,7 @@ class RecipeFilter(rest_framework.FilterSet):
     author = rest_framework.CharFilter(field_name="author__id",
                                        method="filter_author")
 
-    tags = rest_framework.AllValuesMultipleFilter(field_name="tags__slug")
+    tags = rest_framework.CharFilter(method="filter_tags")
 
     is_favorited = rest_framework.BooleanFilter(method="get_is_favorited")
 
@@ -36,12 +38,22 @@ class RecipeFilter(rest_framework.FilterSet):
             return queryset.filter(author=self.request.user)
         return queryset.filter(author_id=user)
 
+    def filter_tags(self, queryset, *args):
+        tag_ids = get_tag_ids(self.request.query_params.getlist("tags"))
+        return queryset.filter(
+            Exists(
+                Recipe.tags.through.objects.filter(
+                    recipe=OuterRef("pk"), tag_id__in=tag_ids
+                )
+            )
+        )
+
     def get_is_favorited(self, queryset, name, value):
         if value:
-            return queryset.filter(favorites__user=self.request.user)
+            return queryset.filter(is_favorited=True)
         return queryset
 
     def get_is_in_shopping_cart(self, queryset, name, value):
         if value:
-            return queryset.filter(shopping_cart__user=self.request.user)
+            return queryset.filter(is_in_shopping_cart=True)
         return queryset
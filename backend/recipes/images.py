@@ -0,0 +1,184 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from foodgram.settings import (IMAGE_PROCESSING_IN_PROCESS,
+                               IMAGE_PROCESSING_MAX_ATTEMPTS,
+                               IMAGE_PROCESSING_SWEEP_SIZE,
+                               IMAGE_PROCESSING_WORKERS,
+                               IMAGE_RELEASE_GRACE_PERIOD,
+                               IMAGE_RENDITION_FORMATS,
+                               IMAGE_RENDITION_QUALITY, IMAGE_RENDITIONS)
+from PIL import Image
+from recipes.models import ImageProcessingTask, Recipe
+from recipes.storage import content_addressed_storage
+
+RENDITIONS_DIRECTORY = "recipes/renditions"
+IMAGES_DIRECTORY = "recipes"
+
+executor = ThreadPoolExecutor(
+    max_workers=IMAGE_PROCESSING_WORKERS,
+    thread_name_prefix="recipe-images",
+)
+
+
+def delete_renditions(renditions):
+    for formats in renditions.values():
+        for name in formats.values():
+            default_storage.delete(name)
+
+
+def render_renditions(image):
+    stem = PurePosixPath(image.name).stem
+    renditions = {}
+    with image.open("rb"), Image.open(image) as original:
+        original.load()
+        for size_name, size in IMAGE_RENDITIONS.items():
+            resized = original.copy()
+            resized.thumbnail((size, size), reducing_gap=3.0)
+            renditions[size_name] = {}
+            for extension, format in IMAGE_RENDITION_FORMATS.items():
+                converted = resized
+                if format == "JPEG" and resized.mode != "RGB":
+                    converted = resized.convert("RGB")
+                buffer = BytesIO()
+                converted.save(
+                    buffer, format, quality=IMAGE_RENDITION_QUALITY
+                )
+                renditions[size_name][extension] = default_storage.save(
+                    f"{RENDITIONS_DIRECTORY}/{stem}_{size_name}.{extension}",
+                    ContentFile(buffer.getvalue()),
+                )
+    return renditions
+
+
+def process_task(task_id):
+    task = (
+        ImageProcessingTask.objects.select_related("recipe")
+        .filter(pk=task_id, attempts__lt=IMAGE_PROCESSING_MAX_ATTEMPTS)
+        .first()
+    )
+    if task is None:
+        return False
+    image_name = task.recipe.image.name
+    try:
+        renditions = render_renditions(task.recipe.image)
+    except Exception as error:
+        ImageProcessingTask.objects.filter(pk=task.pk).update(
+            attempts=F("attempts") + 1, error=repr(error)
+        )
+        return False
+    with transaction.atomic():
+        task = (
+            ImageProcessingTask.objects.select_for_update()
+            .select_related("recipe")
+            .filter(pk=task_id)
+            .first()
+        )
+        if task is None or task.recipe.image.name != image_name:
+            transaction.on_commit(lambda: delete_renditions(renditions))
+            return False
+        replaced = task.recipe.image_renditions
+        Recipe.objects.filter(pk=task.recipe_id).update(
+            image_renditions=renditions
+        )
+        task.delete()
+        transaction.on_commit(lambda: delete_renditions(replaced))
+    return True
+
+
+def run_task(task_id):
+    try:
+        process_task(task_id)
+        for pending_id in get_pending_task_ids(
+            IMAGE_PROCESSING_SWEEP_SIZE, exclude=task_id
+        ):
+            process_task(pending_id)
+    finally:
+        connection.close()
+
+
+def enqueue_image(recipe):
+    if recipe.image_renditions:
+        replaced = recipe.image_renditions
+        transaction.on_commit(lambda: delete_renditions(replaced))
+        recipe.image_renditions = {}
+        Recipe.objects.filter(pk=recipe.pk).update(image_renditions={})
+    task, _ = ImageProcessingTask.objects.update_or_create(
+        recipe=recipe, defaults={"attempts": 0, "error": ""}
+    )
+    if IMAGE_PROCESSING_IN_PROCESS:
+        transaction.on_commit(lambda: executor.submit(run_task, task.pk))
+
+
+def release_image(name):
+    if not name or Recipe.objects.filter(image=name).exists():
+        return
+    try:
+        expired = is_expired(content_addressed_storage, name)
+    except FileNotFoundError:
+        return
+    if expired:
+        content_addressed_storage.delete(name)
+
+
+def is_expired(storage, name):
+    age = timezone.now() - storage.get_modified_time(name)
+    return age.total_seconds() >= IMAGE_RELEASE_GRACE_PERIOD
+
+
+def get_hash_directories(storage, path):
+    directories, _ = storage.listdir(path)
+    return sorted(
+        f"{path}/{directory}"
+        for directory in directories
+        if len(directory) == 2
+    )
+
+
+def sweep_orphan_images():
+    storage = content_addressed_storage
+    if not storage.exists(IMAGES_DIRECTORY):
+        return 0
+    deleted = 0
+    for parent in get_hash_directories(storage, IMAGES_DIRECTORY):
+        for directory in get_hash_directories(storage, parent):
+            _, files = storage.listdir(directory)
+            names = {f"{directory}/{file}" for file in files}
+            names -= set(
+                Recipe.objects.filter(image__in=names).values_list(
+                    "image", flat=True
+                )
+            )
+            for name in sorted(names):
+                if is_expired(storage, name):
+                    storage.delete(name)
+                    deleted += 1
+    return deleted
+
+
+def get_pending_task_ids(limit, exclude=None):
+    return list(
+        ImageProcessingTask.objects.filter(
+            attempts__lt=IMAGE_PROCESSING_MAX_ATTEMPTS
+        )
+        .exclude(pk=exclude)
+        .values_list("pk", flat=True)[:limit]
+    )
+
+
+def get_rendition_urls(recipe, request=None):
+    urls = {}
+    for size_name, formats in recipe.image_renditions.items():
+        urls[size_name] = {}
+        for extension, name in formats.items():
+            url = default_storage.url(name)
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            urls[size_name][extension] = url
+    return urls
@@ -0,0 +1,149 @@
+import csv
+import io
+import json
+import re
+from collections import Counter
+from itertools import islice
+
+from django.db import connection, transaction
+from recipes.models import Ingredient
+
+BATCH_SIZE = 5000
+READ_SIZE = 64 * 1024
+SEPARATORS = re.compile(r"[\s,]*")
+NAME_LENGTH = Ingredient._meta.get_field("name").max_length
+UNIT_LENGTH = Ingredient._meta.get_field("measurement_unit").max_length
+STAGING_TABLE = "ingredient_staging"
+
+
+def read_csv(path):
+    with open(path, encoding="utf-8", newline="") as file:
+        for row in csv.reader(file):
+            yield (row + ["", ""])[:2]
+
+
+def read_json(path):
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as file:
+        buffer = file.read(READ_SIZE)
+        position = SEPARATORS.match(buffer).end()
+        if buffer.startswith("[", position):
+            position += 1
+        while True:
+            position = SEPARATORS.match(buffer, position).end()
+            if buffer.startswith("]", position):
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                chunk = file.read(READ_SIZE)
+                if not chunk:
+                    if position < len(buffer):
+                        raise
+                    return
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            yield item.get("name"), item.get("measurement_unit")
+
+
+READERS = {
+    "csv": read_csv,
+    "json": read_json,
+}
+
+
+def clean_rows(rows, stats):
+    for name, measurement_unit in rows:
+        name = (name or "").strip()
+        measurement_unit = (measurement_unit or "").strip()
+        if (
+            not name
+            or not measurement_unit
+            or len(name) > NAME_LENGTH
+            or len(measurement_unit) > UNIT_LENGTH
+        ):
+            stats["skipped"] += 1
+            continue
+        stats["read"] += 1
+        yield name, measurement_unit
+
+
+def get_chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class CsvRowStream:
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+        self.pending = ""
+
+    def read(self, size=-1):
+        lines = [self.pending]
+        length = len(self.pending)
+        for row in self.rows:
+            self.writer.writerow(row)
+            line = self.buffer.getvalue()
+            self.buffer.seek(0)
+            self.buffer.truncate()
+            lines.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+        data = "".join(lines)
+        if size < 0:
+            size = len(data)
+        self.pending = data[size:]
+        return data[:size].encode("utf-8")
+
+
+def load_with_bulk_create(rows, batch_size):
+    for chunk in get_chunks(rows, batch_size):
+        Ingredient.objects.bulk_create(
+            (
+                Ingredient(name=name, measurement_unit=measurement_unit)
+                for name, measurement_unit in dict.fromkeys(map(tuple, chunk))
+            ),
+            ignore_conflicts=True,
+        )
+
+
+def load_with_copy(rows):
+    quote_name = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {STAGING_TABLE} "
+            f"(name varchar({NAME_LENGTH}), "
+            f"measurement_unit varchar({UNIT_LENGTH})) ON COMMIT DROP"
+        )
+        cursor.copy_expert(
+            f"COPY {STAGING_TABLE} (name, measurement_unit) "
+            f"FROM STDIN WITH (FORMAT csv)",
+            CsvRowStream(rows),
+        )
+        cursor.execute(
+            f"INSERT INTO {quote_name(Ingredient._meta.db_table)} "
+            f"(name, measurement_unit) "
+            f"SELECT DISTINCT name, measurement_unit FROM {STAGING_TABLE} "
+            f"ON CONFLICT (name, measurement_unit) DO NOTHING"
+        )
+        cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+
+
+def load_ingredients(path, file_format, batch_size=BATCH_SIZE, copy=True):
+    stats = Counter()
+    before = Ingredient.objects.count()
+    rows = clean_rows(READERS[file_format](path), stats)
+    if copy and connection.vendor == "postgresql":
+        load_with_copy(rows)
+    else:
+        load_with_bulk_create(rows, batch_size)
+    stats["created"] = Ingredient.objects.count() - before
+    return stats
@@ -0,0 +1,265 @@
+import base64
+import itertools
+import json
+import subprocess
+import time
+from io import BytesIO
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from recipes import images
+from recipes.benchmarks import get_percentiles
+from recipes.models import (Ingredient, IsFavorited, IsInShoppingCart, Recipe,
+                            Tag)
+from recipes.synthetic import get_synthetic_tags, get_synthetic_users
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from users.models import Subscription, User
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ("git", "rev-parse", "--short", "HEAD"),
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def get_image():
+    buffer = BytesIO()
+    Image.new("RGB", (64, 64), (200, 120, 40)).save(buffer, "PNG")
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+    return f"data:image/png;base64,{encoded}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагружает основные эндпоинты через тестовый клиент и сохраняет "
+        "пропускную способность, перцентили задержки и число запросов к БД."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--scenarios", nargs="+")
+        parser.add_argument("--output", help="Файл для результатов в JSON.")
+        parser.add_argument(
+            "--compare", help="Файл с предыдущими результатами."
+        )
+
+    def handle(self, *args, **options):
+        user = (
+            get_synthetic_users()
+            .annotate(cart=Count("shopping_cart"))
+            .order_by("-cart", "pk")
+            .first()
+        )
+        if user is None:
+            raise CommandError(
+                "Нет синтетических данных, запустите generate_synthetic_data."
+            )
+        token, _ = Token.objects.get_or_create(user=user)
+        self.anonymous = APIClient()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.created = []
+        in_process = images.IMAGE_PROCESSING_IN_PROCESS
+        images.IMAGE_PROCESSING_IN_PROCESS = False
+        try:
+            scenarios = self.get_scenarios(user)
+            if options["scenarios"]:
+                scenarios = {
+                    name: scenarios[name] for name in options["scenarios"]
+                }
+            results = {
+                name: self.run(request, options["requests"],
+                               options["warmup"])
+                for name, request in scenarios.items()
+            }
+        finally:
+            images.IMAGE_PROCESSING_IN_PROCESS = in_process
+            Recipe.objects.filter(pk__in=self.created).delete()
+        report = {
+            "commit": get_commit(),
+            "created": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "dataset": {
+                "users": User.objects.count(),
+                "recipes": Recipe.objects.count(),
+                "favorites": IsFavorited.objects.count(),
+                "carts": IsInShoppingCart.objects.count(),
+                "subscriptions": Subscription.objects.count(),
+            },
+            "scenarios": results,
+        }
+        self.write_table(results)
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as file:
+                self.write_comparison(json.load(file)["scenarios"], results)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+
+    def get_scenarios(self, user):
+        recipe = Recipe.objects.order_by("-favorites_count", "pk").first()
+        author_id = (
+            Recipe.objects.values("author")
+            .annotate(total=Count("pk"))
+            .order_by("-total", "author")
+            .values_list("author", flat=True)
+            .first()
+        )
+        slugs = list(
+            get_synthetic_tags()
+            .order_by("pk")
+            .values_list("slug", flat=True)[:2]
+        )
+        tags = "&".join(f"tags={slug}" for slug in slugs)
+        ingredient_ids = list(
+            Ingredient.objects.order_by("pk").values_list("pk", flat=True)[:6]
+        )
+        payload = {
+            "name": "Рецепт для замера",
+            "text": "Описание",
+            "cooking_time": 30,
+            "image": get_image(),
+            "tags": list(
+                Tag.objects.filter(slug__in=slugs).values_list("pk", flat=True)
+            ),
+            "ingredients": [
+                {"id": ingredient_id, "amount": 100}
+                for ingredient_id in ingredient_ids[:3]
+            ],
+        }
+        updated = self.create(payload)
+        variants = (
+            [
+                {"id": ingredient_id, "amount": 100}
+                for ingredient_id in ingredient_ids[:3]
+            ],
+            [
+                {"id": ingredient_id, "amount": 50}
+                for ingredient_id in ingredient_ids[2:]
+            ],
+        )
+        updates = itertools.count()
+        return {
+            "recipe_list": lambda: self.anonymous.get("/api/recipes/"),
+            "recipe_list_tags": lambda: self.anonymous.get(
+                f"/api/recipes/?{tags}"
+            ),
+            "recipe_list_author": lambda: self.anonymous.get(
+                f"/api/recipes/?author={author_id}"
+            ),
+            "recipe_list_favorited": lambda: self.client.get(
+                "/api/recipes/?is_favorited=1"
+            ),
+            "recipe_detail": lambda: self.client.get(
+                f"/api/recipes/{recipe.pk}/"
+            ),
+            "subscriptions": lambda: self.client.get(
+                "/api/users/subscriptions/"
+            ),
+            "shopping_cart_download": lambda: self.client.get(
+                "/api/recipes/download_shopping_cart/"
+            ),
+            "ingredient_search": lambda: self.anonymous.get(
+                "/api/ingredients/?name=са"
+            ),
+            "recipe_create": lambda: self.client.post(
+                "/api/recipes/", payload, format="json"
+            ),
+            "recipe_update": lambda: self.client.patch(
+                f"/api/recipes/{updated}/",
+                {"ingredients": variants[next(updates) % 2]},
+                format="json",
+            ),
+        }
+
+    def create(self, payload):
+        response = self.client.post("/api/recipes/", payload, format="json")
+        if response.status_code != 201:
+            raise CommandError(response.content.decode())
+        self.created.append(response.data["id"])
+        return response.data["id"]
+
+    def call(self, request):
+        response = request()
+        if response.streaming:
+            b"".join(response.streaming_content)
+        if response.status_code >= 400:
+            raise CommandError(
+                f"{response.status_code}: {response.content.decode()}"
+            )
+        if response.status_code == 201:
+            self.created.append(response.data["id"])
+        return response
+
+    def run(self, request, requests, warmup):
+        for _ in range(warmup):
+            self.call(request)
+        latencies = []
+        queries = []
+        started = time.perf_counter()
+        for _ in range(requests):
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                self.call(request)
+                latencies.append((time.perf_counter() - start) * 1000)
+            queries.append(len(context))
+        elapsed = time.perf_counter() - started
+        return {
+            "requests": requests,
+            "throughput_rps": round(requests / elapsed, 1),
+            "latency_ms": {
+                key: round(value, 2)
+                for key, value in {
+                    "mean": sum(latencies) / len(latencies),
+                    **get_percentiles(latencies),
+                    "max": max(latencies),
+                }.items()
+            },
+            "queries": {
+                "min": min(queries),
+                "max": max(queries),
+                "mean": round(sum(queries) / len(queries), 1),
+            },
+        }
+
+    def write_table(self, results):
+        self.stdout.write(
+            f"{'scenario':<24} {'rps':>8} {'p50, ms':>9} {'p95, ms':>9} "
+            f"{'p99, ms':>9} {'queries':>8}"
+        )
+        for name, result in results.items():
+            latency = result["latency_ms"]
+            self.stdout.write(
+                f"{name:<24} {result['throughput_rps']:>8} "
+                f"{latency['p50']:>9} {latency['p95']:>9} "
+                f"{latency['p99']:>9} {result['queries']['max']:>8}"
+            )
+
+    def write_comparison(self, baseline, results):
+        self.stdout.write(
+            f"{'scenario':<24} {'p50 before':>11} {'p50 after':>10} "
+            f"{'change':>8} {'queries':>10}"
+        )
+        for name, result in results.items():
+            if name not in baseline:
+                continue
+            before = baseline[name]["latency_ms"]["p50"]
+            after = result["latency_ms"]["p50"]
+            change = (after - before) / before * 100 if before else 0
+            self.stdout.write(
+                f"{name:<24} {before:>11} {after:>10} {change:>+7.1f}% "
+                f"{baseline[name]['queries']['max']:>4} -> "
+                f"{result['queries']['max']:<4}"
+            )
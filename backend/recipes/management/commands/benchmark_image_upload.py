@@ -0,0 +1,63 @@
+import base64
+import json
+import math
+import os
+import time
+import tracemalloc
+from io import BytesIO
+
+from api.fields import StreamingBase64ImageField
+from api.parsers import Base64StreamingJSONParser
+from django.core.management.base import BaseCommand
+from drf_extra_fields.fields import Base64ImageField
+from PIL import Image
+from rest_framework.parsers import JSONParser
+
+METHODS = {
+    "base64": (JSONParser, Base64ImageField),
+    "streaming": (Base64StreamingJSONParser, StreamingBase64ImageField),
+}
+
+
+def make_body(size):
+    side = math.isqrt(size // 3)
+    image = Image.frombytes("RGB", (side, side), os.urandom(side * side * 3))
+    buffer = BytesIO()
+    image.save(buffer, "PNG", compress_level=0)
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+    return json.dumps(
+        {"name": "Рецепт", "image": f"data:image/png;base64,{encoded}"}
+    ).encode()
+
+
+def measure(parser_class, field_class, body):
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = parser_class().parse(BytesIO(body))
+    image = field_class().to_internal_value(data["image"])
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    image.close()
+    return elapsed, peak
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время и пиковую память разбора рецепта "
+        "с картинкой в Base64."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size-mb", type=int, default=15)
+
+    def handle(self, *args, **options):
+        body = make_body(options["size_mb"] * 1024 * 1024)
+        self.stdout.write(f"Размер запроса: {len(body) / 1024 / 1024:.1f} МБ")
+        self.stdout.write(f"{'method':>10} {'time, ms':>10} {'peak, MiB':>10}")
+        for method, (parser_class, field_class) in METHODS.items():
+            elapsed, peak = measure(parser_class, field_class, body)
+            self.stdout.write(
+                f"{method:>10} {elapsed * 1000:>10.1f} "
+                f"{peak / 1024 / 1024:>10.1f}"
+            )
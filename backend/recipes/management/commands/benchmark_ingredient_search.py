@@ -0,0 +1,103 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from foodgram.settings import INGREDIENT_SEARCH_LIMIT
+from recipes.autocomplete import (fuzzy_search_ingredients, get_index,
+                                  search_ingredients)
+from recipes.models import Ingredient
+
+
+def percentile(timings, value):
+    return statistics.quantiles(timings, n=100)[value - 1] * 1e6
+
+
+def make_typo(name, generator):
+    position = generator.randrange(len(name))
+    kind = generator.choice(("delete", "replace", "swap"))
+    if kind == "delete" and len(name) > 3:
+        return name[:position] + name[position + 1:]
+    if kind == "swap" and position < len(name) - 1:
+        return (
+            name[:position] + name[position + 1] + name[position]
+            + name[position + 2:]
+        )
+    return name[:position] + generator.choice("аеиоу") + name[position + 1:]
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает задержку поиска ингредиентов по индексу в памяти "
+        "и фильтром ORM."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queries", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--fuzzy-budget-ms",
+            type=float,
+            default=20,
+            help="Допустимая задержка p99 нечеткого поиска.",
+        )
+
+    def handle(self, *args, **options):
+        names = list(Ingredient.objects.values_list("name", flat=True))
+        if not names:
+            raise CommandError("Сначала загрузите ингредиенты.")
+        generator = random.Random(options["seed"])
+        queries = [
+            name[: generator.randint(1, min(len(name), 5))]
+            for name in generator.choices(names, k=options["queries"])
+        ]
+        typos = [
+            make_typo(name, generator)
+            for name in generator.choices(names, k=options["queries"])
+        ]
+        get_index()
+        searches = (
+            (
+                "orm",
+                queries,
+                lambda query: list(
+                    Ingredient.objects.filter(
+                        name__istartswith=query
+                    ).values("id", "name", "measurement_unit")
+                ),
+            ),
+            (
+                "index",
+                queries,
+                lambda query: search_ingredients(
+                    query, INGREDIENT_SEARCH_LIMIT
+                ),
+            ),
+            (
+                "fuzzy",
+                typos,
+                lambda query: fuzzy_search_ingredients(
+                    query, INGREDIENT_SEARCH_LIMIT
+                ),
+            ),
+        )
+        self.stdout.write(
+            f"{'engine':>8} {'p50, us':>10} {'p99, us':>10} {'found':>8}"
+        )
+        for engine, engine_queries, search in searches:
+            timings = []
+            found = 0
+            for query in engine_queries:
+                start = time.perf_counter()
+                found += bool(search(query))
+                timings.append(time.perf_counter() - start)
+            self.stdout.write(
+                f"{engine:>8} {percentile(timings, 50):>10.1f} "
+                f"{percentile(timings, 99):>10.1f} "
+                f"{found / len(engine_queries):>8.1%}"
+            )
+        budget = options["fuzzy_budget_ms"]
+        if percentile(timings, 99) / 1000 > budget:
+            raise CommandError(
+                f"p99 нечеткого поиска превышает бюджет {budget} мс."
+            )
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from recipes.benchmarks import best_time, temporary_recipes
+from recipes.models import Recipe
+from recipes.pagination import RecipeCursorPagination
+from rest_framework.pagination import Cursor
+from rest_framework.test import APIClient
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время получения первой и глубокой страницы ленты "
+        "рецептов при постраничной и курсорной пагинации."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipes", type=int, default=1_000_000)
+        parser.add_argument("--page", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Не удалять созданные для замера рецепты.",
+        )
+
+    def measure(self, client, url, repeat):
+        def request():
+            response = client.get(url)
+            assert response.status_code == 200, response.status_code
+
+        return best_time(request, repeat) * 1000
+
+    def handle(self, *args, **options):
+        with temporary_recipes(
+            options["recipes"], self.stdout, options["keep"]
+        ):
+            self.run(options)
+
+    def run(self, options):
+        page = options["page"]
+        paginator = RecipeCursorPagination()
+        paginator.base_url = "/api/recipes/?pagination=cursor"
+        offset = (page - 1) * paginator.page_size
+        position = (
+            Recipe.objects.order_by(*paginator.ordering)
+            .values_list("pub_date", flat=True)[offset - 1]
+        )
+        cursor = paginator.encode_cursor(
+            Cursor(offset=0, reverse=False, position=str(position))
+        )
+        client = APIClient()
+        urls = (
+            ("page-number, page 1", "/api/recipes/?page=1"),
+            (f"page-number, page {page}", f"/api/recipes/?page={page}"),
+            ("cursor, page 1", "/api/recipes/?pagination=cursor"),
+            (f"cursor, page {page}", cursor),
+        )
+        for name, url in urls:
+            self.stdout.write(
+                f"{name:>28}: "
+                f"{self.measure(client, url, options['repeat']):.1f} ms"
+            )
@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+from recipes.document_cache import render_document
+from recipes.shopping_cart_exporters import EXPORTERS
+from recipes.shopping_cart_to_pdf import render_shopping_list_pdf
+
+
+def make_cart(size):
+    return [
+        {
+            "ingredient__name": f"Ингредиент {number}",
+            "ingredient__measurement_unit": "г",
+            "ingredient_sum": number,
+        }
+        for number in range(size)
+    ]
+
+
+def export(exporter, rows):
+    if exporter.format == "pdf":
+        file, size = render_document(rows, render_shopping_list_pdf)
+        file.close()
+        return size
+    return sum(len(chunk.encode()) for chunk in exporter.stream(iter(rows)))
+
+
+class Command(BaseCommand):
+    help = "Сравнивает стоимость выгрузки списка покупок в разных форматах."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lines", type=int, default=500)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows = make_cart(options["lines"])
+        self.stdout.write(
+            f"{'format':>8} {'min, ms':>10} {'avg, ms':>10} "
+            f"{'us/line':>10} {'size, B':>10}"
+        )
+        for format, exporter in EXPORTERS.items():
+            timings = []
+            for _ in range(options["repeat"]):
+                start = time.perf_counter()
+                length = export(exporter, rows)
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            self.stdout.write(
+                f"{format:>8} {best * 1000:>10.2f} "
+                f"{sum(timings) / len(timings) * 1000:>10.2f} "
+                f"{best * 1e6 / max(len(rows), 1):>10.2f} {length:>10}"
+            )
@@ -0,0 +1,86 @@
+import multiprocessing
+import resource
+import time
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from foodgram.settings import DOCUMENTS_CACHE
+from recipes.document_cache import stats
+from recipes.shopping_cart_exporters import EXPORTERS
+
+DEFAULT_SIZES = (10, 500, 5000)
+
+
+def make_cart(size):
+    return [
+        {
+            "ingredient__name": f"Ингредиент {number}",
+            "ingredient__measurement_unit": "г",
+            "ingredient_sum": number,
+        }
+        for number in range(size)
+    ]
+
+
+def export(request, rows):
+    start = time.perf_counter()
+    response = EXPORTERS["pdf"].export(request, rows)
+    length = sum(len(chunk) for chunk in response)
+    response.close()
+    return time.perf_counter() - start, length
+
+
+def measure(size, repeat, queue):
+    request = RequestFactory().get("/api/recipes/download_shopping_cart/")
+    rows = make_cart(size)
+    cold, warm = [], []
+    for _ in range(repeat):
+        caches[DOCUMENTS_CACHE].clear()
+        elapsed, length = export(request, rows)
+        cold.append(elapsed)
+        elapsed, length = export(request, rows)
+        warm.append(elapsed)
+    queue.put(
+        (
+            min(cold),
+            min(warm),
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            length,
+            dict(stats),
+        )
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет время и пиковую память выгрузки списка покупок в PDF "
+        "без кэша и из кэша."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", default=DEFAULT_SIZES
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        context = multiprocessing.get_context("fork")
+        self.stdout.write(
+            f"{'lines':>8} {'miss, ms':>10} {'hit, ms':>10} "
+            f"{'peak RSS, KiB':>14} {'size, B':>10} {'hits':>6} "
+            f"{'misses':>6}"
+        )
+        for size in options["sizes"]:
+            queue = context.Queue()
+            process = context.Process(
+                target=measure, args=(size, options["repeat"], queue)
+            )
+            process.start()
+            miss, hit, peak_rss, length, counters = queue.get()
+            process.join()
+            self.stdout.write(
+                f"{size:>8} {miss * 1000:>10.1f} {hit * 1000:>10.1f} "
+                f"{peak_rss:>14} {length:>10} {counters['hits']:>6} "
+                f"{counters['misses']:>6}"
+            )
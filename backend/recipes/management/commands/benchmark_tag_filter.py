@@ -0,0 +1,96 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from recipes.benchmarks import (BATCH_SIZE, best_time, get_benchmark_author,
+                                temporary_recipes)
+from recipes.models import Recipe, Tag
+from rest_framework.test import APIClient
+
+TagLink = Recipe.tags.through
+
+
+class Command(BaseCommand):
+    help = "Замеряет фильтрацию ленты рецептов по тегам."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tags", type=int, default=100)
+        parser.add_argument("--links", type=int, default=1_000_000)
+        parser.add_argument("--tags-per-recipe", type=int, default=3)
+        parser.add_argument("--filter-tags", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Не удалять созданные для замера теги и рецепты.",
+        )
+
+    def fill(self, options):
+        Tag.objects.bulk_create(
+            Tag(
+                name=f"Тег {number}",
+                slug=f"tag-{number}",
+                color=f"#{number:06X}",
+            )
+            for number in range(Tag.objects.count(), options["tags"])
+        )
+
+    def link(self, options, tag_ids, per_recipe):
+        generator = random.Random(options["seed"])
+        missing = options["links"] - TagLink.objects.count()
+        recipe_ids = (
+            Recipe.objects.filter(
+                author=get_benchmark_author(), tags__isnull=True
+            )
+            .values_list("id", flat=True)
+            .iterator()
+        )
+        links = []
+        for recipe_id in recipe_ids:
+            if missing <= 0:
+                break
+            for tag_id in generator.sample(tag_ids, per_recipe):
+                links.append(TagLink(recipe_id=recipe_id, tag_id=tag_id))
+            missing -= per_recipe
+            if len(links) >= BATCH_SIZE:
+                TagLink.objects.bulk_create(links)
+                links = []
+        TagLink.objects.bulk_create(links)
+
+    def handle(self, *args, **options):
+        last_tag = Tag.objects.aggregate(last=Max("pk"))["last"] or 0
+        try:
+            self.fill(options)
+            tag_ids = list(Tag.objects.values_list("id", flat=True))
+            per_recipe = min(options["tags_per_recipe"], len(tag_ids))
+            with temporary_recipes(
+                -(-options["links"] // per_recipe),
+                self.stdout,
+                options["keep"],
+            ):
+                self.link(options, tag_ids, per_recipe)
+                self.measure(options)
+        finally:
+            if not options["keep"]:
+                Tag.objects.filter(pk__gt=last_tag).delete()
+
+    def measure(self, options):
+        slugs = list(
+            Tag.objects.values_list("slug", flat=True)[
+                : options["filter_tags"]
+            ]
+        )
+        url = "/api/recipes/?" + "&".join(f"tags={slug}" for slug in slugs)
+        client = APIClient()
+
+        def request():
+            response = client.get(url)
+            assert response.status_code == 200, response.status_code
+            ids = [recipe["id"] for recipe in response.data["results"]]
+            assert len(ids) == len(set(ids)), "Повторяющиеся рецепты"
+
+        self.stdout.write(
+            f"{TagLink.objects.count()} связей, фильтр по {len(slugs)} тегам: "
+            f"{best_time(request, options['repeat']) * 1000:.1f} ms"
+        )
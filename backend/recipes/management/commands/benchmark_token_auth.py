@@ -0,0 +1,45 @@
+import time
+
+from api.authentication import CachedTokenAuthentication, invalidate_tokens
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from recipes.benchmarks import get_benchmark_author
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+
+AUTHENTICATORS = {
+    "token": TokenAuthentication,
+    "cached token": CachedTokenAuthentication,
+}
+
+
+class Command(BaseCommand):
+    help = "Замеряет накладные расходы аутентификации по токену на запрос."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        token, _ = Token.objects.get_or_create(user=get_benchmark_author())
+        invalidate_tokens(token.key)
+        request = RequestFactory().get(
+            "/api/recipes/", HTTP_AUTHORIZATION=f"Token {token.key}"
+        )
+        total = options["requests"]
+        self.stdout.write(f"{'backend':>14} {'us/request':>11} {'queries':>8}")
+        for name, authenticator_class in AUTHENTICATORS.items():
+            authenticator = authenticator_class()
+            queries = []
+            with connection.execute_wrapper(
+                lambda execute, *args: queries.append(1) or execute(*args)
+            ):
+                start = time.perf_counter()
+                for _ in range(total):
+                    authenticator.authenticate(Request(request))
+                elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{name:>14} {elapsed / total * 1_000_000:>11.1f} "
+                f"{len(queries):>8}"
+            )
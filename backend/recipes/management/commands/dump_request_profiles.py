@@ -0,0 +1,52 @@
+import json
+
+from django.core.management.base import BaseCommand
+from foodgram.profiling import get_percentile, load_histograms
+from foodgram.settings import REQUEST_PROFILING_DIR
+
+COLUMNS = ("duration", "sql", "serializer", "render", "queries", "size")
+
+
+class Command(BaseCommand):
+    help = "Выводит гистограммы времени запросов по маршрутам."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--json", action="store_true")
+        parser.add_argument("--reset", action="store_true")
+
+    def handle(self, *args, **options):
+        histograms = load_histograms()
+        if options["json"]:
+            self.stdout.write(json.dumps(histograms, ensure_ascii=False))
+        else:
+            self.write_table(histograms)
+        if options["reset"]:
+            for path in REQUEST_PROFILING_DIR.glob("*.json"):
+                path.unlink()
+
+    def write_table(self, histograms):
+        self.stdout.write(
+            f"{'route':<45} {'count':>7} "
+            + " ".join(f"{column:>22}" for column in COLUMNS)
+        )
+        self.stdout.write(
+            f"{'':<45} {'':>7} "
+            + " ".join(f"{'avg / p50 / p95':>22}" for _ in COLUMNS)
+        )
+        for route, metrics in sorted(histograms.items()):
+            cells = []
+            for column in COLUMNS:
+                histogram = metrics.get(column)
+                if not histogram or not histogram["count"]:
+                    cells.append(f"{'-':>22}")
+                    continue
+                average = histogram["sum"] / histogram["count"]
+                cells.append(
+                    f"{average:.1f} / "
+                    f"{get_percentile(column, histogram, 50)} / "
+                    f"{get_percentile(column, histogram, 95)}".rjust(22)
+                )
+            self.stdout.write(
+                f"{route:<45} {metrics['duration']['count']:>7} "
+                + " ".join(cells)
+            )
@@ -0,0 +1,38 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from recipes.transfer import BATCH_SIZE, export_recipes, get_images_dir
+
+
+class Command(BaseCommand):
+    help = (
+        "Выгружает рецепты в JSON Lines, картинки сохраняются "
+        "в соседний каталог."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path)
+        parser.add_argument(
+            "--images-dir",
+            type=Path,
+            help="По умолчанию - <path>.images рядом с файлом.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        start = time.perf_counter()
+        stats = export_recipes(
+            path,
+            options["images_dir"] or get_images_dir(path),
+            options["batch_size"],
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Выгружено рецептов: {stats['exported']}, "
+                f"без картинки: {stats['missing_images']}, "
+                f"{stats['exported'] / elapsed:.0f} рецептов/с"
+            )
+        )
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from recipes.synthetic import (flush_dataset, generate_dataset,
+                               get_synthetic_users)
+
+
+class Command(BaseCommand):
+    help = (
+        "Создает воспроизводимый синтетический набор пользователей, "
+        "рецептов, избранного, корзин и подписок."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipes", type=int, default=10_000)
+        parser.add_argument(
+            "--users",
+            type=int,
+            help="По умолчанию - один пользователь на десять рецептов.",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--flush",
+            action="store_true",
+            help="Удалить ранее созданный синтетический набор.",
+        )
+
+    def handle(self, *args, **options):
+        if options["flush"]:
+            flush_dataset()
+        elif get_synthetic_users().exists():
+            raise CommandError(
+                "Синтетический набор уже создан, используйте --flush."
+            )
+        users = options["users"] or max(options["recipes"] // 10, 10)
+        generate_dataset(options["recipes"], users, options["seed"],
+                         self.stdout)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Создано пользователей: {users}, "
+                f"рецептов: {options['recipes']}"
+            )
+        )
@@ -0,0 +1,64 @@
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from recipes.transfer import (BATCH_SIZE, RecipeImporter, get_images_dir,
+                              import_recipes)
+
+
+class Command(BaseCommand):
+    help = (
+        "Загружает рецепты из JSON Lines пакетами с сохранением "
+        "контрольной точки для продолжения после сбоя."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path)
+        parser.add_argument(
+            "--images-dir",
+            type=Path,
+            help="По умолчанию - <path>.images рядом с файлом.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--default-author",
+            help="Автор для рецептов, чьих авторов нет в базе.",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Начать с начала файла, игнорируя контрольную точку.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        importer = RecipeImporter(
+            options["images_dir"] or get_images_dir(path),
+            options["default_author"],
+        )
+        start = time.perf_counter()
+        try:
+            stats = import_recipes(
+                path,
+                importer,
+                options["batch_size"],
+                options["restart"],
+                self.stdout,
+            )
+        except (OSError, json.JSONDecodeError, KeyError) as error:
+            raise CommandError(
+                f"Импорт остановлен: {error!r}. "
+                f"Повторный запуск продолжит с контрольной точки."
+            )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Импортировано рецептов: {stats['imported']}, "
+                f"пропущено: {stats['skipped']}, "
+                f"дубликатов: {stats['duplicates']}, "
+                f"новых ингредиентов: {stats['ingredients_created']}, "
+                f"{stats['imported'] / elapsed:.0f} рецептов/с. "
+                f"Картинки обработает команда process_images."
+            )
+        )
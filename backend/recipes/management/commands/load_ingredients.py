@@ -0,0 +1,62 @@
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from foodgram.settings import BASE_DIR
+from recipes.autocomplete import invalidate_index
+from recipes.ingredient_loader import BATCH_SIZE, READERS, load_ingredients
+from recipes.reference_cache import bump_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Загружает ингредиенты из CSV или JSON без дублей, "
+        "потоково и пакетами."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            nargs="?",
+            type=Path,
+            default=BASE_DIR / "data" / "ingredients.csv",
+        )
+        parser.add_argument(
+            "--format",
+            choices=READERS,
+            help="По умолчанию определяется по расширению файла.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Не использовать COPY даже на PostgreSQL.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or path.suffix.lstrip(".").lower()
+        if file_format not in READERS:
+            raise CommandError(f"Неизвестный формат файла: {path}")
+        start = time.perf_counter()
+        try:
+            stats = load_ingredients(
+                path,
+                file_format,
+                options["batch_size"],
+                copy=not options["no_copy"],
+            )
+        except (OSError, json.JSONDecodeError) as error:
+            raise CommandError(error)
+        elapsed = time.perf_counter() - start
+        invalidate_index()
+        bump_version("ingredients")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Прочитано строк: {stats['read']}, "
+                f"пропущено: {stats['skipped']}, "
+                f"добавлено: {stats['created']}, "
+                f"{stats['read'] / elapsed:.0f} строк/с"
+            )
+        )
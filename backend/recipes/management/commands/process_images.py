@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+from foodgram.settings import IMAGE_SWEEP_INTERVAL
+from recipes.images import (get_pending_task_ids, process_task,
+                            sweep_orphan_images)
+
+
+class Command(BaseCommand):
+    help = (
+        "Обрабатывает очередь уменьшенных копий картинок рецептов и "
+        "удаляет картинки, на которые больше не ссылаются рецепты."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=50)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Не завершаться, а ждать новые задачи.",
+        )
+        parser.add_argument("--sleep", type=float, default=5)
+        parser.add_argument(
+            "--sweep-interval",
+            type=float,
+            default=IMAGE_SWEEP_INTERVAL,
+            help="Как часто (в секундах) удалять ненужные картинки.",
+        )
+
+    def handle(self, *args, **options):
+        swept = None
+        while True:
+            task_ids = get_pending_task_ids(options["batch"])
+            processed = sum(process_task(task_id) for task_id in task_ids)
+            if task_ids:
+                self.stdout.write(
+                    f"Обработано картинок: {processed} из {len(task_ids)}"
+                )
+            now = time.monotonic()
+            if swept is None or now - swept >= options["sweep_interval"]:
+                swept = now
+                deleted = sweep_orphan_images()
+                if deleted:
+                    self.stdout.write(f"Удалено картинок: {deleted}")
+            if not options["loop"]:
+                break
+            if not task_ids:
+                time.sleep(options["sleep"])
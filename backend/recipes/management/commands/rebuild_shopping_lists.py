@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from recipes.shopping_list import (get_live_totals, get_stored_totals,
+                                   rebuild_lines)
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересобирает строки списков покупок по корзинам пользователей "
+        "или проверяет их расхождение с актуальной суммой."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Только сравнить таблицу с актуальной суммой.",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            live = get_live_totals()
+            stored = get_stored_totals()
+            drift = sorted(
+                key for key in live.keys() | stored.keys()
+                if live.get(key) != stored.get(key)
+            )
+            for user_id, ingredient_id in drift:
+                self.stdout.write(
+                    f"user={user_id} ingredient={ingredient_id}: "
+                    f"stored={stored.get((user_id, ingredient_id))} "
+                    f"live={live.get((user_id, ingredient_id))}"
+                )
+            if drift:
+                raise CommandError(f"Найдено расхождений: {len(drift)}")
+            self.stdout.write(self.style.SUCCESS("Расхождений нет"))
+            return
+        created = rebuild_lines()
+        self.stdout.write(
+            self.style.SUCCESS(f"Создано строк списков покупок: {created}")
+        )
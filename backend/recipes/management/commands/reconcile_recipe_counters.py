@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from recipes.counters import get_counter_drift, reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает счетчики избранного и списков покупок рецептов "
+        "или проверяет их расхождение с фактическими данными."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Только сравнить счетчики с фактическими данными.",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            drift = 0
+            for recipe_id, field, stored, live in get_counter_drift():
+                drift += 1
+                self.stdout.write(
+                    f"recipe={recipe_id} {field}: "
+                    f"stored={stored} live={live}"
+                )
+            if drift:
+                raise CommandError(f"Найдено расхождений: {drift}")
+            self.stdout.write(self.style.SUCCESS("Расхождений нет"))
+            return
+        updated = reconcile_counters()
+        self.stdout.write(
+            self.style.SUCCESS(f"Пересчитано рецептов: {updated}")
+        )
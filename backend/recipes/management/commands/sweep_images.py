@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from recipes.images import sweep_orphan_images
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет картинки рецептов, на которые больше не ссылается "
+        "ни один рецепт."
+    )
+
+    def handle(self, *args, **options):
+        deleted = sweep_orphan_images()
+        self.stdout.write(
+            self.style.SUCCESS(f"Удалено картинок: {deleted}")
+        )
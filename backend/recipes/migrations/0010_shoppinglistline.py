@@ -0,0 +1,89 @@
+# Generated by Django 4.2.4 on 2026-10-18 20:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_shopping_list_lines(apps, schema_editor):
+    IngredientAmountInRecipe = apps.get_model("recipes", "IngredientAmountInRecipe")
+    ShoppingListLine = apps.get_model("recipes", "ShoppingListLine")
+    totals = (
+        IngredientAmountInRecipe.objects.filter(recipe__shopping_cart__isnull=False)
+        .values("recipe__shopping_cart__user", "ingredient")
+        .annotate(total=models.Sum("amount"))
+        .order_by()
+    )
+    ShoppingListLine.objects.bulk_create(
+        (
+            ShoppingListLine(
+                user_id=row["recipe__shopping_cart__user"],
+                ingredient_id=row["ingredient"],
+                total=row["total"],
+            )
+            for row in totals.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("recipes", "0009_alter_ingredientamountinrecipe_recipe"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ShoppingListLine",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "total",
+                    models.PositiveIntegerField(
+                        help_text="Суммарное количество ингредиента в списке покупок",
+                        verbose_name="Количество",
+                    ),
+                ),
+                (
+                    "ingredient",
+                    models.ForeignKey(
+                        help_text="Ингредиент",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="shopping_list_lines",
+                        to="recipes.ingredient",
+                        verbose_name="Ингредиент",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        help_text="Пользователь",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="shopping_list_lines",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Строка списка покупок",
+                "verbose_name_plural": "Строки списков покупок",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="shoppinglistline",
+            constraint=models.UniqueConstraint(
+                fields=("user", "ingredient"), name="unique_shopping_list_line"
+            ),
+        ),
+        migrations.RunPython(fill_shopping_list_lines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.4 on 2026-10-18 20:13
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    Recipe = apps.get_model("recipes", "Recipe")
+    counters = {
+        "favorites_count": apps.get_model("recipes", "IsFavorited"),
+        "in_carts_count": apps.get_model("recipes", "IsInShoppingCart"),
+    }
+    Recipe.objects.update(
+        **{
+            field: Coalesce(
+                models.Subquery(
+                    model.objects.filter(recipe=models.OuterRef("pk"))
+                    .order_by()
+                    .values("recipe")
+                    .annotate(total=models.Count("pk"))
+                    .values("total")
+                ),
+                0,
+            )
+            for field, model in counters.items()
+        }
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipes", "0013_recipe_tags_tag_recipe_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recipe",
+            name="favorites_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Добавлений в избранное",
+                verbose_name="Добавлений в избранное",
+            ),
+        ),
+        migrations.AddField(
+            model_name="recipe",
+            name="in_carts_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Добавлений в список покупок",
+                verbose_name="Добавлений в список покупок",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recipe",
+            index=models.Index(
+                fields=["-favorites_count", "-pub_date"],
+                name="recipe_favorites_count_idx",
+            ),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
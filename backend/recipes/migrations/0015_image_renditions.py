@@ -0,0 +1,84 @@
+# Generated by Django 4.2.4 on 2026-10-18 20:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def enqueue_existing_images(apps, schema_editor):
+    Recipe = apps.get_model("recipes", "Recipe")
+    ImageProcessingTask = apps.get_model("recipes", "ImageProcessingTask")
+    ImageProcessingTask.objects.bulk_create(
+        (
+            ImageProcessingTask(recipe_id=recipe_id)
+            for recipe_id in Recipe.objects.values_list("pk", flat=True)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipes", "0014_recipe_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recipe",
+            name="image_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Пути к уменьшенным копиям картинки по размерам и форматам",
+                verbose_name="Уменьшенные копии картинки",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ImageProcessingTask",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(
+                        auto_now_add=True, help_text="Создана", verbose_name="Создана"
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, help_text="Попытки", verbose_name="Попытки"
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(
+                        blank=True, help_text="Последняя ошибка", verbose_name="Ошибка"
+                    ),
+                ),
+                (
+                    "recipe",
+                    models.OneToOneField(
+                        help_text="Рецепт",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="image_task",
+                        to="recipes.recipe",
+                        verbose_name="Рецепт",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Обработка картинки",
+                "verbose_name_plural": "Очередь обработки картинок",
+                "ordering": ("created",),
+            },
+        ),
+        migrations.RunPython(enqueue_existing_images, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.4 on 2026-10-18 20:18
+
+import recipes.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipes", "0015_image_renditions"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="recipe",
+            name="image",
+            field=models.ImageField(
+                help_text="Картинка, закодированная в Base64",
+                storage=recipes.storage.ContentAddressedStorage(),
+                upload_to="recipes/",
+                verbose_name="Картинка",
+            ),
+        ),
+    ]
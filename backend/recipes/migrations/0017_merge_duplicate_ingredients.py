@@ -0,0 +1,53 @@
+# Generated by Django 4.2.4 on 2026-10-18 20:28
+
+from django.db import migrations, models
+from django.db.backends.base.operations import BaseDatabaseOperations
+
+MERGED_MODELS = (
+    ("IngredientAmountInRecipe", "recipe", "amount"),
+    ("ShoppingListLine", "user", "total"),
+)
+
+
+def merge_duplicate_ingredients(apps, schema_editor):
+    Ingredient = apps.get_model("recipes", "Ingredient")
+    duplicates = (
+        Ingredient.objects.values("name", "measurement_unit")
+        .annotate(keep=models.Min("pk"), total=models.Count("pk"))
+        .filter(total__gt=1)
+        .order_by()
+    )
+    for group in duplicates.iterator():
+        others = list(
+            Ingredient.objects.filter(
+                name=group["name"], measurement_unit=group["measurement_unit"]
+            )
+            .exclude(pk=group["keep"])
+            .values_list("pk", flat=True)
+        )
+        for model_name, owner, value in MERGED_MODELS:
+            model = apps.get_model("recipes", model_name)
+            _, limit = BaseDatabaseOperations.integer_field_ranges[
+                model._meta.get_field(value).get_internal_type()
+            ]
+            for row in model.objects.filter(ingredient_id__in=others):
+                kept, _ = model.objects.get_or_create(
+                    ingredient_id=group["keep"],
+                    **{f"{owner}_id": getattr(row, f"{owner}_id")},
+                    defaults={value: 0},
+                )
+                total = getattr(kept, value) + getattr(row, value)
+                setattr(kept, value, min(total, limit))
+                kept.save(update_fields=(value,))
+                row.delete()
+        Ingredient.objects.filter(pk__in=others).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipes", "0016_recipe_image_storage"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_ingredients, migrations.RunPython.noop),
+    ]
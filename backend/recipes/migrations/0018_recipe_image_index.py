@@ -0,0 +1,24 @@
+# Generated by Django 4.2.4 on 2026-10-18 21:02
+
+import recipes.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipes", "0017_merge_duplicate_ingredients"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="recipe",
+            name="image",
+            field=models.ImageField(
+                db_index=True,
+                help_text="Картинка, закодированная в Base64",
+                storage=recipes.storage.ContentAddressedStorage(),
+                upload_to="recipes/",
+                verbose_name="Картинка",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.4 on 2026-10-19 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipes", "0018_recipe_image_index"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="ingredient",
+            constraint=models.UniqueConstraint(
+                fields=("name", "measurement_unit"),
+                name="unique_ingredient_name_unit",
+            ),
+        ),
+    ]
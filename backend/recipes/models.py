@@ -1,9 +1,11 @@
 from colorfield.fields import ColorField
 from django.core.validators import MinValueValidator, RegexValidator
 from django.db import models
-from django.db.models import UniqueConstraint
+from django.db.models import (Exists, OuterRef, Prefetch, UniqueConstraint,
+                              Value)
 from foodgram.settings import MIN_COOKING_TIME, MIN_INGREDIENTS_AMOUNT
-from users.models import User
+from recipes.storage import content_addressed_storage
+from users.models import Subscription, User
 
 
 class Ingredient(models.Model):
@@ -20,6 +22,15 @@ class Ingredient(models.Model):
         verbose_name = "Ингредиент"
         verbose_name_plural = "Ингредиенты"
         ordering = ("name",)
+        constraints = (
+            UniqueConstraint(
+                fields=(
+                    "name",
+                    "measurement_unit",
+                ),
+                name="unique_ingredient_name_unit",
+            ),
+        )
 
     def __str__(self):
         return self.name[:30]
@@ -56,6 +67,47 @@ class Tag(models.Model):
         return self.name[:30]
 
 
+class RecipeQuerySet(models.QuerySet):
+    @staticmethod
+    def get_prefetches():
+        return (
+            "tags",
+            Prefetch(
+                "ingredient_amount_in_recipe",
+                queryset=IngredientAmountInRecipe.objects.select_related(
+                    "ingredient"
+                ),
+            ),
+        )
+
+    def with_user_annotations(self, user):
+        queryset = self.select_related("author").prefetch_related(
+            *self.get_prefetches()
+        )
+        if user is None or user.is_anonymous:
+            false = Value(False, output_field=models.BooleanField())
+            return queryset.annotate(
+                is_favorited=false,
+                is_in_shopping_cart=false,
+                author_is_subscribed=false,
+            )
+        return queryset.annotate(
+            is_favorited=Exists(
+                IsFavorited.objects.filter(user=user, recipe=OuterRef("pk"))
+            ),
+            is_in_shopping_cart=Exists(
+                IsInShoppingCart.objects.filter(
+                    user=user, recipe=OuterRef("pk")
+                )
+            ),
+            author_is_subscribed=Exists(
+                Subscription.objects.filter(
+                    subscriber=user, author=OuterRef("author")
+                )
+            ),
+        )
+
+
 class Recipe(models.Model):
     author = models.ForeignKey(
         User,
@@ -70,6 +122,8 @@ class Recipe(models.Model):
 
     image = models.ImageField(
         upload_to="recipes/",
+        storage=content_addressed_storage,
+        db_index=True,
         verbose_name="Картинка",
         help_text="Картинка, закодированная в Base64",
     )
@@ -103,11 +157,42 @@ class Recipe(models.Model):
         auto_now_add=True, verbose_name="дата публикации",
         help_text="дата публикации"
     )
+    favorites_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Добавлений в избранное",
+        help_text="Добавлений в избранное",
+    )
+    in_carts_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Добавлений в список покупок",
+        help_text="Добавлений в список покупок",
+    )
+    image_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name="Уменьшенные копии картинки",
+        help_text="Пути к уменьшенным копиям картинки по размерам и форматам",
+    )
+
+    objects = RecipeQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Рецепт"
         verbose_name_plural = "Рецепты"
         ordering = ("-pub_date",)
+        indexes = (
+            models.Index(
+                fields=("-pub_date", "-id"),
+                name="recipe_pub_date_id_idx",
+            ),
+            models.Index(
+                fields=("-favorites_count", "-pub_date"),
+                name="recipe_favorites_count_idx",
+            ),
+        )
 
     def __str__(self):
         return self.text[:30]
@@ -225,3 +310,67 @@ class IsInShoppingCart(models.Model):
 
     def __str__(self):
         return f'"{self.recipe}" добавлен в список покупок {self.user}'
+
+
+class ShoppingListLine(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="shopping_list_lines",
+        verbose_name="Пользователь",
+        help_text="Пользователь",
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        related_name="shopping_list_lines",
+        verbose_name="Ингредиент",
+        help_text="Ингредиент",
+    )
+    total = models.PositiveIntegerField(
+        verbose_name="Количество",
+        help_text="Суммарное количество ингредиента в списке покупок",
+    )
+
+    class Meta:
+        verbose_name = "Строка списка покупок"
+        verbose_name_plural = "Строки списков покупок"
+        constraints = (
+            UniqueConstraint(
+                fields=(
+                    "user",
+                    "ingredient",
+                ),
+                name="unique_shopping_list_line",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.user}: {self.ingredient} - {self.total}"
+
+
+class ImageProcessingTask(models.Model):
+    recipe = models.OneToOneField(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="image_task",
+        verbose_name="Рецепт",
+        help_text="Рецепт",
+    )
+    created = models.DateTimeField(
+        auto_now_add=True, verbose_name="Создана", help_text="Создана"
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name="Попытки", help_text="Попытки"
+    )
+    error = models.TextField(
+        blank=True, verbose_name="Ошибка", help_text="Последняя ошибка"
+    )
+
+    class Meta:
+        verbose_name = "Обработка картинки"
+        verbose_name_plural = "Очередь обработки картинок"
+        ordering = ("created",)
+
+    def __str__(self):
+        return f"Обработка картинки рецепта {self.recipe_id}"
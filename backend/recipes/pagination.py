@@ -0,0 +1,231 @@
+import hashlib
+from functools import cached_property, partial
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connection
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy as _
+from foodgram.errors import ErrorMesage
+from foodgram.settings import (PER_USER_RECIPE_FILTERS,
+                               RECIPE_COUNT_ESTIMATE_MIN, RECIPE_COUNT_TIMEOUT)
+from recipes.filters import RecipeFilter
+from recipes.models import Recipe
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+COUNT_VERSION_KEY = "recipe-count:version"
+USER_COUNT_VERSION_KEY = "recipe-count:user:{}:version"
+POPULAR_ORDERING = "popular"
+KEYSET_SEPARATOR = "|"
+
+
+def get_filter_values(request, name):
+    if name == "tags":
+        return tuple(sorted(request.query_params.getlist(name)))
+    value = request.query_params.get(name)
+    if name == "author" and value == "me":
+        value = str(request.user.pk)
+    return (value,)
+
+
+def get_filter_signature(request):
+    params = tuple(
+        (name, get_filter_values(request, name))
+        for name in sorted(RecipeFilter.Meta.fields)
+        if request.query_params.get(name)
+    )
+    if not params:
+        return None
+    return hashlib.sha256(repr(params).encode()).hexdigest()
+
+
+def is_per_user(request):
+    return any(
+        request.query_params.get(name) for name in PER_USER_RECIPE_FILTERS
+    )
+
+
+def estimate_recipe_count():
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            (Recipe._meta.db_table,),
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < RECIPE_COUNT_ESTIMATE_MIN:
+        return None
+    return row[0]
+
+
+def bump_count_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def invalidate_recipe_counts():
+    bump_count_version(COUNT_VERSION_KEY)
+
+
+def invalidate_user_recipe_counts(user_id):
+    bump_count_version(USER_COUNT_VERSION_KEY.format(user_id))
+
+
+class EstimatedPage(Page):
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self.next_exists = has_next
+
+    def has_next(self):
+        return self.next_exists
+
+
+class CountingPaginator(Paginator):
+    count_exact = True
+
+    def __init__(self, *args, get_count, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.get_count = get_count
+
+    @cached_property
+    def count(self):
+        count, self.count_exact = self.get_count(self.object_list)
+        return count
+
+    def validate_number(self, number):
+        if self.count_exact:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_("That page number is not an integer"))
+        if number < 1:
+            raise EmptyPage(_("That page number is less than 1"))
+        return number
+
+    def page(self, number):
+        count = self.count
+        if self.count_exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(
+            self.object_list[bottom:bottom + self.per_page + 1]
+        )
+        has_next = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if not object_list and number > 1:
+            raise EmptyPage(_("That page contains no results"))
+        seen = bottom + len(object_list)
+        self.count = max(count, seen) if has_next else seen
+        return EstimatedPage(object_list, number, self, has_next)
+
+
+class RecipePageNumberPagination(PageNumberPagination):
+    def paginate_queryset(self, queryset, request, view=None):
+        self.django_paginator_class = partial(
+            CountingPaginator,
+            get_count=partial(self.get_count, request=request),
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset, request):
+        user_key = ""
+        if is_per_user(request):
+            if not request.user.is_authenticated:
+                return queryset.count(), True
+            user_version = cache.get_or_set(
+                USER_COUNT_VERSION_KEY.format(request.user.pk), 1, None
+            )
+            user_key = f"{request.user.pk}:{user_version}:"
+        signature = get_filter_signature(request)
+        if signature is None:
+            estimate = estimate_recipe_count()
+            if estimate is not None:
+                return estimate, False
+        version = cache.get_or_set(COUNT_VERSION_KEY, 1, None)
+        key = f"recipe-count:{version}:{user_key}{signature}"
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, RECIPE_COUNT_TIMEOUT)
+        return count, True
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data["count_exact"] = self.page.paginator.count_exact
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema["properties"]["count_exact"] = {"type": "boolean"}
+        return schema
+
+
+class RecipeCursorPagination(CursorPagination):
+    ordering = ("-pub_date", "-id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get("ordering") == POPULAR_ORDERING:
+            raise ValidationError({"ordering": [ErrorMesage.CURSOR_ORDERING]})
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, position = self.cursor or (0, False, None)
+        if reverse:
+            queryset = queryset.order_by("pub_date", "id")
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(position, reverse)
+            )
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        following = None
+        if len(results) > len(self.page):
+            following = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None or offset > 0
+            self.has_previous = following is not None
+            self.next_position, self.previous_position = position, following
+        else:
+            self.has_next = following is not None
+            self.has_previous = position is not None or offset > 0
+            self.next_position, self.previous_position = following, position
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_keyset_filter(self, position, reverse):
+        pub_date, _, pk = position.rpartition(KEYSET_SEPARATOR)
+        pub_date = parse_datetime(pub_date) if pk.isdigit() else None
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        lookup = "gt" if reverse else "lt"
+        return Q(**{f"pub_date__{lookup}e": pub_date}) & (
+            Q(**{f"pub_date__{lookup}": pub_date})
+            | Q(**{f"id__{lookup}": int(pk)})
+        )
+
+    def _get_position_from_instance(self, instance, ordering):
+        return (
+            f"{instance.pub_date.isoformat()}{KEYSET_SEPARATOR}{instance.pk}"
+        )
+
+
+def get_recipe_paginator(request):
+    if request.query_params.get("pagination") == "cursor":
+        return RecipeCursorPagination()
+    return RecipePageNumberPagination()
@@ -0,0 +1,79 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from foodgram.settings import (REFERENCE_DATA_MAX_AGE, REFERENCE_DATA_TIMEOUT,
+                               REFERENCE_DATA_VERSION_TTL)
+from recipes.models import Tag
+from rest_framework.renderers import JSONRenderer
+
+KEY_PREFIX = "reference"
+
+
+def get_version(name):
+    key = f"{KEY_PREFIX}:{name}:version"
+    version = cache.get(key)
+    if version is None:
+        version = bump_version(name)
+    return version
+
+
+def bump_version(name):
+    version = f"{time.time_ns():x}"
+    cache.set(
+        f"{KEY_PREFIX}:{name}:version", version, REFERENCE_DATA_VERSION_TTL
+    )
+    return version
+
+
+def get_tag_ids(slugs):
+    version = get_version("tags")
+    key = f"{KEY_PREFIX}:tags:{version}:slugs"
+    slug_map = cache.get(key)
+    if slug_map is None:
+        slug_map = dict(Tag.objects.values_list("slug", "id"))
+        cache.set(key, slug_map, REFERENCE_DATA_TIMEOUT)
+    missing = set(slugs) - slug_map.keys()
+    if missing:
+        found = dict(
+            Tag.objects.filter(slug__in=missing).values_list("slug", "id")
+        )
+        if found:
+            bump_version("tags")
+            slug_map = {**slug_map, **found}
+    return [slug_map[slug] for slug in slugs if slug in slug_map]
+
+
+class ReferenceDataCacheMixin:
+    reference_name = None
+
+    def get_cached_content(self):
+        version = get_version(self.reference_name)
+        key = f"{KEY_PREFIX}:{self.reference_name}:{version}"
+        cached = cache.get(key)
+        if cached is None:
+            serializer = self.get_serializer(
+                self.filter_queryset(self.get_queryset()), many=True
+            )
+            content = JSONRenderer().render(serializer.data)
+            etag = quote_etag(
+                f"{self.reference_name}-"
+                f"{hashlib.sha256(content).hexdigest()}"
+            )
+            cached = (etag, content)
+            cache.set(key, cached, REFERENCE_DATA_TIMEOUT)
+        return cached
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params or request.accepted_renderer.format != "json":
+            return super().list(request, *args, **kwargs)
+        etag, content = self.get_cached_content()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content, content_type="application/json")
+        response["ETag"] = etag
+        response["Cache-Control"] = f"public, max-age={REFERENCE_DATA_MAX_AGE}"
+        return response
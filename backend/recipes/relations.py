@@ -0,0 +1,137 @@
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.http import Http404
+from recipes import shopping_list
+from recipes.models import IsFavorited, IsInShoppingCart, Recipe
+from recipes.pagination import invalidate_user_recipe_counts
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+COUNTER_FIELDS = {
+    IsFavorited: "favorites_count",
+    IsInShoppingCart: "in_carts_count",
+}
+
+
+def add_relation(model, message, **fields):
+    try:
+        with transaction.atomic():
+            return model.objects.create(**fields)
+    except IntegrityError:
+        if not model.objects.filter(**fields).exists():
+            raise
+        raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]})
+
+
+def remove_relation(model, **fields):
+    deleted, _ = model.objects.filter(**fields).delete()
+    if not deleted:
+        raise Http404
+
+
+def can_return_rows():
+    return (
+        connection.vendor in shopping_list.UPSERT_VENDORS
+        and connection.features.can_return_rows_from_bulk_insert
+    )
+
+
+def insert_relations(model, user, recipe_ids):
+    if not can_return_rows():
+        recipe_ids = set(recipe_ids) - set(
+            model.objects.filter(user=user, recipe__in=recipe_ids).values_list(
+                "recipe_id", flat=True
+            )
+        )
+        model.objects.bulk_create(
+            (
+                model(user=user, recipe_id=recipe_id)
+                for recipe_id in recipe_ids
+            ),
+            ignore_conflicts=True,
+        )
+        return recipe_ids
+    table, user_column, recipe_column = map(
+        connection.ops.quote_name,
+        (model._meta.db_table, "user_id", "recipe_id"),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({user_column}, {recipe_column}) "
+            f"VALUES {', '.join(('(%s, %s)',) * len(recipe_ids))} "
+            f"ON CONFLICT DO NOTHING RETURNING {recipe_column}",
+            [
+                value
+                for recipe_id in recipe_ids
+                for value in (user.id, recipe_id)
+            ],
+        )
+        return {recipe_id for recipe_id, in cursor.fetchall()}
+
+
+def bulk_add(model, user, recipe_ids):
+    with transaction.atomic():
+        recipes = set(
+            Recipe.objects.filter(pk__in=recipe_ids).values_list(
+                "pk", flat=True
+            )
+        )
+        recipe_ids = [
+            recipe_id for recipe_id in recipe_ids if recipe_id in recipes
+        ]
+        if not recipe_ids:
+            return []
+        inserted = insert_relations(model, user, sorted(recipe_ids))
+        added = [
+            recipe_id for recipe_id in recipe_ids if recipe_id in inserted
+        ]
+        counter = COUNTER_FIELDS[model]
+        Recipe.objects.filter(pk__in=added).update(
+            **{counter: F(counter) + 1}
+        )
+        if model is IsInShoppingCart:
+            shopping_list.add_recipes(user.id, added)
+    if added:
+        invalidate_user_recipe_counts(user.id)
+    return added
+
+
+def delete_relations(model, user, recipe_ids):
+    if not can_return_rows():
+        relations = model.objects.filter(user=user, recipe__in=recipe_ids)
+        recipe_ids = set(
+            relations.select_for_update().values_list("recipe_id", flat=True)
+        )
+        relations._raw_delete(relations.db)
+        return recipe_ids
+    table, user_column, recipe_column = map(
+        connection.ops.quote_name,
+        (model._meta.db_table, "user_id", "recipe_id"),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {table} WHERE {user_column} = %s "
+            f"AND {recipe_column} IN ({', '.join(('%s',) * len(recipe_ids))}) "
+            f"RETURNING {recipe_column}",
+            [user.id, *recipe_ids],
+        )
+        return {recipe_id for recipe_id, in cursor.fetchall()}
+
+
+def bulk_remove(model, user, recipe_ids):
+    if not recipe_ids:
+        return []
+    with transaction.atomic():
+        deleted = delete_relations(model, user, sorted(set(recipe_ids)))
+        removed = [
+            recipe_id for recipe_id in recipe_ids if recipe_id in deleted
+        ]
+        counter = COUNTER_FIELDS[model]
+        Recipe.objects.filter(pk__in=removed).update(
+            **{counter: F(counter) - 1}
+        )
+        if model is IsInShoppingCart:
+            shopping_list.remove_recipes(user.id, removed)
+    if removed:
+        invalidate_user_recipe_counts(user.id)
+    return removed
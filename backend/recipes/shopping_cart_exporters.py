@@ -0,0 +1,144 @@
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+from django.utils.http import content_disposition_header
+from foodgram.settings import FILE_NAME_SHOPPING_LIST
+from recipes.document_cache import document_response
+from recipes.shopping_cart_to_pdf import render_shopping_list_pdf
+from rest_framework.renderers import JSONRenderer
+
+ITERATOR_CHUNK_SIZE = 2000
+
+EXPORTERS = {}
+
+
+def register(exporter_class):
+    EXPORTERS[exporter_class.format] = exporter_class()
+    return exporter_class
+
+
+def format_line(item):
+    return (
+        f"{item['ingredient__name']}: "
+        f"{item['ingredient_sum']} "
+        f"{item['ingredient__measurement_unit']}."
+    )
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+class ShoppingListExporter:
+    format = None
+    media_type = None
+    extension = None
+
+    @property
+    def filename(self):
+        return f"{FILE_NAME_SHOPPING_LIST}.{self.extension}"
+
+    def export(self, request, shopping_cart):
+        response = StreamingHttpResponse(
+            self.stream(shopping_cart.iterator(ITERATOR_CHUNK_SIZE)),
+            content_type=self.media_type,
+        )
+        response["Content-Disposition"] = content_disposition_header(
+            True, self.filename
+        )
+        return response
+
+
+@register
+class PdfExporter(ShoppingListExporter):
+    format = "pdf"
+    media_type = "application/pdf"
+    extension = "pdf"
+
+    def export(self, request, shopping_cart):
+        return document_response(
+            request,
+            shopping_cart,
+            self.format,
+            render_shopping_list_pdf,
+            self.media_type,
+            self.filename,
+        )
+
+
+@register
+class TextExporter(ShoppingListExporter):
+    format = "txt"
+    media_type = "text/plain; charset=utf-8"
+    extension = "txt"
+
+    def stream(self, rows):
+        yield "Список покупок:\n"
+        for item in rows:
+            yield format_line(item) + "\n"
+
+
+@register
+class CsvExporter(ShoppingListExporter):
+    format = "csv"
+    media_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def stream(self, rows):
+        writer = csv.writer(Echo())
+        yield writer.writerow(("name", "measurement_unit", "amount"))
+        for item in rows:
+            yield writer.writerow(
+                (
+                    item["ingredient__name"],
+                    item["ingredient__measurement_unit"],
+                    item["ingredient_sum"],
+                )
+            )
+
+
+@register
+class JsonExporter(ShoppingListExporter):
+    format = "json"
+    media_type = "application/json"
+    extension = "json"
+
+    def stream(self, rows):
+        separator = "["
+        for item in rows:
+            yield separator + json.dumps(
+                {
+                    "name": item["ingredient__name"],
+                    "measurement_unit": item["ingredient__measurement_unit"],
+                    "amount": item["ingredient_sum"],
+                },
+                ensure_ascii=False,
+            )
+            separator = ","
+        yield "[]" if separator == "[" else "]"
+
+
+class ExportErrorRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get("response")
+        if response is not None:
+            response["Content-Type"] = JSONRenderer.media_type
+        return super().render(
+            data, JSONRenderer.media_type, renderer_context
+        )
+
+
+def get_renderer_classes():
+    return tuple(
+        type(
+            f"{exporter.__class__.__name__}Renderer",
+            (ExportErrorRenderer,),
+            {
+                "media_type": exporter.media_type.split(";")[0],
+                "format": exporter.format,
+            },
+        )
+        for exporter in EXPORTERS.values()
+    )
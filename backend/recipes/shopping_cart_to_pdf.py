@@ -1,38 +1,38 @@
-from io import BytesIO
-
-from django.http import HttpResponse
-from foodgram.settings import FILE_NAME_PDF
+from foodgram.settings import BASE_DIR
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
-CONTENT_TYPE = "application/pdf"
+FONT_NAME = "Times-Roman"
+FONT_PATH = BASE_DIR / "data" / "timesnewromanpsmt.ttf"
+FONT_SIZE = 18
+LINE_HEIGHT = 20
+LEFT_MARGIN = 30
+TOP = 700
+BOTTOM_MARGIN = 40
+SPOOL_MAX_SIZE = 1024 * 1024
+
+pdfmetrics.registerFont(TTFont(FONT_NAME, FONT_PATH, "UTF-8"))
 
 
-def generate_shopping_list_pdf(shopping_cart):
-    response = HttpResponse(content_type=CONTENT_TYPE)
-    response["Content-Disposition"] = f"attachment; filename={FILE_NAME_PDF}"
-    buffer = BytesIO()
-    pdfmetrics.registerFont(
-        TTFont("Times-Roman", "data/timesnewromanpsmt.ttf", "UTF-8")
-    )
-    p = canvas.Canvas(buffer, pagesize=letter)
-    p.setFont("Times-Roman", 18)
-    p.drawString(30, 700, "Список покупок:")
-    x = 680
+def render_shopping_list_pdf(shopping_cart, file):
+    p = canvas.Canvas(file, pagesize=letter)
+    p.setFont(FONT_NAME, FONT_SIZE)
+    p.drawString(LEFT_MARGIN, TOP, "Список покупок:")
+    y = TOP - LINE_HEIGHT
     for item in shopping_cart:
+        if y < BOTTOM_MARGIN:
+            p.showPage()
+            p.setFont(FONT_NAME, FONT_SIZE)
+            y = TOP
         p.drawString(
-            30,
-            x,
+            LEFT_MARGIN,
+            y,
             f"{item['ingredient__name']}: "
             f"{item['ingredient_sum']} "
             f"{item['ingredient__measurement_unit']}.",
         )
-        x -= 20
+        y -= LINE_HEIGHT
     p.showPage()
     p.save()
-    file = buffer.getvalue()
-    buffer.close()
-    response.write(file)
-    return response
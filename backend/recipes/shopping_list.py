@@ -0,0 +1,185 @@
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import F, Sum
+from recipes.models import (IngredientAmountInRecipe, IsInShoppingCart,
+                            ShoppingListLine)
+
+UPSERT_VENDORS = ("postgresql", "sqlite")
+UPSERT_BATCH_SIZE = 1000
+
+
+def get_recipe_amounts(recipe):
+    return Counter(
+        dict(
+            IngredientAmountInRecipe.objects.filter(recipe=recipe)
+            .values_list("ingredient_id", "amount")
+        )
+    )
+
+
+def upsert_lines(user_ids, delta):
+    rows = sorted(
+        (user_id, ingredient_id, amount)
+        for user_id in user_ids
+        for ingredient_id, amount in delta.items()
+    )
+    table, user, ingredient, total = map(
+        connection.ops.quote_name,
+        (ShoppingListLine._meta.db_table, "user_id", "ingredient_id", "total"),
+    )
+    sql = (
+        f"INSERT INTO {table} ({user}, {ingredient}, {total}) "
+        "VALUES {values} "
+        f"ON CONFLICT ({user}, {ingredient}) "
+        f"DO UPDATE SET {total} = {table}.{total} + EXCLUDED.{total}"
+    )
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[start:start + UPSERT_BATCH_SIZE]
+            cursor.execute(
+                sql.format(values=", ".join(("(%s, %s, %s)",) * len(batch))),
+                [value for row in batch for value in row],
+            )
+
+
+def update_lines(user_ids, delta):
+    lines = list(
+        ShoppingListLine.objects.select_for_update().filter(
+            user_id__in=user_ids, ingredient_id__in=delta
+        )
+    )
+    for line in lines:
+        line.total = F("total") + delta[line.ingredient_id]
+    ShoppingListLine.objects.bulk_update(lines, ("total",))
+    return {(line.user_id, line.ingredient_id) for line in lines}
+
+
+def add_lines(user_ids, delta):
+    if connection.vendor in UPSERT_VENDORS:
+        upsert_lines(user_ids, delta)
+        return
+    existing = update_lines(user_ids, delta)
+    ShoppingListLine.objects.bulk_create(
+        ShoppingListLine(
+            user_id=user_id, ingredient_id=ingredient_id, total=amount
+        )
+        for user_id in user_ids
+        for ingredient_id, amount in delta.items()
+        if (user_id, ingredient_id) not in existing
+    )
+
+
+def apply_delta(user_ids, delta):
+    increments = {
+        ingredient_id: amount
+        for ingredient_id, amount in delta.items()
+        if amount > 0
+    }
+    decrements = {
+        ingredient_id: amount
+        for ingredient_id, amount in delta.items()
+        if amount < 0
+    }
+    if not user_ids or not (increments or decrements):
+        return
+    with transaction.atomic():
+        if increments:
+            add_lines(user_ids, increments)
+        if decrements:
+            update_lines(user_ids, decrements)
+            ShoppingListLine.objects.filter(
+                user_id__in=user_ids,
+                ingredient_id__in=decrements,
+                total__lte=0,
+            ).delete()
+
+
+def add_recipe(user_id, recipe):
+    apply_delta((user_id,), get_recipe_amounts(recipe))
+
+
+def get_recipes_amounts(recipe_ids):
+    return dict(
+        IngredientAmountInRecipe.objects.filter(recipe__in=recipe_ids)
+        .values("ingredient_id")
+        .annotate(total=Sum("amount"))
+        .order_by()
+        .values_list("ingredient_id", "total")
+    )
+
+
+def add_recipes(user_id, recipe_ids):
+    apply_delta((user_id,), get_recipes_amounts(recipe_ids))
+
+
+def remove_recipe(user_id, recipe):
+    amounts = get_recipe_amounts(recipe)
+    apply_delta(
+        (user_id,),
+        {ingredient_id: -amount for ingredient_id, amount in amounts.items()},
+    )
+
+
+def remove_recipes(user_id, recipe_ids):
+    amounts = get_recipes_amounts(recipe_ids)
+    apply_delta(
+        (user_id,),
+        {ingredient_id: -amount for ingredient_id, amount in amounts.items()},
+    )
+
+
+def change_recipe(recipe, old_amounts, new_amounts):
+    delta = Counter(new_amounts)
+    delta.subtract(old_amounts)
+    if not any(delta.values()):
+        return
+    user_ids = tuple(
+        IsInShoppingCart.objects.filter(recipe=recipe)
+        .values_list("user_id", flat=True)
+    )
+    apply_delta(user_ids, delta)
+
+
+def rebuild_lines():
+    table, cart, amounts = (
+        connection.ops.quote_name(model._meta.db_table)
+        for model in (
+            ShoppingListLine, IsInShoppingCart, IngredientAmountInRecipe
+        )
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(f"LOCK TABLE {cart}, {amounts} IN SHARE MODE")
+        ShoppingListLine.objects.all()._raw_delete(connection.alias)
+        cursor.execute(
+            f"INSERT INTO {table} (user_id, ingredient_id, total) "
+            f"SELECT cart.user_id, amount.ingredient_id, SUM(amount.amount) "
+            f"FROM {amounts} amount "
+            f"JOIN {cart} cart ON cart.recipe_id = amount.recipe_id "
+            f"GROUP BY cart.user_id, amount.ingredient_id"
+        )
+        return cursor.rowcount
+
+
+def get_live_totals():
+    return {
+        (row["recipe__shopping_cart__user"], row["ingredient"]): row["total"]
+        for row in IngredientAmountInRecipe.objects.filter(
+            recipe__shopping_cart__isnull=False
+        )
+        .values("recipe__shopping_cart__user", "ingredient")
+        .annotate(total=Sum("amount"))
+        .order_by()
+    }
+
+
+def get_stored_totals():
+    return {
+        (user_id, ingredient_id): total
+        for user_id, ingredient_id, total in (
+            ShoppingListLine.objects.values_list(
+                "user_id", "ingredient_id", "total"
+            ).iterator()
+        )
+    }
@@ -0,0 +1,99 @@
+from django.db import transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save, pre_delete)
+from django.dispatch import receiver
+from recipes import shopping_list
+from recipes.autocomplete import invalidate_index
+from recipes.counters import change_counter
+from recipes.images import delete_renditions, release_image
+from recipes.models import (Ingredient, IsFavorited, IsInShoppingCart, Recipe,
+                            Tag)
+from recipes.pagination import (invalidate_recipe_counts,
+                                invalidate_user_recipe_counts)
+from recipes.reference_cache import bump_version
+
+
+@receiver(post_save, sender=IsInShoppingCart)
+def add_to_shopping_list(sender, instance, created, **kwargs):
+    if created:
+        shopping_list.add_recipe(instance.user_id, instance.recipe_id)
+        change_counter(instance.recipe_id, "in_carts_count", 1)
+
+
+@receiver(pre_delete, sender=IsInShoppingCart)
+def remove_from_shopping_list(sender, instance, **kwargs):
+    shopping_list.remove_recipe(instance.user_id, instance.recipe_id)
+
+
+@receiver(post_delete, sender=IsInShoppingCart)
+def decrease_in_carts_count(sender, instance, **kwargs):
+    change_counter(instance.recipe_id, "in_carts_count", -1)
+
+
+@receiver(post_save, sender=IsFavorited)
+def increase_favorites_count(sender, instance, created, **kwargs):
+    if created:
+        change_counter(instance.recipe_id, "favorites_count", 1)
+
+
+@receiver(post_delete, sender=IsFavorited)
+def decrease_favorites_count(sender, instance, **kwargs):
+    change_counter(instance.recipe_id, "favorites_count", -1)
+
+
+@receiver((post_save, post_delete), sender=IsFavorited)
+@receiver((post_save, post_delete), sender=IsInShoppingCart)
+def invalidate_user_counts(sender, instance, **kwargs):
+    invalidate_user_recipe_counts(instance.user_id)
+
+
+@receiver((post_save, post_delete), sender=Ingredient)
+def invalidate_ingredient_index(sender, **kwargs):
+    invalidate_index()
+    bump_version("ingredients")
+
+
+@receiver((post_save, post_delete), sender=Tag)
+def invalidate_tags(sender, **kwargs):
+    bump_version("tags")
+    invalidate_recipe_counts()
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def invalidate_tagged_recipe_counts(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_recipe_counts()
+
+
+@receiver(post_save, sender=Recipe)
+def invalidate_created_recipe_counts(sender, created, **kwargs):
+    if created:
+        invalidate_recipe_counts()
+
+
+@receiver(post_delete, sender=Recipe)
+def invalidate_deleted_recipe_counts(sender, **kwargs):
+    invalidate_recipe_counts()
+
+
+@receiver(post_init, sender=Recipe)
+def remember_image(sender, instance, **kwargs):
+    instance._stored_image = instance.image.name
+
+
+@receiver(post_save, sender=Recipe)
+def release_replaced_image(sender, instance, **kwargs):
+    stored_image = instance._stored_image
+    instance._stored_image = instance.image.name
+    if stored_image != instance.image.name:
+        transaction.on_commit(lambda: release_image(stored_image))
+
+
+@receiver(post_delete, sender=Recipe)
+def release_deleted_image(sender, instance, **kwargs):
+    transaction.on_commit(
+        lambda: (
+            release_image(instance.image.name),
+            delete_renditions(instance.image_renditions),
+        )
+    )
@@ -0,0 +1,37 @@
+import hashlib
+import os
+import posixpath
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    def get_content_name(self, name, content):
+        digest = hashlib.sha256()
+        if hasattr(content, "seek"):
+            content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        if hasattr(content, "seek"):
+            content.seek(0)
+        hexdigest = digest.hexdigest()
+        return posixpath.join(
+            posixpath.dirname(name),
+            hexdigest[:2],
+            hexdigest[2:4],
+            hexdigest + posixpath.splitext(name)[1].lower(),
+        )
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        name = self.get_content_name(name, content)
+        if self.exists(name):
+            os.utime(self.path(name))
+            return name
+        return super().save(name, content, max_length)
+
+
+content_addressed_storage = ContentAddressedStorage()
@@ -0,0 +1,254 @@
+import random
+from itertools import accumulate
+
+from api.authentication import invalidate_tokens
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Concat
+from recipes.autocomplete import invalidate_index
+from recipes.benchmarks import raw_delete
+from recipes.counters import reconcile_counters
+from recipes.models import (Ingredient, IngredientAmountInRecipe, IsFavorited,
+                            IsInShoppingCart, Recipe, Tag)
+from recipes.pagination import invalidate_recipe_counts
+from recipes.reference_cache import bump_version
+from rest_framework.authtoken.models import Token
+from users.models import Subscription, User
+
+PREFIX = "synthetic"
+EMAIL_DOMAIN = "example.com"
+MEASUREMENT_UNIT = "г"
+BATCH_SIZE = 5000
+IMAGE = "recipes/synthetic.png"
+PASSWORD = "synthetic-password"
+TAG_NAMES = (
+    "Завтрак",
+    "Обед",
+    "Ужин",
+    "Десерт",
+    "Выпечка",
+    "Суп",
+    "Салат",
+    "Закуска",
+    "Напиток",
+    "Вегетарианское",
+    "Быстро",
+    "Праздничное",
+)
+INGREDIENTS = 2000
+MEAN_FAVORITES = 8
+MEAN_CARTS = 2
+MEAN_SUBSCRIPTIONS = 4
+
+
+def get_cum_weights(size, exponent=1.1):
+    return list(
+        accumulate(1 / (rank + 1) ** exponent for rank in range(size))
+    )
+
+
+def write_batches(model, objects):
+    batch = []
+    for item in objects:
+        batch.append(model(**item))
+        if len(batch) == BATCH_SIZE:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+def get_synthetic_users():
+    return User.objects.filter(
+        username__regex=rf"^{PREFIX}[0-9]+$",
+        email=Concat("username", Value(f"@{EMAIL_DOMAIN}")),
+    )
+
+
+def get_synthetic_tags():
+    return Tag.objects.filter(
+        slug__regex=rf"^{PREFIX}-[0-9]+$", name__endswith=f" ({PREFIX})"
+    )
+
+
+def get_synthetic_ingredients():
+    return Ingredient.objects.filter(
+        name__regex=rf"^{PREFIX} [0-9]+$", measurement_unit=MEASUREMENT_UNIT
+    )
+
+
+def flush_dataset():
+    with transaction.atomic():
+        users = get_synthetic_users()
+        token_keys = list(
+            Token.objects.filter(user__in=users).values_list("key", flat=True)
+        )
+        raw_delete(users)
+        raw_delete(get_synthetic_tags())
+        raw_delete(get_synthetic_ingredients())
+        transaction.on_commit(lambda: invalidate_tokens(*token_keys))
+    refresh_derived_data()
+
+
+def refresh_derived_data():
+    reconcile_counters()
+    call_command("rebuild_shopping_lists")
+    invalidate_recipe_counts()
+    invalidate_index()
+    bump_version("tags")
+    bump_version("ingredients")
+
+
+def create_users(rng, total):
+    password = make_password(PASSWORD)
+    User.objects.bulk_create(
+        (
+            User(
+                username=f"{PREFIX}{number}",
+                email=f"{PREFIX}{number}@{EMAIL_DOMAIN}",
+                first_name=f"Имя{number}",
+                last_name=f"Фамилия{number}",
+                password=password,
+            )
+            for number in range(total)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    user_ids = list(
+        get_synthetic_users()
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    rng.shuffle(user_ids)
+    return user_ids
+
+
+def create_tags(rng):
+    for number, name in enumerate(TAG_NAMES):
+        Tag.objects.get_or_create(
+            slug=f"{PREFIX}-{number}",
+            defaults={
+                "name": f"{name} ({PREFIX})",
+                "color": f"#{0xA0A000 + number:06X}",
+            },
+        )
+    tag_ids = list(
+        get_synthetic_tags()
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    rng.shuffle(tag_ids)
+    return tag_ids
+
+
+def get_ingredient_ids(rng, total):
+    if not Ingredient.objects.exists():
+        Ingredient.objects.bulk_create(
+            (
+                Ingredient(
+                    name=f"{PREFIX} {number}",
+                    measurement_unit=MEASUREMENT_UNIT,
+                )
+                for number in range(total)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+    ingredient_ids = list(
+        Ingredient.objects.order_by("pk").values_list("pk", flat=True)
+    )
+    rng.shuffle(ingredient_ids)
+    return ingredient_ids
+
+
+def create_recipes(rng, total, user_ids, tag_ids, ingredient_ids, stdout):
+    author_weights = get_cum_weights(len(user_ids))
+    tag_weights = get_cum_weights(len(tag_ids))
+    ingredient_weights = get_cum_weights(len(ingredient_ids))
+    recipe_ids = []
+    for start in range(0, total, BATCH_SIZE):
+        size = min(BATCH_SIZE, total - start)
+        authors = rng.choices(user_ids, cum_weights=author_weights, k=size)
+        recipes = Recipe.objects.bulk_create(
+            Recipe(
+                author_id=author_id,
+                name=f"Рецепт {start + number}",
+                text=f"Описание рецепта {start + number}",
+                image=IMAGE,
+                cooking_time=rng.randint(5, 180),
+            )
+            for number, author_id in enumerate(authors)
+        )
+        tags = []
+        amounts = []
+        for recipe in recipes:
+            recipe_ids.append(recipe.pk)
+            for tag_id in set(
+                rng.choices(tag_ids, cum_weights=tag_weights,
+                            k=rng.randint(1, 3))
+            ):
+                tags.append(
+                    Recipe.tags.through(recipe_id=recipe.pk, tag_id=tag_id)
+                )
+            for ingredient_id in set(
+                rng.choices(ingredient_ids, cum_weights=ingredient_weights,
+                            k=rng.randint(3, 12))
+            ):
+                amounts.append(
+                    IngredientAmountInRecipe(
+                        recipe_id=recipe.pk,
+                        ingredient_id=ingredient_id,
+                        amount=rng.randint(1, 500),
+                    )
+                )
+        Recipe.tags.through.objects.bulk_create(tags)
+        IngredientAmountInRecipe.objects.bulk_create(amounts)
+        if stdout is not None:
+            stdout.write(f"Создано рецептов: {start + size}")
+    return recipe_ids, author_weights
+
+
+def pick(rng, population, cum_weights, mean, exclude=None):
+    count = min(int(rng.expovariate(1 / mean)), len(population))
+    chosen = set(rng.choices(population, cum_weights=cum_weights, k=count))
+    chosen.discard(exclude)
+    return chosen
+
+
+def create_relations(rng, user_ids, recipe_ids, author_weights):
+    recipe_weights = get_cum_weights(len(recipe_ids))
+    for model, mean in (
+        (IsFavorited, MEAN_FAVORITES),
+        (IsInShoppingCart, MEAN_CARTS),
+    ):
+        write_batches(
+            model,
+            (
+                {"user_id": user_id, "recipe_id": recipe_id}
+                for user_id in user_ids
+                for recipe_id in pick(rng, recipe_ids, recipe_weights, mean)
+            ),
+        )
+    write_batches(
+        Subscription,
+        (
+            {"subscriber_id": user_id, "author_id": author_id}
+            for user_id in user_ids
+            for author_id in pick(
+                rng, user_ids, author_weights, MEAN_SUBSCRIPTIONS, user_id
+            )
+        ),
+    )
+
+
+def generate_dataset(recipes, users, seed, stdout=None):
+    rng = random.Random(seed)
+    user_ids = create_users(rng, users)
+    tag_ids = create_tags(rng)
+    ingredient_ids = get_ingredient_ids(rng, INGREDIENTS)
+    recipe_ids, author_weights = create_recipes(
+        rng, recipes, user_ids, tag_ids, ingredient_ids, stdout
+    )
+    create_relations(rng, user_ids, recipe_ids, author_weights)
+    refresh_derived_data()
@@ -0,0 +1,265 @@
+import json
+import posixpath
+import shutil
+from collections import Counter
+
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from recipes.autocomplete import invalidate_index
+from recipes.models import (ImageProcessingTask, Ingredient,
+                            IngredientAmountInRecipe, Recipe, Tag)
+from recipes.pagination import invalidate_recipe_counts
+from recipes.reference_cache import bump_version
+from recipes.storage import content_addressed_storage
+from users.models import User
+
+BATCH_SIZE = 1000
+IMAGES_SUFFIX = ".images"
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+
+def get_images_dir(path):
+    return path.with_name(path.name + IMAGES_SUFFIX)
+
+
+def get_checkpoint_path(path):
+    return path.with_name(path.name + CHECKPOINT_SUFFIX)
+
+
+def get_pub_date(value):
+    return (parse_datetime(value) if value else None) or timezone.now()
+
+
+def export_image(image, images_dir):
+    name = posixpath.basename(image.name)
+    target = images_dir / name
+    if target.exists():
+        return name
+    try:
+        with image.open("rb") as source, open(target, "wb") as destination:
+            shutil.copyfileobj(source, destination)
+    except OSError:
+        target.unlink(missing_ok=True)
+        return None
+    return name
+
+
+def serialize_recipe(recipe, images_dir):
+    return {
+        "id": recipe.pk,
+        "author": recipe.author.username,
+        "name": recipe.name,
+        "text": recipe.text,
+        "cooking_time": recipe.cooking_time,
+        "pub_date": recipe.pub_date.isoformat(),
+        "image": export_image(recipe.image, images_dir),
+        "tags": [tag.slug for tag in recipe.tags.all()],
+        "ingredients": [
+            {
+                "name": amount.ingredient.name,
+                "measurement_unit": amount.ingredient.measurement_unit,
+                "amount": amount.amount,
+            }
+            for amount in recipe.ingredient_amount_in_recipe.all()
+        ],
+    }
+
+
+def export_recipes(path, images_dir, batch_size=BATCH_SIZE):
+    images_dir.mkdir(parents=True, exist_ok=True)
+    queryset = (
+        Recipe.objects.select_related("author")
+        .prefetch_related(
+            "tags",
+            Prefetch(
+                "ingredient_amount_in_recipe",
+                queryset=IngredientAmountInRecipe.objects.select_related(
+                    "ingredient"
+                ),
+            ),
+        )
+        .order_by("pk")
+    )
+    stats = Counter()
+    with open(path, "w", encoding="utf-8") as file:
+        for recipe in queryset.iterator(chunk_size=batch_size):
+            line = serialize_recipe(recipe, images_dir)
+            if line["image"] is None:
+                stats["missing_images"] += 1
+            file.write(json.dumps(line, ensure_ascii=False) + "\n")
+            stats["exported"] += 1
+    return stats
+
+
+class RecipeImporter:
+    def __init__(self, images_dir, default_author=None):
+        self.images_dir = images_dir
+        self.authors = dict(User.objects.values_list("username", "pk"))
+        self.default_author_id = self.authors.get(default_author)
+        self.tags = dict(Tag.objects.values_list("slug", "pk"))
+        self.ingredients = {
+            (name, measurement_unit): pk
+            for pk, name, measurement_unit in Ingredient.objects.values_list(
+                "pk", "name", "measurement_unit"
+            )
+        }
+        self.images = {}
+        self.stats = Counter()
+
+    def import_image(self, name):
+        if not name:
+            return None
+        if name not in self.images:
+            path = self.images_dir / posixpath.basename(name)
+            if not path.exists():
+                return None
+            with open(path, "rb") as file:
+                self.images[name] = content_addressed_storage.save(
+                    f"recipes/{path.name}", File(file)
+                )
+        return self.images[name]
+
+    def create_missing_ingredients(self, items):
+        missing = {
+            (ingredient["name"], ingredient["measurement_unit"])
+            for item in items
+            for ingredient in item["ingredients"]
+        } - self.ingredients.keys()
+        if not missing:
+            return
+        Ingredient.objects.bulk_create(
+            (
+                Ingredient(name=name, measurement_unit=measurement_unit)
+                for name, measurement_unit in missing
+            ),
+            ignore_conflicts=True,
+        )
+        for pk, name, measurement_unit in Ingredient.objects.filter(
+            name__in={name for name, _ in missing}
+        ).values_list("pk", "name", "measurement_unit"):
+            self.ingredients[name, measurement_unit] = pk
+        self.stats["ingredients_created"] += len(missing)
+
+    def build_recipes(self, items):
+        for item in items:
+            author_id = self.authors.get(
+                item["author"], self.default_author_id
+            )
+            image = self.import_image(item.get("image"))
+            if author_id is None or image is None:
+                self.stats["skipped"] += 1
+                continue
+            yield Recipe(
+                author_id=author_id,
+                name=item["name"],
+                text=item["text"],
+                cooking_time=item["cooking_time"],
+                image=image,
+                pub_date=get_pub_date(item.get("pub_date")),
+            ), item
+
+    def import_batch(self, items):
+        rows = list(self.build_recipes(items))
+        existing = set(
+            Recipe.objects.filter(
+                pub_date__in={recipe.pub_date for recipe, _ in rows}
+            ).values_list("author_id", "name", "pub_date")
+        )
+        new_rows = [
+            (recipe, item)
+            for recipe, item in rows
+            if (recipe.author_id, recipe.name, recipe.pub_date) not in existing
+        ]
+        self.stats["duplicates"] += len(rows) - len(new_rows)
+        if not new_rows:
+            return
+        self.create_missing_ingredients(item for _, item in new_rows)
+        pub_dates = [recipe.pub_date for recipe, _ in new_rows]
+        with transaction.atomic():
+            recipes = Recipe.objects.bulk_create(
+                recipe for recipe, _ in new_rows
+            )
+            for recipe, pub_date in zip(recipes, pub_dates):
+                recipe.pub_date = pub_date
+            Recipe.objects.bulk_update(recipes, ("pub_date",))
+            Recipe.tags.through.objects.bulk_create(
+                Recipe.tags.through(recipe_id=recipe.pk, tag_id=tag_id)
+                for recipe, (_, item) in zip(recipes, new_rows)
+                for tag_id in {
+                    self.tags[slug] for slug in item["tags"]
+                    if slug in self.tags
+                }
+            )
+            IngredientAmountInRecipe.objects.bulk_create(
+                IngredientAmountInRecipe(
+                    recipe_id=recipe.pk,
+                    ingredient_id=self.ingredients[
+                        ingredient["name"], ingredient["measurement_unit"]
+                    ],
+                    amount=ingredient["amount"],
+                )
+                for recipe, (_, item) in zip(recipes, new_rows)
+                for ingredient in item["ingredients"]
+            )
+            ImageProcessingTask.objects.bulk_create(
+                ImageProcessingTask(recipe_id=recipe.pk) for recipe in recipes
+            )
+        self.stats["imported"] += len(recipes)
+
+    def finish(self):
+        invalidate_recipe_counts()
+        if self.stats["ingredients_created"]:
+            invalidate_index()
+            bump_version("ingredients")
+
+
+def read_batches(path, start, batch_size):
+    batch = []
+    with open(path, encoding="utf-8") as file:
+        for number, line in enumerate(file, 1):
+            if number <= start or not line.strip():
+                continue
+            batch.append(json.loads(line))
+            if len(batch) == batch_size:
+                yield number, batch
+                batch = []
+    if batch:
+        yield number, batch
+
+
+def read_checkpoint(path):
+    try:
+        with open(get_checkpoint_path(path), encoding="utf-8") as file:
+            return json.load(file)["line"]
+    except FileNotFoundError:
+        return 0
+
+
+def write_checkpoint(path, line):
+    checkpoint_path = get_checkpoint_path(path)
+    temporary_path = checkpoint_path.with_suffix(".tmp")
+    temporary_path.write_text(json.dumps({"line": line}))
+    temporary_path.replace(checkpoint_path)
+
+
+def import_recipes(path, importer, batch_size=BATCH_SIZE, restart=False,
+                   stdout=None):
+    start = 0 if restart else read_checkpoint(path)
+    if start and stdout is not None:
+        stdout.write(f"Продолжение со строки {start + 1}")
+    try:
+        for line, batch in read_batches(path, start, batch_size):
+            importer.import_batch(batch)
+            write_checkpoint(path, line)
+            if stdout is not None:
+                stdout.write(
+                    f"Обработано строк: {line}, "
+                    f"импортировано: {importer.stats['imported']}"
+                )
+    finally:
+        importer.finish()
+    get_checkpoint_path(path).unlink(missing_ok=True)
+    return importer.stats
@@ -1,16 +1,24 @@
+from api.parsers import Base64StreamingJSONParser
 from api.permissions import AuthorOrReadOnly
-from api.serializers import (FavoriteSerializer, IngredientSerializer,
+from api.serializers import (IngredientSerializer, RecipeIdsSerializer,
                              RecipePreviewSerializer, RecipeReadSerializer,
-                             RecipeWriteSerializer, ShoppingCartSerializer,
-                             TagSerializer)
-from django.db.models import Sum
+                             RecipeWriteSerializer, TagSerializer)
+from django.db.models import F
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
+from foodgram.errors import ErrorMesage
+from foodgram.settings import INGREDIENT_SEARCH_LIMIT
+from recipes.autocomplete import fuzzy_search_ingredients, search_ingredients
 from recipes.filters import IngredientSearchFilter, RecipeFilter
-from recipes.models import (Ingredient, IngredientAmountInRecipe, IsFavorited,
-                            IsInShoppingCart, Recipe, Tag)
-from recipes.shopping_cart_to_pdf import generate_shopping_list_pdf
+from recipes.models import (Ingredient, IsFavorited, IsInShoppingCart, Recipe,
+                            ShoppingListLine, Tag)
+from recipes.pagination import POPULAR_ORDERING, get_recipe_paginator
+from recipes.reference_cache import ReferenceDataCacheMixin
+from recipes.relations import (add_relation, bulk_add, bulk_remove,
+                               remove_relation)
+from recipes.shopping_cart_exporters import EXPORTERS, get_renderer_classes
 from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import (SAFE_METHODS, AllowAny,
                                         IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
@@ -19,7 +27,8 @@ from rest_framework.status import HTTP_201_CREATED, HTTP_204_NO_CONTENT
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 
 
-class IngredientViewSet(ReadOnlyModelViewSet):
+class IngredientViewSet(ReferenceDataCacheMixin, ReadOnlyModelViewSet):
+    reference_name = "ingredients"
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
     permission_classes = (AllowAny,)
@@ -27,8 +36,25 @@ class IngredientViewSet(ReadOnlyModelViewSet):
     filter_backends = (DjangoFilterBackend,)
     filterset_class = IngredientSearchFilter
 
+    def list(self, request, *args, **kwargs):
+        name = request.query_params.get("name")
+        if not name:
+            return super().list(request, *args, **kwargs)
+        try:
+            limit = int(
+                request.query_params.get("limit", INGREDIENT_SEARCH_LIMIT)
+            )
+        except ValueError:
+            limit = INGREDIENT_SEARCH_LIMIT
+        if request.query_params.get("mode") == "fuzzy":
+            search = fuzzy_search_ingredients
+        else:
+            search = search_ingredients
+        return Response(search(name, max(limit, 1)))
+
 
-class TagViewSet(ReadOnlyModelViewSet):
+class TagViewSet(ReferenceDataCacheMixin, ReadOnlyModelViewSet):
+    reference_name = "tags"
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = (AllowAny,)
@@ -38,9 +64,22 @@ class TagViewSet(ReadOnlyModelViewSet):
 class RecipeViewSet(ModelViewSet):
     queryset = Recipe.objects.all()
     permission_classes = (IsAuthenticatedOrReadOnly, AuthorOrReadOnly)
+    parser_classes = (Base64StreamingJSONParser, FormParser, MultiPartParser)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
 
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            self._paginator = get_recipe_paginator(self.request)
+        return self._paginator
+
+    def get_queryset(self):
+        queryset = Recipe.objects.with_user_annotations(self.request.user)
+        if self.request.query_params.get("ordering") == POPULAR_ORDERING:
+            return queryset.order_by("-favorites_count", "-pub_date")
+        return queryset
+
     def get_serializer_class(self):
         if self.request.method in SAFE_METHODS:
             return RecipeReadSerializer
@@ -59,17 +98,15 @@ class RecipeViewSet(ModelViewSet):
     def get_favorite(self, request, pk):
         recipe = get_object_or_404(Recipe, pk=pk)
         if request.method == "POST":
-            serializer = FavoriteSerializer(
-                data={"user": request.user.id, "recipe": recipe.id}
+            add_relation(
+                IsFavorited,
+                ErrorMesage.ALREADY_FAVORITED,
+                user=request.user,
+                recipe=recipe,
             )
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
             favorite_serializer = RecipePreviewSerializer(recipe)
             return Response(favorite_serializer.data, status=HTTP_201_CREATED)
-        recipe_in_favorite = get_object_or_404(
-            IsFavorited, user=request.user, recipe=recipe
-        )
-        recipe_in_favorite.delete()
+        remove_relation(IsFavorited, user=request.user, recipe=recipe)
         return Response(status=HTTP_204_NO_CONTENT)
 
     @action(
@@ -85,35 +122,77 @@ class RecipeViewSet(ModelViewSet):
     def get_shopping_cart(self, request, pk):
         recipe = get_object_or_404(Recipe, pk=pk)
         if request.method == "POST":
-            serializer = ShoppingCartSerializer(
-                data={"user": request.user.id, "recipe": recipe.id}
+            add_relation(
+                IsInShoppingCart,
+                ErrorMesage.ALREADY_IN_SHOPPING_CART,
+                user=request.user,
+                recipe=recipe,
             )
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
             shopping_cart = RecipePreviewSerializer(recipe)
             return Response(shopping_cart.data, status=HTTP_201_CREATED)
-        recipe_in_shopping_cart = get_object_or_404(
-            IsInShoppingCart, user=request.user, recipe=recipe
-        )
-        recipe_in_shopping_cart.delete()
+        remove_relation(IsInShoppingCart, user=request.user, recipe=recipe)
         return Response(status=HTTP_204_NO_CONTENT)
 
+    def bulk_change(self, request, model):
+        serializer = RecipeIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        recipe_ids = serializer.validated_data["recipes"]
+        if request.method == "POST":
+            key = "added"
+            changed = bulk_add(model, request.user, recipe_ids)
+        else:
+            key = "removed"
+            changed = bulk_remove(model, request.user, recipe_ids)
+        changed_ids = set(changed)
+        skipped = [
+            recipe_id for recipe_id in recipe_ids
+            if recipe_id not in changed_ids
+        ]
+        return Response({key: changed, "skipped": skipped})
+
+    @action(
+        detail=False,
+        methods=(
+            "post",
+            "delete",
+        ),
+        url_path="favorite",
+        url_name="bulk_favorite",
+        permission_classes=(IsAuthenticated,),
+    )
+    def bulk_favorite(self, request):
+        return self.bulk_change(request, IsFavorited)
+
+    @action(
+        detail=False,
+        methods=(
+            "post",
+            "delete",
+        ),
+        url_path="shopping_cart",
+        url_name="bulk_shopping_cart",
+        permission_classes=(IsAuthenticated,),
+    )
+    def bulk_shopping_cart(self, request):
+        return self.bulk_change(request, IsInShoppingCart)
+
     @action(
         detail=False,
         methods=("get",),
         url_path="download_shopping_cart",
         url_name="download_shopping_cart",
         permission_classes=(IsAuthenticated,),
+        renderer_classes=get_renderer_classes(),
     )
     def download_shopping_cart(self, request):
         ingredients = (
-            IngredientAmountInRecipe.objects.filter(
-                recipe__shopping_cart__user=request.user
-            )
+            ShoppingListLine.objects.filter(user=request.user)
             .values(
                 "ingredient__name",
                 "ingredient__measurement_unit",
             )
-            .annotate(ingredient_sum=Sum("amount"))
+            .annotate(ingredient_sum=F("total"))
+            .order_by("ingredient__name")
         )
-        return generate_shopping_list_pdf(ingredients)
+        exporter = EXPORTERS[request.accepted_renderer.format]
+        return exporter.export(request, ingredients)
@@ -1,8 +1,11 @@
 from api.serializers import (CustomUserSerializer,
-                             SubscriptionDisplaySerializer,
-                             SubscriptionSerializer)
+                             SubscriptionDisplaySerializer, get_recipes_limit)
+from django.db.models import BooleanField, Count, Prefetch, Value
 from django.shortcuts import get_object_or_404
 from djoser.views import UserViewSet
+from foodgram.errors import ErrorMesage
+from recipes.models import Recipe
+from recipes.relations import add_relation, remove_relation
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter
@@ -25,6 +28,23 @@ class CustomUserViewSet(UserViewSet):
         "delete",
     )
 
+    def get_authors_queryset(self, request):
+        recipes = Recipe.objects.all()
+        limit = get_recipes_limit(request)
+        if limit:
+            recipes = recipes[:limit]
+        return (
+            User.objects.annotate(
+                recipes_count=Count("recipes"),
+                is_subscribed=Value(True, output_field=BooleanField()),
+            )
+            .prefetch_related(
+                Prefetch("recipes", queryset=recipes,
+                         to_attr="preview_recipes")
+            )
+            .order_by("id")
+        )
+
     @action(
         detail=True,
         methods=(
@@ -38,21 +58,21 @@ class CustomUserViewSet(UserViewSet):
     def get_subscribe(self, request, id):
         author = get_object_or_404(User, id=id)
         if request.method == "POST":
-            serializer = SubscriptionSerializer(
-                data={"subscriber": request.user.id, "author": author.id}
+            authors = self.get_authors_queryset(request)
+            add_relation(
+                Subscription,
+                ErrorMesage.ALREADY_SUBSCRIBED,
+                subscriber=request.user,
+                author=author,
             )
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
             author_serializer = SubscriptionDisplaySerializer(
-                author, context={"request": request}
+                authors.get(id=author.id),
+                context={"request": request},
             )
             return Response(
                 author_serializer.data,
                 status=status.HTTP_201_CREATED)
-        subscription = get_object_or_404(
-            Subscription, subscriber=request.user, author=author
-        )
-        subscription.delete()
+        remove_relation(Subscription, subscriber=request.user, author=author)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(
@@ -63,7 +83,9 @@ class CustomUserViewSet(UserViewSet):
         permission_classes=(IsAuthenticated,),
     )
     def get_subscriptions(self, request):
-        authors = User.objects.filter(author__subscriber=request.user)
+        authors = self.get_authors_queryset(request).filter(
+            author__subscriber=request.user
+        )
         paginator = PageNumberPagination()
         result_pages = paginator.paginate_queryset(
             queryset=authors, request=request)